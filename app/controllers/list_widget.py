@@ -1,12 +1,18 @@
 from PySide6.QtWidgets import QListWidget, QListWidgetItem, QListView
-from PySide6.QtCore import Qt, QSettings, QSize
+from PySide6.QtCore import Qt, QSettings, QSize, QTimer
 from app.db.movies_db import list_movies
 from app.db.series_db import list_series
+from app.utils.my_functions import image_scheduler, reload_image
 from py_ui.list_widget import ListItemWidget
 from py_ui.grid_widget import GridItemWidget
 
 GRID_SIZE = QSize(170, 300)
 
+# Poster loading around the viewport, in screen heights:
+# on screen -> priority 0, each screen further away -> +1, past FAR_SCREENS -> cancelled
+FAR_SCREENS = 3
+REPRIORITIZE_DELAY_MS = 60
+
 class ListLoader:
 
     def __init__(self, list_widget: QListWidget):
@@ -27,6 +33,14 @@ class ListLoader:
         self.setup_view_mode("movies")
         self.setup_view_mode("series")
 
+        # Re-rank poster downloads once scrolling / resizing settles
+        self._reprioritize_timer = QTimer(self.list_widget)
+        self._reprioritize_timer.setSingleShot(True)
+        self._reprioritize_timer.setInterval(REPRIORITIZE_DELAY_MS)
+        self._reprioritize_timer.timeout.connect(self.reprioritize_images)
+        self.list_widget.verticalScrollBar().valueChanged.connect(self._reprioritize_timer.start)
+        self.list_widget.horizontalScrollBar().valueChanged.connect(self._reprioritize_timer.start)
+
     # ---------------------------------------------------------
     # VIEW MODE SETUP
     # ---------------------------------------------------------
@@ -68,6 +82,8 @@ class ListLoader:
     # ---------------------------------------------------------
     def load(self, items: list, type):
         """Load movies or series into the QListWidget."""
+        for _, label in self._poster_labels():
+            image_scheduler.cancel(label)
         self.list_widget.clear()
         self.current[type] = items
 
@@ -85,6 +101,37 @@ class ListLoader:
             self.list_widget.addItem(item)
             self.list_widget.setItemWidget(item, item_widget)
 
+        # Rank the posters just queued before the scheduler starts any of them
+        self.reprioritize_images()
+
+    # ---------------------------------------------------------
+    # POSTER LOADING PRIORITY
+    # ---------------------------------------------------------
+    def _poster_labels(self):
+        for row in range(self.list_widget.count()):
+            widget = self.list_widget.itemWidget(self.list_widget.item(row))
+            label = getattr(widget, "poster_label", None)
+            if label is not None:
+                yield row, label
+
+    def reprioritize_images(self):
+        """Visible posters first, then by distance from the viewport; far-away ones are cancelled."""
+        viewport = self.list_widget.viewport().rect()
+        screen = max(viewport.height(), 1)
+        for row, label in self._poster_labels():
+            rect = self.list_widget.visualItemRect(self.list_widget.item(row))
+            if rect.intersects(viewport):
+                distance = 0
+            else:
+                gap = viewport.top() - rect.bottom() if rect.bottom() < viewport.top() else rect.top() - viewport.bottom()
+                distance = 1 + gap // screen
+            if distance > FAR_SCREENS:
+                image_scheduler.cancel(label)
+            elif image_scheduler.is_pending(label):
+                image_scheduler.prioritize(label, distance)
+            else:
+                reload_image(label, priority=distance)  # only if it was cancelled earlier
+
     # ---------------------------------------------------------
     # LOAD FROM DATABASE
     # ---------------------------------------------------------
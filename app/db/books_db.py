@@ -0,0 +1,187 @@
+from contextlib import closing
+from typing import Dict, Iterable, List
+from app.models.book import Book, BOOK_COLUMNS
+from app.db.sqlite_manger import get_conn, DATA_DIR
+import os
+import sqlite3
+import json
+
+# ==========================================================
+# 🔄 CONVERSION HELPERS
+# ==========================================================
+
+def book_to_tuple(book: Book):
+    """Convert Book object into a tuple dynamically."""
+    values = []
+    for col in BOOK_COLUMNS:
+        value = getattr(book, col, None)
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        values.append(value)
+    return tuple(values)
+
+def row_to_book(row):
+    """Convert a DB row into a Book object dynamically."""
+    data = {}
+    for col in BOOK_COLUMNS:
+        value = row[col]
+        if col == "genres" and value:
+            value = json.loads(value)
+        data[col] = value
+    return Book(**data, id=row["id"])
+
+
+
+# ==========================================================
+# 🟢 CRUD OPERATIONS
+# ==========================================================
+def insert_book(book: Book):
+    cols = ", ".join(BOOK_COLUMNS)
+    placeholders = ", ".join(["?"] * len(BOOK_COLUMNS))
+    values = book_to_tuple(book)
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"INSERT INTO books ({cols}) VALUES ({placeholders})", values)
+        book.id = cursor.lastrowid
+    return book
+
+def insert_books_bulk(books: Iterable[Book]) -> int:
+    """Insert many books in one transaction (executemany)."""
+    cols = ", ".join(BOOK_COLUMNS)
+    placeholders = ", ".join(["?"] * len(BOOK_COLUMNS))
+    rows = [book_to_tuple(b) for b in books]
+
+    with get_conn() as conn:
+        conn.executemany(f"INSERT INTO books ({cols}) VALUES ({placeholders})", rows)
+    return len(rows)
+
+def update_book(book: Book):
+    if book.id is None:
+        raise ValueError("Book must have an ID to update")
+
+    set_clause = ", ".join(f"{col}=?" for col in BOOK_COLUMNS)
+    values = book_to_tuple(book) + (book.id,)
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE books SET {set_clause} WHERE id=?", values)
+    return book
+
+def delete_book(book_id: int) -> int:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM books WHERE id=?", (book_id,))
+        return cursor.rowcount
+
+def get_book_by_id(book_id: int) -> Book | None:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM books WHERE id=?", (book_id,))
+        row = cursor.fetchone()
+        return row_to_book(row) if row else None
+
+
+# ==========================================================
+# 🔍 QUERY UTILITIES
+# ==========================================================
+def list_books(section: str, order_by: str = "title", descending: bool = False) -> List[Book]:
+    if not section:
+        raise ValueError("Section must be provided")
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        query = f"""
+        SELECT * FROM books
+        WHERE section=?
+        ORDER BY {order_by} {'DESC' if descending else 'ASC'}
+        """
+        cursor.execute(query, (section,))
+        rows = cursor.fetchall()
+
+    return [row_to_book(row) for row in rows]
+
+def count_books(section: str) -> int:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM books WHERE section=?", (section,))
+        return cursor.fetchone()[0]
+
+
+# ==========================================================
+# 📇 LOCAL BOOK INDEX (offline ISBN / title lookups)
+# ==========================================================
+# Filled from Open Library dumps; kept in its own file so a multi-million
+# row index never bloats or locks the library database.
+INDEX_DB_PATH = DATA_DIR / "book_index.db"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS book_index (
+    isbn TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    norm_title TEXT,
+    author TEXT,
+    year INTEGER,
+    pages INTEGER,
+    cover_id INTEGER,
+    ol_key TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_book_index_title ON book_index(norm_title);
+"""
+
+INDEX_COLUMNS = ["isbn", "title", "norm_title", "author", "year", "pages", "cover_id", "ol_key"]
+
+
+def get_index_conn(path=None, create=False):
+    """
+    Connection to the book index. create=True (dump ingestion) makes the file and
+    its schema; otherwise None is returned while no dump has been ingested yet.
+    """
+    path = path or INDEX_DB_PATH
+    if not create and not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    if create:
+        conn.executescript(INDEX_SCHEMA)
+    return conn
+
+def index_rows_bulk(conn, rows: List[tuple]) -> int:
+    """Upsert rows (INDEX_COLUMNS order) into the book index; the caller commits."""
+    placeholders = ", ".join(["?"] * len(INDEX_COLUMNS))
+    conn.executemany(
+        f"INSERT OR REPLACE INTO book_index ({', '.join(INDEX_COLUMNS)}) VALUES ({placeholders})", rows
+    )
+    return len(rows)
+
+def index_lookup_isbns(isbns: Iterable[str], path=None) -> Dict[str, sqlite3.Row]:
+    isbns = list(isbns)
+    found = {}
+    conn = get_index_conn(path)
+    if conn is None:
+        return found
+    with closing(conn):
+        for start in range(0, len(isbns), 500):  # stay under SQLite's bound-parameter limit
+            chunk = isbns[start:start + 500]
+            query = f"SELECT * FROM book_index WHERE isbn IN ({', '.join(['?'] * len(chunk))})"
+            for row in conn.execute(query, chunk):
+                found[row["isbn"]] = row
+    return found
+
+def index_search_title(norm_title: str, limit: int = 10, path=None) -> List[sqlite3.Row]:
+    """Index rows whose normalized title starts with `norm_title` (uses idx_book_index_title)."""
+    conn = get_index_conn(path)
+    if conn is None:
+        return []
+    with closing(conn):
+        return conn.execute(
+            "SELECT * FROM book_index WHERE norm_title >= ? AND norm_title < ? LIMIT ?",
+            (norm_title, norm_title + "\U0010ffff", limit),
+        ).fetchall()
+
+def index_count(path=None) -> int:
+    conn = get_index_conn(path)
+    if conn is None:
+        return 0
+    with closing(conn):
+        return conn.execute("SELECT COUNT(*) FROM book_index").fetchone()[0]
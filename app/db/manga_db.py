@@ -0,0 +1,115 @@
+from typing import Iterable, List
+from app.models.manga import Manga, MANGA_COLUMNS
+from app.db.sqlite_manger import get_conn
+import json
+
+# ==========================================================
+# 🔄 CONVERSION HELPERS
+# ==========================================================
+
+def manga_to_tuple(manga: Manga):
+    """Convert Manga object into a tuple dynamically."""
+    values = []
+    for col in MANGA_COLUMNS:
+        value = getattr(manga, col, None)
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value)
+        values.append(value)
+    return tuple(values)
+
+def row_to_manga(row):
+    """Convert a DB row into a Manga object dynamically."""
+    data = {}
+    for col in MANGA_COLUMNS:
+        value = row[col]
+        if col == "genres" and value:
+            value = json.loads(value)
+        data[col] = value
+    return Manga(**data, id=row["id"])
+
+
+
+# ==========================================================
+# 🟢 CRUD OPERATIONS
+# ==========================================================
+def insert_manga(manga: Manga):
+    cols = ", ".join(MANGA_COLUMNS)
+    placeholders = ", ".join(["?"] * len(MANGA_COLUMNS))
+    values = manga_to_tuple(manga)
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"INSERT INTO manga ({cols}) VALUES ({placeholders})", values)
+        manga.id = cursor.lastrowid
+    return manga
+
+def upsert_manga_bulk(manga_list: Iterable[Manga]) -> int:
+    """
+    Insert many manga in one transaction (executemany).
+    Rows with a known kitsu_id update the existing entry's metadata but keep its section and user rating.
+    """
+    cols = ", ".join(MANGA_COLUMNS)
+    placeholders = ", ".join(["?"] * len(MANGA_COLUMNS))
+    refreshed = [c for c in MANGA_COLUMNS if c not in ("kitsu_id", "section", "user_rating")]
+    set_clause = ", ".join(f"{col}=excluded.{col}" for col in refreshed)
+    rows = [manga_to_tuple(m) for m in manga_list]
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            f"INSERT INTO manga ({cols}) VALUES ({placeholders}) "
+            f"ON CONFLICT(kitsu_id) DO UPDATE SET {set_clause}",
+            rows,
+        )
+    return len(rows)
+
+def update_manga(manga: Manga):
+    if manga.id is None:
+        raise ValueError("Manga must have an ID to update")
+
+    set_clause = ", ".join(f"{col}=?" for col in MANGA_COLUMNS)
+    values = manga_to_tuple(manga) + (manga.id,)
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE manga SET {set_clause} WHERE id=?", values)
+    return manga
+
+def delete_manga(manga_id: int) -> int:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM manga WHERE id=?", (manga_id,))
+        return cursor.rowcount
+
+def get_manga_by_id(manga_id: int) -> Manga | None:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM manga WHERE id=?", (manga_id,))
+        row = cursor.fetchone()
+        return row_to_manga(row) if row else None
+
+
+# ==========================================================
+# 🔍 QUERY UTILITIES
+# ==========================================================
+def list_manga(section: str, order_by: str = "title", descending: bool = False) -> List[Manga]:
+    if not section:
+        raise ValueError("Section must be provided")
+
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        query = f"""
+        SELECT * FROM manga
+        WHERE section=?
+        ORDER BY {order_by} {'DESC' if descending else 'ASC'}
+        """
+        cursor.execute(query, (section,))
+        rows = cursor.fetchall()
+
+    return [row_to_manga(row) for row in rows]
+
+def count_manga(section: str) -> int:
+    with get_conn() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*) FROM manga WHERE section=?", (section,))
+        return cursor.fetchone()[0]
@@ -127,6 +127,9 @@ CREATE TABLE IF NOT EXISTS manga (
     genres TEXT,
     plot TEXT,
     mal_id TEXT,
+    kitsu_id TEXT,
+    year INTEGER,
+    rating REAL,
     user_rating REAL,
     last_update TEXT,
     created_at TEXT DEFAULT (datetime('now')),
@@ -165,8 +168,29 @@ def get_conn():
     return conn
 
 
+# columns added after a table first shipped: table -> {column: type}
+ADDED_COLUMNS = {
+    "manga": {"kitsu_id": "TEXT", "year": "INTEGER", "rating": "REAL"},
+}
+
+# created after ADDED_COLUMNS so they can use the new columns on old databases
+INDEXES = """
+CREATE UNIQUE INDEX IF NOT EXISTS idx_manga_kitsu_id ON manga(kitsu_id);
+"""
+
+
+def _add_missing_columns(conn):
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, col_type in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+
 def init_db():
     """Initialize the database and create tables if not exist."""
     with get_conn() as conn:
         conn.executescript(SCHEMA)
+        _add_missing_columns(conn)
+        conn.executescript(INDEXES)
 
@@ -0,0 +1,264 @@
+import requests 
+from app.fetch.api_keys import MY_ANIME_LIST
+from app.fetch.http_client import api_get
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+
+
+MAL_SEARCH_URL = "https://api.myanimelist.net/v2/anime"
+MAL_BASE_URL = "https://api.myanimelist.net/v2/anime"
+
+
+# ==========================================================
+# 🎬 ANIME MOVIES
+# ==========================================================
+@coalesce("mal_movie_search")
+def search_anime_movies(query, max_results=20):
+    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
+    params = {
+        "q": query,
+        "limit": max_results,
+        "fields": "id,title,main_picture,media_type,start_date,synopsis,num_list_users"
+    }
+    
+    response = api_get(MAL_SEARCH_URL, headers=headers, params=params)
+    if response.status_code != 200:
+        print("Error:", response.status_code, response.text)
+        return []
+    
+    data = response.json()
+    results = []
+    
+    movie_types = ["movie", "ova", "special", "ona"]
+    
+    for anime in data.get("data", []):
+        node = anime.get("node", {})
+        media_type = node.get("media_type")
+
+        if media_type not in movie_types:
+            continue
+        
+        main_picture = node.get("main_picture", {})
+        poster_url = main_picture.get("medium")
+        
+        results.append({
+            "title": node.get("title"),
+            "id": node.get("id"),
+            "poster_url": poster_url,
+            "synopsis": node.get("synopsis"),
+            "start_date": node.get("start_date"),
+            "type": media_type,
+            "popularity": node.get("num_list_users"),
+        })
+    
+    return results
+
+
+
+@cached("mal_movie")
+@coalesce("mal_movie")
+def get_movies_anime_info(anime_id):
+    """
+    Complete anime info fetcher using MyAnimeList anime ID.
+    """
+    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
+    params = {
+        "fields": "id,title,main_picture,media_type,num_episodes,start_date,genres,studios,synopsis,alternative_titles,end_date,mean"
+    }
+
+    try:
+        response = api_get(f"{MAL_BASE_URL}/{anime_id}", headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ MAL API returned status {response.status_code}")
+            return "no"
+
+        data = response.json()
+
+        # Basic info
+        anime_title = data.get("title")
+        start_date = data.get("start_date")
+        end_date = data.get("end_date")
+        year = start_date[:4] if start_date else "Unknown"
+        synopsis = data.get("synopsis")
+        episodes = data.get("num_episodes")
+        media_type = data.get("media_type")
+        rating = data.get("mean")  # average user score
+
+        # Images
+        main_picture = data.get("main_picture", {})
+        poster_url = main_picture.get("medium")
+        large_poster_url = main_picture.get("large")
+        background = data.get("background")
+        extra_pictures = [pic.get("large") for pic in data.get("pictures", [])]
+
+        # Genres and studios
+        genres = [g["name"] for g in data.get("genres", [])]
+        studios = [s["name"] for s in data.get("studios", [])]
+
+        # Alternative titles
+        alt_titles = data.get("alternative_titles", {})
+
+        # Build result dict
+        result = {
+            "source": "movie",
+            "name": anime_title,
+            "year": year,
+            # "start_date": start_date,
+            # "end_date": end_date,
+            # "episodes": episodes,
+            # "type": media_type,
+            "mal_rating": rating,
+            "mal_id": anime_id,
+            "image": poster_url,
+            # "poster_large": large_poster_url,
+            # "background": background,
+            # "extra_pictures": extra_pictures,
+            "plot": synopsis,
+            "genres": genres,
+            # "studios": studios,
+            # "alternative_titles": alt_titles
+        }
+        print(result)
+        print(f"✅ Successfully fetched anime: {anime_title} (ID: {anime_id})")
+        return result
+
+    except requests.exceptions.Timeout:
+        print("❌ Request timed out")
+        return "no"
+    except requests.exceptions.ConnectionError:
+        print("❌ Connection error - check internet")
+        return "no"
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return "no"
+
+
+
+
+# ==========================================================
+# 📺 ANIME SERIES
+# ==========================================================
+@coalesce("mal_tv_search")
+def search_anime_series(query, max_results=20):
+    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
+    params = {
+        "q": query,
+        "limit": max_results,
+        "fields": "id,title,main_picture,media_type,start_date,synopsis,num_list_users"
+    }
+    
+    response = api_get(MAL_SEARCH_URL, headers=headers, params=params)
+    if response.status_code != 200:
+        print("Error:", response.status_code, response.text)
+        return []
+    
+    data = response.json()
+    results = []
+    
+
+    for anime in data.get("data", []):
+        node = anime.get("node", {})
+        media_type = node.get("media_type")
+
+        if media_type != "tv":  # filter TV series only
+            continue
+        
+        main_picture = node.get("main_picture", {})
+        poster_url = main_picture.get("medium")
+        
+        results.append({
+            "title": node.get("title"),
+            "id": node.get("id"),
+            "poster_url": poster_url,
+            "synopsis": node.get("synopsis"),
+            "start_date": node.get("start_date"),
+            "type": media_type,
+            "popularity": node.get("num_list_users"),
+        })
+    
+    return results
+
+
+
+
+@cached("mal_tv")
+@coalesce("mal_tv")
+def get_series_anime_info(anime_id):
+    """
+    Complete anime info fetcher using MyAnimeList anime ID.
+    """
+    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
+    params = {
+        "fields": "id,title,main_picture,media_type,num_episodes,start_date,genres,studios,synopsis,alternative_titles,end_date,mean,average_episode_duration"
+    }
+
+    try:
+        response = api_get(f"{MAL_BASE_URL}/{anime_id}", headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"❌ MAL API returned status {response.status_code}")
+            return "no"
+
+        data = response.json()
+
+        # Basic info
+        anime_title = data.get("title")
+        runtime = runtime = data.get("average_episode_duration")
+        if runtime is not None:
+            runtime = runtime // 60  # integer minutes
+        start_date = data.get("start_date")
+        end_date = data.get("end_date")
+        year = start_date[:4] if start_date else "Unknown"
+        synopsis = data.get("synopsis")
+        episodes = data.get("num_episodes")
+        media_type = data.get("media_type")
+        rating = data.get("mean")  # average user score
+
+        # Images
+        main_picture = data.get("main_picture", {})
+        poster_url = main_picture.get("medium")
+        large_poster_url = main_picture.get("large")
+        background = data.get("background")
+        extra_pictures = [pic.get("large") for pic in data.get("pictures", [])]
+
+        # Genres and studios
+        genres = [g["name"] for g in data.get("genres", [])]
+        studios = [s["name"] for s in data.get("studios", [])]
+
+        # Alternative titles
+        alt_titles = data.get("alternative_titles", {})
+
+        # Build result dict
+        result = {
+            "source": "Anime",
+            "name": anime_title,
+            "year": year,
+            "runtime": runtime,
+            # "start_date": start_date,
+            # "end_date": end_date,
+            "total_episodes": episodes,
+            "total_seasons" : 1,
+            # "type": media_type,
+            "mal_rating": rating,
+            "mal_id": anime_id,
+            "image": poster_url,
+            # "poster_large": large_poster_url,
+            # "background": background,
+            # "extra_pictures": extra_pictures,
+            "plot": synopsis,
+            "genres": genres,
+            # "studios": studios,
+            # "alternative_titles": alt_titles
+        }
+
+        print(f"✅ Successfully fetched anime: {anime_title} (ID: {anime_id})")
+        return result
+
+    except requests.exceptions.Timeout:
+        print("❌ Request timed out")
+        return "no"
+    except requests.exceptions.ConnectionError:
+        print("❌ Connection error - check internet")
+        return "no"
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+        return "no"
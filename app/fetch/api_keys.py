@@ -0,0 +1,31 @@
+# app/fetch/api_keys.py
+"""
+API keys for the fetchers.
+
+Read from the (git-ignored) config.py when it exists, otherwise from
+environment variables. A missing key is an empty string instead of an
+ImportError, so the app, the stub server and the benchmarks can import
+the fetch layer without real keys.
+"""
+
+import os
+
+try:
+    import config as _config
+except ImportError:
+    _config = None
+
+
+def _key(name: str) -> str:
+    value = getattr(_config, name, None) if _config else None
+    if value is None:
+        value = os.environ.get(name, "")
+    if not value and os.environ.get("LIBRARY_API_STUB"):
+        value = "stub"  # the local stub server accepts any key
+    return value
+
+
+OMDB_API_KEY = _key("OMDB_API_KEY")
+TMDB_API_KEY = _key("TMDB_API_KEY")
+MY_ANIME_LIST = _key("MY_ANIME_LIST")
+RAWG_API_KEY = _key("RAWG_API_KEY")
@@ -0,0 +1,293 @@
+"""
+Open Library books provider.
+
+- search_books(): title/author search
+- lookup_isbns(): many ISBNs at once; the local index first, then one
+  api/books request per ISBN_BATCH_SIZE ISBNs for the rest
+- ingest_dump(): streams a downloaded dump (gzipped JSONL, or Open
+  Library's TSV editions dump) into the local index in data/book_index.db
+
+    python -m app.fetch.books__info_fetcher ingest ol_dump_editions.txt.gz
+    python -m app.fetch.books__info_fetcher isbn 9780141036144 0-14-103614-2
+"""
+
+import argparse
+import gzip
+import json
+import re
+import time
+import requests
+from dataclasses import asdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from app.fetch.http_client import api_get
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+from app.models.book import Book
+from app.db.books_db import get_index_conn, index_rows_bulk, index_lookup_isbns, index_search_title
+from app.utils.fuzzy import normalize, similarity
+
+
+OPENLIBRARY_BASE = "https://openlibrary.org"
+COVER_URL = "https://covers.openlibrary.org/b/id/{}-M.jpg"
+ISBN_BATCH_SIZE = 50        # bibkeys per api/books request
+INGEST_BATCH_SIZE = 5000    # rows per executemany / commit
+
+SEARCH_FIELDS = "key,title,author_name,first_publish_year,isbn,cover_i,number_of_pages_median,subject"
+
+
+# ==========================================================
+# 🔢 ISBN HELPERS
+# ==========================================================
+def isbn10_to_13(isbn10: str) -> str:
+    core = "978" + isbn10[:9]
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(core))
+    return core + str((10 - total % 10) % 10)
+
+
+def normalize_isbn(raw) -> Optional[str]:
+    """ISBN-13 for any ISBN-10/13 spelling ("0-14-103614-2" -> "9780141036144"), None if invalid."""
+    isbn = re.sub(r"[^0-9Xx]", "", str(raw or "")).upper()
+    if len(isbn) == 10 and isbn[:9].isdigit():
+        return isbn10_to_13(isbn)
+    if len(isbn) == 13 and isbn.isdigit():
+        return isbn
+    return None
+
+
+def _year(value) -> Optional[int]:
+    match = re.search(r"\d{4}", str(value or ""))
+    return int(match.group()) if match else None
+
+
+# ==========================================================
+# 🔎 SEARCH
+# ==========================================================
+@coalesce("openlibrary_search")
+def search_books(query, max_results=10) -> List[Book]:
+    """Title / author search. Request errors (outage, open breaker, quota) reach the caller."""
+    params = {"q": query, "fields": SEARCH_FIELDS, "limit": max_results}
+    resp = api_get(f"{OPENLIBRARY_BASE}/search.json", params=params, timeout=15)
+    resp.raise_for_status()
+
+    books = []
+    for doc in resp.json().get("docs", [])[:max_results]:
+        isbns = [normalize_isbn(i) for i in doc.get("isbn") or []]
+        books.append(Book(
+            title=doc.get("title") or "Unknown",
+            author=", ".join(doc.get("author_name") or []) or None,
+            pages=doc.get("number_of_pages_median"),
+            year=doc.get("first_publish_year"),
+            genres=(doc.get("subject") or [])[:5],
+            poster_path=COVER_URL.format(doc["cover_i"]) if doc.get("cover_i") else None,
+            isbn=next((i for i in isbns if i), None),
+        ))
+    return books
+
+
+def search_local_books(query, max_results=10) -> List[Book]:
+    """Offline title search in the ingested index (prefix match, ranked by fuzzy similarity)."""
+    rows = index_search_title(normalize(query), limit=max_results * 5)
+    rows = sorted(rows, key=lambda r: similarity(query, r["title"]), reverse=True)
+    return [_book_from_index(row) for row in rows[:max_results]]
+
+
+# ==========================================================
+# 📚 ISBN LOOKUPS
+# ==========================================================
+def _book_from_index(row) -> Book:
+    return Book(
+        title=row["title"],
+        author=row["author"],
+        pages=row["pages"],
+        year=row["year"],
+        poster_path=COVER_URL.format(row["cover_id"]) if row["cover_id"] else None,
+        isbn=row["isbn"],
+    )
+
+
+def _book_from_api(isbn, data) -> Book:
+    return Book(
+        title=data.get("title") or "Unknown",
+        author=", ".join(a.get("name", "") for a in data.get("authors", [])) or None,
+        pages=data.get("number_of_pages"),
+        year=_year(data.get("publish_date")),
+        genres=[s.get("name") for s in data.get("subjects", [])[:5]],
+        poster_path=(data.get("cover") or {}).get("medium"),
+        plot=(data.get("notes") if isinstance(data.get("notes"), str) else None),
+        isbn=isbn,
+    )
+
+
+def _fetch_isbn_batch(isbns: List[str]) -> Dict[str, Book]:
+    params = {"bibkeys": ",".join(f"ISBN:{i}" for i in isbns), "format": "json", "jscmd": "data"}
+    resp = api_get(f"{OPENLIBRARY_BASE}/api/books", params=params, timeout=20)
+    resp.raise_for_status()
+    return {key.split(":", 1)[1]: _book_from_api(key.split(":", 1)[1], data) for key, data in resp.json().items()}
+
+
+def lookup_isbns(isbns: Iterable, use_index=True) -> Dict[str, Book]:
+    """
+    ISBN-13 -> Book for every ISBN found. Invalid ISBNs are skipped;
+    ISBNs unknown to both the index and Open Library are left out.
+    """
+    wanted = list(dict.fromkeys(filter(None, (normalize_isbn(i) for i in isbns))))
+    found: Dict[str, Book] = {}
+    if use_index and wanted:
+        found = {isbn: _book_from_index(row) for isbn, row in index_lookup_isbns(wanted).items()}
+
+    missing = [i for i in wanted if i not in found]
+    for start in range(0, len(missing), ISBN_BATCH_SIZE):
+        batch = missing[start:start + ISBN_BATCH_SIZE]
+        try:
+            found.update(_fetch_isbn_batch(batch))
+        except requests.RequestException as e:
+            print(f"❌ Open Library ISBN lookup failed for {len(batch)} ISBNs: {e}")
+    return found
+
+
+@cached("openlibrary_book")
+@coalesce("openlibrary_book")
+def get_book_info(isbn) -> Optional[Book]:
+    book = lookup_isbns([isbn]).get(normalize_isbn(isbn))
+    if not book:
+        print("❌ Book not found.")
+        return None
+    print(f"✅ Found book: {book.title} (ISBN: {book.isbn})")
+    return book
+
+
+# ==========================================================
+# 💾 DUMP INGESTION (offline index)
+# ==========================================================
+def _open_dump(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    return opener(path, "rt", encoding="utf-8", errors="replace")
+
+
+def _parse_dump_line(line: str) -> Optional[dict]:
+    line = line.strip()
+    if not line:
+        return None
+    if not line.startswith("{"):  # Open Library TSV: type, key, revision, last_modified, json
+        line = line.rsplit("\t", 1)[-1]
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _index_rows(record: dict) -> Iterator[tuple]:
+    """One book_index row per ISBN of an edition / search-doc record."""
+    title = record.get("title")
+    if not title:
+        return
+    isbns = (record.get("isbn_13") or []) + (record.get("isbn_10") or []) + (record.get("isbn") or [])
+    authors = record.get("author_name") or [a.get("name") for a in record.get("authors", []) if isinstance(a, dict)]
+    author = ", ".join(a for a in authors if a) or None
+    year = _year(record.get("publish_date") or record.get("first_publish_year"))
+    pages = record.get("number_of_pages") or record.get("number_of_pages_median")
+    covers = record.get("covers") or ([record["cover_i"]] if record.get("cover_i") else [])
+    cover_id = next((c for c in covers if isinstance(c, int) and c > 0), None)
+    norm_title = normalize(title)
+
+    seen = set()
+    for raw in isbns:
+        isbn = normalize_isbn(raw)
+        if isbn and isbn not in seen:
+            seen.add(isbn)
+            yield isbn, title, norm_title, author, year, pages, cover_id, record.get("key")
+
+
+def ingest_dump(path, batch_size=INGEST_BATCH_SIZE, progress: Optional[Callable[[int, int], None]] = None,
+                index_path=None) -> int:
+    """
+    Stream a dump into the local index without loading it into memory.
+    progress(lines_read, rows_written) is called after every batch. Returns rows written.
+    """
+    conn = get_index_conn(index_path, create=True)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")  # a crashed ingest is simply re-run
+    lines = written = 0
+    batch: List[tuple] = []
+    try:
+        with _open_dump(path) as f:
+            for line in f:
+                lines += 1
+                record = _parse_dump_line(line)
+                if record:
+                    batch.extend(_index_rows(record))
+                if len(batch) >= batch_size:
+                    written += index_rows_bulk(conn, batch)
+                    conn.commit()
+                    batch = []
+                    if progress:
+                        progress(lines, written)
+        if batch:
+            written += index_rows_bulk(conn, batch)
+            conn.commit()
+        if progress:
+            progress(lines, written)
+    finally:
+        conn.close()
+    return written
+
+
+# ==========================================================
+# 🧩 PROVIDER ADAPTERS (app.fetch.providers "open_library")
+# ==========================================================
+# Books are opened by ISBN, so search hits without one are dropped.
+def search_book_results(query, max_results=10) -> List[dict]:
+    return [
+        {
+            "title": book.title,
+            "id": book.isbn,
+            "poster_url": book.poster_path,
+            "release_date": str(book.year) if book.year else None,
+            "author": book.author,
+        }
+        for book in search_books(query, max_results)
+        if book.isbn
+    ]
+
+
+def get_book_details(isbn):
+    book = get_book_info(isbn)
+    if book is None:
+        return "no"
+    info = asdict(book)
+    info.pop("id")  # library row id, not known yet
+    info.update({
+        "source": "Book",
+        "name": book.title,
+        "year": str(book.year) if book.year else "Unknown",
+        "image": book.poster_path,
+    })
+    return info
+
+
+get_book_details.is_cached = get_book_info.is_cached
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open Library books: offline index + ISBN lookups")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="load a .jsonl(.gz) or Open Library .txt(.gz) dump into the local index")
+    ingest.add_argument("path")
+    isbn = sub.add_parser("isbn", help="look up ISBNs (local index first, then batched API calls)")
+    isbn.add_argument("isbns", nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        start = time.monotonic()
+        report = lambda lines, rows: print(f"\r📚 {lines:,} lines, {rows:,} ISBNs indexed", end="", flush=True)
+        rows = ingest_dump(args.path, progress=report)
+        print(f"\n✅ Indexed {rows:,} ISBNs in {time.monotonic() - start:.1f}s")
+    else:
+        books = lookup_isbns(args.isbns)
+        for raw in args.isbns:
+            book = books.get(normalize_isbn(raw))
+            print(f"{raw}: {f'{book.title} — {book.author} ({book.year})' if book else '❌ not found'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# app/fetch/circuit_breaker.py
+"""
+Per-provider circuit breakers.
+
+closed    -> requests go through; consecutive failures are counted
+open      -> after `failure_threshold` failures in a row: fail fast with
+             ProviderUnavailable instead of waiting for another timeout
+half_open -> once `reset_timeout` has passed: let `half_open_probes` probe
+             requests through; a success closes the breaker, a failure reopens it
+
+api_get() drives the breakers, so every fetcher gets this for free.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# failure_threshold = consecutive failures that trip it, reset_timeout = seconds before probing
+BREAKER_SETTINGS = {
+    "tmdb": {"failure_threshold": 3, "reset_timeout": 30.0},
+    "omdb": {"failure_threshold": 3, "reset_timeout": 60.0},
+}
+DEFAULT_BREAKER = {"failure_threshold": 3, "reset_timeout": 30.0, "half_open_probes": 1}
+
+try:  # optional overrides: CIRCUIT_BREAKERS = {"tmdb": {"reset_timeout": 10}}
+    from config import CIRCUIT_BREAKERS as _OVERRIDES
+except ImportError:
+    _OVERRIDES = {}
+
+for _name, _settings in _OVERRIDES.items():
+    BREAKER_SETTINGS[_name] = {**BREAKER_SETTINGS.get(_name, {}), **_settings}
+
+
+class ProviderUnavailable(requests.RequestException):
+    """Raised instead of sending a request while the provider's breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 30.0,
+                 half_open_probes: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._trips = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+            logger.info("Circuit %s half-open, probing", self.name)
+
+    def _open(self):
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._trips += 1
+        logger.warning("Circuit %s open after %d failures, failing fast for %.0fs",
+                       self.name, self._failures, self.reset_timeout)
+
+    def allow(self):
+        """Raise ProviderUnavailable unless a request may be sent now."""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CLOSED:
+                return
+            if self._state == HALF_OPEN and self._probes < self.half_open_probes:
+                self._probes += 1
+                return
+            self._rejected += 1
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+        raise ProviderUnavailable(f"{self.name} is unavailable (circuit open, retry in {retry_in:.0f}s)")
+
+    def cancel(self):
+        """Give back a half-open probe that was allowed but never sent."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def available(self) -> bool:
+        """True if a request would be let through (does not use up a half-open probe)."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state == CLOSED or (self._state == HALF_OPEN and self._probes < self.half_open_probes)
+
+    def record_success(self):
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit %s closed", self.name)
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                self._open()
+
+    def status(self) -> dict:
+        with self._lock:
+            self._maybe_half_open()
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = round(max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at)), 1)
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "retry_in": retry_in,
+            }
+
+
+class BreakerBoard:
+    """One lazily created breaker per provider."""
+
+    def __init__(self, settings=BREAKER_SETTINGS):
+        self.settings = settings
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self._breakers:
+                self._breakers[provider] = CircuitBreaker(provider, **{**DEFAULT_BREAKER, **self.settings.get(provider, {})})
+            return self._breakers[provider]
+
+    def available(self, provider: str) -> bool:
+        return self.get(provider).available()
+
+    def status(self, provider: Optional[str] = None) -> Dict[str, dict]:
+        with self._lock:
+            names = [provider] if provider else list(self._breakers)
+        return {name: self.get(name).status() for name in names}
+
+
+breakers = BreakerBoard()
@@ -1,77 +1,168 @@
-import requests 
-import os
-from datetime import datetime, timedelta
-from config import OMDB_API_KEY, RAWG_API_KEY
-from concurrent.futures import ThreadPoolExecutor
+import requests
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from app.fetch.http_client import api_get
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+from app.models.manga import Manga
 
 
-def get_manga_info(manga_name):
-    url = 'https://kitsu.io/api/edge/manga'
-    params = {'filter[text]': manga_name}
+KITSU_BASE = "https://kitsu.io/api/edge"
+KITSU_PAGE_LIMIT = 20  # Kitsu caps page[limit] at 20
 
+# JSON:API: genres + categories come back in `included` with the manga (no second request),
+# and sparse fieldsets keep each record down to the fields Manga actually uses
+MANGA_PARAMS = {
+    "include": "genres,categories",
+    "fields[manga]": "canonicalTitle,titles,startDate,synopsis,chapterCount,volumeCount,"
+                     "status,averageRating,posterImage,genres,categories",
+    "fields[genres]": "name",
+    "fields[categories]": "title",
+}
+
+
+@dataclass
+class MangaPage:
+    items: List[Manga] = field(default_factory=list)
+    total: Optional[int] = None         # total matches reported by Kitsu
+    next_offset: Optional[int] = None   # None on the last page
+
+
+# ==========================================================
+# 🔄 JSON:API -> Manga
+# ==========================================================
+def _included_names(included) -> Dict[tuple, str]:
+    names = {}
+    for res in included or []:
+        attrs = res.get("attributes", {})
+        name = attrs.get("name") or attrs.get("title")
+        if name:
+            names[(res.get("type"), res.get("id"))] = name
+    return names
+
+
+def _to_manga(item, names) -> Manga:
+    attrs = item.get("attributes", {})
+    rels = item.get("relationships", {})
+
+    genres = []
+    for rel in ("genres", "categories"):
+        for ref in (rels.get(rel) or {}).get("data") or []:
+            name = names.get((ref.get("type"), ref.get("id")))
+            if name and name not in genres:
+                genres.append(name)
+
+    start = attrs.get("startDate") or ""
+    rating = attrs.get("averageRating")
+    return Manga(
+        title=attrs.get("canonicalTitle") or (attrs.get("titles") or {}).get("en_jp") or "Unknown",
+        year=int(start[:4]) if start[:4].isdigit() else None,
+        chapters=attrs.get("chapterCount"),
+        volumes=attrs.get("volumeCount"),
+        status=attrs.get("status"),
+        poster_path=(attrs.get("posterImage") or {}).get("small"),
+        genres=genres,
+        plot=attrs.get("synopsis"),
+        rating=round(float(rating) / 10, 1) if rating else None,
+        kitsu_id=item.get("id"),
+    )
+
+
+def _get(path, params):
+    resp = api_get(f"{KITSU_BASE}/{path}", params={**MANGA_PARAMS, **params}, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+# ==========================================================
+# 🔎 SEARCH
+# ==========================================================
+def search_manga_page(query, limit=KITSU_PAGE_LIMIT, offset=0) -> MangaPage:
+    """One page of search results, genres included. Request errors reach the caller."""
+    limit = min(limit, KITSU_PAGE_LIMIT)
+    data = _get("manga", {"filter[text]": query, "page[limit]": limit, "page[offset]": offset})
+
+    names = _included_names(data.get("included"))
+    items = [_to_manga(item, names) for item in data.get("data", [])]
+    total = (data.get("meta") or {}).get("count")
+    has_next = bool((data.get("links") or {}).get("next")) and len(items) == limit
+    return MangaPage(items=items, total=total, next_offset=offset + limit if has_next else None)
+
+
+@coalesce("kitsu_manga_search")
+def search_manga(query, max_results=10) -> List[Manga]:
+    """Up to `max_results` matches, following Kitsu's pagination."""
+    results: List[Manga] = []
+    offset = 0
+    while offset is not None and len(results) < max_results:
+        page = search_manga_page(query, limit=min(KITSU_PAGE_LIMIT, max_results - len(results)), offset=offset)
+        results.extend(page.items)
+        offset = page.next_offset
+    return results
+
+
+# ==========================================================
+# 📚 DETAILS
+# ==========================================================
+@cached("kitsu_manga")
+@coalesce("kitsu_manga")
+def get_manga_info(manga_id) -> Optional[Manga]:
+    """Full manga info (with genres) by Kitsu id, in one request."""
     try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
+        data = _get(f"manga/{manga_id}", {})
     except requests.RequestException as e:
         print(f"❌ Kitsu API error: {e}")
         return None
 
-    data = resp.json()
-    manga_list = data.get('data', [])
-    if not manga_list:
+    item = data.get("data")
+    if not item:
         print("❌ Manga not found.")
         return None
 
-    manga = manga_list[0]
-    manga_id = manga.get('id')
-    attributes = manga.get('attributes', {})
+    manga = _to_manga(item, _included_names(data.get("included")))
+    print(f"✅ Found manga: {manga.title} (ID: {manga.kitsu_id})")
+    return manga
 
-    # Fetch genres
-    try:
-        genre_url = f"https://kitsu.io/api/edge/manga/{manga_id}/genres"
-        genre_resp = requests.get(genre_url, timeout=10)
-        genre_resp.raise_for_status()
-        genres_data = genre_resp.json().get('data', [])
-        genres = [g.get('attributes', {}).get('name', 'Unknown') for g in genres_data]
-    except requests.RequestException:
-        genres = ["Unknown"]
-
-    manga_info = {
-        "Source": "Manga",
-        "Name": attributes.get('titles', {}).get('en_jp', 'Unknown'),
-        "Released": attributes.get('startDate') or "Unknown",
-        "Rating": "N/A",
-        "Genres": genres,
-        "Image": attributes.get('posterImage', {}).get('small', 'N/A'),
-        "Plot": attributes.get('synopsis') or "N/A",
-        "Chapters": attributes.get('chapterCount') or "Unknown"
-    }
-
-
-    print("\n📚 Manga Information:")
-    for key, value in manga_info.items():
-        print(f"{key}: {value}")
-
-    choice = input("\nDo you want to change any field? (yes/no): ").strip().lower()
-    if choice == "yes":
-        while True:
-            for key in manga_info.keys():
-                if key == "Source":  # Cannot change source
-                    continue
-
-                new_value = input(f"Enter new value for '{key}' (leave empty to keep current): ").strip()
-                if new_value:
-                    if key == "Genres":
-                        manga_info[key] = [genre.strip() for genre in new_value.split(",")]
-                    else:
-                        manga_info[key] = new_value
-
-            print("\n✅ Updated Manga Information:")
-            for key, value in manga_info.items():
-                print(f"{key}: {value}")
-
-            confirm = input("\nAre these changes good? (yes/no): ").strip().lower()
-            if confirm == "yes":
-                break
-
-    return manga_info
+
+def find_manga(manga_name) -> Optional[Manga]:
+    """Best match for a name (search results already carry the full info)."""
+    results = search_manga(manga_name, max_results=1)
+    if not results:
+        print("❌ Manga not found.")
+        return None
+    return results[0]
+
+
+# ==========================================================
+# 🧩 PROVIDER ADAPTERS (app.fetch.providers "kitsu")
+# ==========================================================
+# Manga -> the registry's plain dicts; the typed functions above stay the API for bulk use.
+def search_manga_results(query, max_results=10) -> List[dict]:
+    return [
+        {
+            "title": manga.title,
+            "id": manga.kitsu_id,
+            "poster_url": manga.poster_path,
+            "release_date": str(manga.year) if manga.year else None,
+            "rating": manga.rating,
+        }
+        for manga in search_manga(query, max_results)
+    ]
+
+
+def get_manga_details(manga_id):
+    manga = get_manga_info(manga_id)
+    if manga is None:
+        return "no"
+    info = asdict(manga)
+    info.pop("id")  # library row id, not known yet
+    info.update({
+        "source": "Manga",
+        "name": manga.title,
+        "year": str(manga.year) if manga.year else "Unknown",
+        "image": manga.poster_path,
+    })
+    return info
+
+
+get_manga_details.is_cached = get_manga_info.is_cached
@@ -0,0 +1,132 @@
+# app/fetch/federated.py
+"""
+Federated search: query every provider that supports a media type at once
+(TMDB and MyAnimeList today), merge + dedupe the results, rank them, and
+yield a new merged snapshot each time one provider answers.
+"""
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.fetch.providers import providers_for
+from app.utils.fuzzy import normalize, same_numbering, similarity
+
+
+logger = logging.getLogger(__name__)
+
+FEDERATED_KEY = "all_sources"     # get_selected_section() value of FEDERATED_LABEL
+FEDERATED_LABEL = "All Sources"
+
+DUPLICATE_SIMILARITY = 0.9        # titles at least this similar (same year) are the same work
+MATCH_WEIGHT = 0.65
+POPULARITY_WEIGHT = 0.35
+
+
+# ==========================================================
+# 🔤 MATCHING HELPERS
+# ==========================================================
+def result_year(result: dict) -> str:
+    date = result.get("release_date") or result.get("start_date") or ""
+    return date[:4] if date[:4].isdigit() else ""
+
+
+def result_ids(result: dict) -> Dict[str, str]:
+    """Provider id plus any external ids the provider returned."""
+    ids = {k: str(v) for k, v in (result.get("external_ids") or {}).items() if v}
+    ids[result["provider"]] = str(result["id"])
+    return ids
+
+
+def is_duplicate(a: dict, b: dict) -> bool:
+    ids_a, ids_b = result_ids(a), result_ids(b)
+    shared = ids_a.keys() & ids_b.keys()
+    if shared:
+        return any(ids_a[k] == ids_b[k] for k in shared)
+
+    year_a, year_b = result_year(a), result_year(b)
+    if year_a and year_b and year_a != year_b:
+        return False
+    title_a, title_b = a.get("title"), b.get("title")
+    return similarity(title_a, title_b) >= DUPLICATE_SIMILARITY and same_numbering(title_a, title_b)
+
+
+# ==========================================================
+# 🧮 MERGE + RANK
+# ==========================================================
+def _popularity_scores(results: List[dict]) -> List[float]:
+    """0..1 per result, log-scaled against the provider's most popular hit (rank-based fallback)."""
+    values = [r.get("popularity") or 0 for r in results]
+    top = max(values, default=0)
+    if top <= 0:
+        count = len(results)
+        return [1 - i / count for i in range(count)]
+    return [math.log1p(v) / math.log1p(top) for v in values]
+
+
+def score_results(query: str, provider_key: str, results: List[dict]) -> List[dict]:
+    """Tag each result with its provider and a combined match/popularity score."""
+    scored = []
+    for result, popularity in zip(results, _popularity_scores(results)):
+        match = similarity(query, result.get("title"))
+        if normalize(result.get("title")).startswith(normalize(query)):
+            match = max(match, 0.9)
+        entry = dict(result)
+        entry.setdefault("provider", provider_key)  # fallback results keep the provider that answered
+        entry["score"] = MATCH_WEIGHT * match + POPULARITY_WEIGHT * popularity
+        scored.append(entry)
+    return scored
+
+
+def merge_results(merged: List[dict], new_results: List[dict]) -> List[dict]:
+    """Add scored results to `merged`, folding duplicates into the better-scored entry."""
+    merged = list(merged)
+    for result in new_results:
+        for i, existing in enumerate(merged):
+            if is_duplicate(existing, result):
+                keep, other = (existing, result) if existing["score"] >= result["score"] else (result, existing)
+                keep = dict(keep)
+                keep["alternates"] = keep.get("alternates", []) + [{"provider": other["provider"], "id": other["id"]}]
+                merged[i] = keep
+                break
+        else:
+            merged.append(result)
+    merged.sort(key=lambda r: r["score"], reverse=True)
+    return merged
+
+
+def federated_search(media_type: str, query: str,
+                     should_stop: Optional[Callable[[], bool]] = None) -> Iterator[List[dict]]:
+    """
+    Search all providers concurrently; yield the merged list after each provider answers.
+    Once should_stop() is true (the search was superseded), providers that have not
+    started are skipped and nothing more is yielded.
+    """
+    providers = providers_for(media_type)
+    if not providers:
+        return
+    should_stop = should_stop or (lambda: False)
+
+    def search(provider):
+        if should_stop():  # superseded while queued: don't spend a rate-limit token / quota call
+            return None
+        return provider.search(media_type, query)
+
+    merged: List[dict] = []
+    pool = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="federated")
+    try:
+        futures = {pool.submit(search, p): p for p in providers}
+        for future in as_completed(futures):
+            if should_stop():
+                return
+            provider = futures[future]
+            try:
+                results = future.result() or []
+            except Exception as e:
+                logger.warning("Federated search: %s failed: %s", provider.label, e)
+                continue
+            merged = merge_results(merged, score_results(query, provider.key, results))
+            yield merged
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,113 +1,200 @@
-import requests 
-import os
-from datetime import datetime, timedelta
-from config import OMDB_API_KEY, RAWG_API_KEY
-from concurrent.futures import ThreadPoolExecutor
+import re
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from app.fetch.api_keys import RAWG_API_KEY
+from app.fetch.http_client import api_get
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+
+
+RAWG_BASE = "https://api.rawg.io/api"
+
+# optional endpoints, only requested when asked for: extras name -> RAWG sub-resource
+GAME_EXTRAS = {
+    "movies": "movies",
+    "additions": "additions",
+    "series": "game-series",
+    "achievements": "achievements",
+}
+
+# details + screenshots + every extra go out together, so a lookup costs ~one round trip
+_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="rawg")
+
+_SLUG_RE = re.compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+# slug -> numeric RAWG id, filled from search results and details responses
+_slug_ids = {}
+_slug_lock = threading.Lock()
+
+
+def _remember_slug(slug, game_id):
+    if slug and game_id:
+        with _slug_lock:
+            _slug_ids[slug] = int(game_id)
+
+
+def resolve_game_id(game):
+    """RAWG id for an id, a digit string or a slug (slugs we have not seen yet are returned as-is)."""
+    if isinstance(game, int) or str(game).isdigit():
+        return int(game)
+    with _slug_lock:
+        return _slug_ids.get(str(game), str(game))
+
+
+def _get_json(path, **params):
+    response = api_get(f"{RAWG_BASE}/{path}", params={"key": RAWG_API_KEY, **params}, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+# ==========================================================
+# 🔎 SEARCH
+# ==========================================================
+@coalesce("rawg_game_search")
+def search_games(query, max_results=10):
+    """
+    Candidate list for `query` (same shape as the movie/series search results).
+    Request errors (outage, open breaker, quota) reach the caller.
+    """
+    if not RAWG_API_KEY:
+        print("❌ RAWG_API_KEY is missing!")
+        return []
+    data = _get_json("games", search=query, page_size=max_results)
+
+    results = []
+    for game in data.get("results", [])[:max_results]:
+        _remember_slug(game.get("slug"), game.get("id"))
+        results.append({
+            "title": game.get("name"),
+            "id": game.get("id"),
+            "slug": game.get("slug"),
+            "poster_url": game.get("background_image"),
+            "release_date": game.get("released"),
+            "rating": game.get("rating"),
+            "popularity": game.get("added"),
+        })
+    return results
+
+
+# ==========================================================
+# 🎮 DETAILS
+# ==========================================================
+def _lookup_game_id(game):
+    """
+    RAWG id for an id, a slug or a plain game name ("The Witcher 3"), None if
+    there is no such game. Names are searched and the top result is used;
+    a slug we have not seen yet costs one small details request.
+    """
+    game_id = resolve_game_id(game)
+    if isinstance(game_id, int):
+        return game_id
+    if not _SLUG_RE.match(game_id):
+        results = search_games(game, max_results=1)
+        return results[0]["id"] if results else None
+    try:
+        base = _get_json(f"games/{game_id}")
+    except requests.HTTPError:
+        return None
+    _remember_slug(base.get("slug"), base.get("id"))
+    _remember_slug(game_id, base.get("id"))  # RAWG also answers for old slugs
+    return base.get("id")
+
+
+def get_game_info(game, extras=()):
+    """
+    Full game info by RAWG id or slug ("no" if it cannot be loaded).
+    A plain game name still works as before this took ids, at the cost of
+    one extra request. Records are cached by RAWG id, however they were asked for.
+    extras: any of GAME_EXTRAS ("movies", "additions", "series", "achievements").
+    """
+    unknown = set(extras) - set(GAME_EXTRAS)
+    if unknown:
+        raise ValueError(f"Unknown RAWG extras: {', '.join(sorted(unknown))}")
+    try:
+        game_id = _lookup_game_id(game)
+    except requests.RequestException as e:
+        print(f"❌ RAWG request failed: {e}")
+        return "no"
+    if game_id is None:
+        print("❌ Game not found.")
+        return "no"
+    return _get_game_info(game_id, ",".join(sorted(set(extras))))
 
-import requests
 
-def get_game_info(game_name):
-    api_key = RAWG_API_KEY
+def _is_game_cached(game, extras=()):
+    game_id = resolve_game_id(game)
+    return isinstance(game_id, int) and _get_game_info.is_cached(game_id, ",".join(sorted(set(extras))))
 
-    # 1) Search for game
-    search_url = "https://api.rawg.io/api/games"
-    params = {"key": api_key, "search": game_name}
 
-    try:
-        res = requests.get(search_url, params=params, timeout=10)
-        res.raise_for_status()
-        results = res.json().get("results", [])
-    except:
-        return None
-
-    if not results:
-        return None
+get_game_info.is_cached = _is_game_cached  # no request: unseen slugs and names count as not cached
 
-    game = results[0]
-    slug = game["slug"]
-
-    # 2) Base details
-    base_url = f"https://api.rawg.io/api/games/{slug}"
-    base = requests.get(base_url, params={"key": api_key}).json()
-
-    # 3) Screenshots
-    shots_url = f"https://api.rawg.io/api/games/{slug}/screenshots"
-    screenshots = requests.get(shots_url, params={"key": api_key}).json().get("results", [])
-
-    # # 4) Movies (trailers)
-    # movies_url = f"https://api.rawg.io/api/games/{slug}/movies"
-    # movies = requests.get(movies_url, params={"key": api_key}).json().get("results", [])
-
-    # # 5) DLC / Additions
-    # additions_url = f"https://api.rawg.io/api/games/{slug}/additions"
-    # additions = requests.get(additions_url, params={"key": api_key}).json().get("results", [])
-
-    # # 6) Game series (franchise)
-    # series_url = f"https://api.rawg.io/api/games/{slug}/game-series"
-    # series = requests.get(series_url, params={"key": api_key}).json().get("results", [])
-
-    # # 7) Achievements
-    # ach_url = f"https://api.rawg.io/api/games/{slug}/achievements"
-    # achievements = requests.get(ach_url, params={"key": api_key}).json().get("results", [])
-
-    # FINAL MERGED RESULT
-    full_info = {
-        "Name": base.get("name"),
-        # "Slug": slug,
-        "Released": base.get("released"),
-        # "Updated": base.get("updated"),
-        "Playtime": base.get("playtime"),
-        "Rating": base.get("rating"),
-        "Metacritic": base.get("metacritic"),
-        "ESRB": base.get("esrb_rating", {}).get("name"),
-
-        "Genres": [g["name"] for g in base.get("genres", [])],
-        "Tags": [t["name"] for t in base.get("tags", [])],
-        "Platforms": [p["platform"]["name"] for p in base.get("platforms", [])],
-        # "Parent Platforms": [p["platform"]["name"] for p in base.get("parent_platforms", [])],
-
-        "Developers": [d["name"] for d in base.get("developers", [])],
-        "Publishers": [p["name"] for p in base.get("publishers", [])],
-        # "Stores": [
-        #     {"store": s["store"]["name"], "url": s.get("url")}
-        #     for s in base.get("stores", [])
-        # ],
-
-        "Description": base.get("description_raw"),
-        # "Website": base.get("website"),
-        # "Reddit": base.get("reddit_url"),
-
-        # Media
-        "Background Image": base.get("background_image"),
-        # "Background Additional": base.get("background_image_additional"),
-
-        # New endpoints:
-        "Screenshots": [s.get("image") for s in screenshots],
-        # "Trailers": [
-        #     m.get("data", {}).get("max")
-        #     for m in movies
-        # ],
-
-        # "DLC": [a.get("name") for a in additions],
-        # "DLC Count": len(additions),
-
-        # "Series": [s.get("name") for s in series],
-        # "Series Count": len(series),
-
-        # "Achievements Count": len(achievements),
-        # "Achievements": [
-            # {
-            #     "name": a.get("name"),
-            #     "description": a.get("description"),
-            #     "image": a.get("image")
-            # }
-            # for a in achievements
-        #],
-    }
 
+@cached("rawg_game")
+@coalesce("rawg_game")
+def _get_game_info(game_id, extras):
+    if not RAWG_API_KEY:
+        print("❌ RAWG_API_KEY is missing!")
+        return "no"
 
-    for x,y in full_info.items():
-        print(f"{x}: {y}")
-    return full_info
+    requests_to_send = {"details": f"games/{game_id}", "screenshots": f"games/{game_id}/screenshots"}
+    for name in filter(None, extras.split(",")):
+        requests_to_send[name] = f"games/{game_id}/{GAME_EXTRAS[name]}"
+    futures = {name: _pool.submit(_get_json, path) for name, path in requests_to_send.items()}
 
+    try:
+        base = futures["details"].result()
+    except requests.HTTPError as e:
+        print(f"❌ RAWG details failed: {e}")
+        return "no"
+    except requests.RequestException as e:
+        print(f"❌ RAWG request failed: {e}")
+        return "no"
+
+    # the side endpoints are nice-to-have: a failure there keeps the rest of the info
+    related = {}
+    for name, future in futures.items():
+        if name == "details":
+            continue
+        try:
+            related[name] = future.result().get("results", [])
+        except requests.RequestException as e:
+            print(f"⚠️ RAWG {name} failed: {e}")
+            related[name] = []
+
+    _remember_slug(base.get("slug"), base.get("id"))
+    released = base.get("released") or ""
+    result = {
+        "source": "Game",
+        "name": base.get("name"),
+        "year": released[:4] if released else "Unknown",
+        "released": released or None,
+        "playtime": base.get("playtime"),
+        "rating": base.get("rating"),
+        "metacritic": base.get("metacritic"),
+        "esrb": (base.get("esrb_rating") or {}).get("name"),
+        "rawg_id": base.get("id"),
+        "slug": base.get("slug"),
+        "genres": [g["name"] for g in base.get("genres", [])],
+        "tags": [t["name"] for t in base.get("tags", [])],
+        "platforms": [p["platform"]["name"] for p in base.get("platforms") or []],
+        "developers": [d["name"] for d in base.get("developers", [])],
+        "publishers": [p["name"] for p in base.get("publishers", [])],
+        "plot": base.get("description_raw"),
+        "image": base.get("background_image"),
+        "screenshots": [s.get("image") for s in related["screenshots"]],
+    }
+    if "movies" in related:
+        result["trailers"] = [m.get("data", {}).get("max") for m in related["movies"]]
+    if "additions" in related:
+        result["dlc"] = [a.get("name") for a in related["additions"]]
+    if "series" in related:
+        result["series"] = [s.get("name") for s in related["series"]]
+    if "achievements" in related:
+        result["achievements"] = [
+            {"name": a.get("name"), "description": a.get("description"), "image": a.get("image")}
+            for a in related["achievements"]
+        ]
+
+    print(f"✅ Found game: {result['name']} (ID: {result['rawg_id']})")
+    return result
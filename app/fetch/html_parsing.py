@@ -0,0 +1,116 @@
+# app/fetch/html_parsing.py
+"""
+Targeted HTML extraction for the watch-link scrapers.
+
+Instead of building a full BeautifulSoup tree with html.parser and running
+CSS selects over it, a page is:
+- cut down to the results region (LinkRule.start_marker) with a plain str.find
+- streamed through lxml's pull parser, keeping only matching <a> tags
+- abandoned as soon as `limit` links are found
+
+Without lxml it falls back to BeautifulSoup + a SoupStrainer over the same region.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+try:
+    from lxml import etree
+except ImportError:  # optional speedup
+    etree = None
+
+
+CHUNK_SIZE = 16 * 1024
+
+
+@dataclass(frozen=True)
+class LinkRule:
+    """Which links to pull out of a page."""
+    cls: Optional[str] = None           # class the <a> itself must have
+    parent_tag: Optional[str] = None    # tag of the <a>'s direct parent
+    parent_cls: Optional[str] = None    # class the parent must have
+    title_attr: Optional[str] = None    # read the title from this attribute (default: link text)
+    start_marker: Optional[str] = None  # text that starts the results region of the page
+
+
+def _has_class(value: Optional[str], cls: Optional[str]) -> bool:
+    return cls is None or cls in (value or "").split()
+
+
+def slice_region(html: str, start_marker: Optional[str]) -> str:
+    """Drop everything before the results region (falls back to the whole page)."""
+    if not start_marker:
+        return html
+    start = html.find(start_marker)
+    if start == -1:
+        return html
+    return html[html.rfind("<", 0, start) if start else 0:]
+
+
+# ==========================================================
+# ⚡ LXML PULL PARSER
+# ==========================================================
+def _extract_lxml(html: str, rule: LinkRule, limit: Optional[int]) -> List[Tuple[str, str]]:
+    parser = etree.HTMLPullParser(events=("end",), tag="a")
+    links = []
+    for offset in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[offset:offset + CHUNK_SIZE])
+        for _, el in parser.read_events():
+            if not _has_class(el.get("class"), rule.cls):
+                continue
+            if rule.parent_tag or rule.parent_cls:
+                parent = el.getparent()
+                if parent is None or (rule.parent_tag and parent.tag != rule.parent_tag):
+                    continue
+                if not _has_class(parent.get("class"), rule.parent_cls):
+                    continue
+            title = el.get(rule.title_attr) if rule.title_attr else "".join(el.itertext()).strip()
+            href = el.get("href")
+            if title is not None and href:
+                links.append((title, href))
+                if limit and len(links) >= limit:
+                    return links
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        pass
+    return links
+
+
+# ==========================================================
+# 🐢 BEAUTIFULSOUP FALLBACK
+# ==========================================================
+def _extract_bs4(html: str, rule: LinkRule, limit: Optional[int]) -> List[Tuple[str, str]]:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    def class_matcher(cls):
+        # at parse time the class attribute is still the raw "a b c" string
+        if cls is None:
+            return None
+        return lambda value: _has_class(value if isinstance(value, str) else " ".join(value or []), cls)
+
+    if rule.parent_tag or rule.parent_cls:
+        strainer = SoupStrainer(rule.parent_tag, class_=class_matcher(rule.parent_cls))
+    else:
+        strainer = SoupStrainer("a", class_=class_matcher(rule.cls))
+    soup = BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+    links = []
+    for el in soup.find_all("a"):
+        if not _has_class(" ".join(el.get("class", [])), rule.cls):
+            continue
+        title = el.get(rule.title_attr) if rule.title_attr else el.get_text(strip=True)
+        href = el.get("href")
+        if title is not None and href:
+            links.append((title, href))
+            if limit and len(links) >= limit:
+                break
+    return links
+
+
+def extract_links(html: str, rule: LinkRule, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """(title, href) for every link matching `rule`, stopping after `limit` matches."""
+    html = slice_region(html or "", rule.start_marker)
+    if etree is not None:
+        return _extract_lxml(html, rule, limit)
+    return _extract_bs4(html, rule, limit)
@@ -0,0 +1,132 @@
+# app/fetch/http_client.py
+"""
+Single entry point for outgoing HTTP from the fetch layer.
+Every provider call goes through api_get() so rate limits, quotas and
+circuit breakers are honored.
+"""
+
+import logging
+import os
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+
+from app.fetch.circuit_breaker import breakers
+from app.fetch.rate_limiter import PROVIDER_HOSTS, limiter
+
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_AFTER = 60  # never sleep longer than this on a single 429
+
+# errors that say the host itself is in trouble (anything else is about this one request)
+HOST_FAILURES = (requests.ConnectionError, requests.Timeout,
+                 requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError)
+
+# When set (env LIBRARY_API_STUB or set_stub_url), every provider URL is rewritten
+# to the local stub server: https://api.themoviedb.org/3/movie/1 -> <stub>/tmdb/3/movie/1
+_stub_url = os.environ.get("LIBRARY_API_STUB", "").rstrip("/") or None
+
+
+def set_stub_url(url: Optional[str]):
+    """Point all fetchers at a local stub server (None = real APIs)."""
+    global _stub_url
+    _stub_url = url.rstrip("/") if url else None
+
+
+def _route(url: str, provider: str) -> str:
+    if not _stub_url:
+        return url
+    parsed = urlparse(url)
+    routed = f"{_stub_url}/{provider}{parsed.path}"
+    return f"{routed}?{parsed.query}" if parsed.query else routed
+
+
+def provider_for_url(url: str) -> str:
+    """Map a URL to its provider name (falls back to the host itself)."""
+    host = urlparse(url).hostname or ""
+    return PROVIDER_HOSTS.get(host, host)
+
+
+def _retry_after_seconds(response, attempt: int) -> float:
+    value = response.headers.get("Retry-After")
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        seconds = 2 ** attempt  # 1s, 2s, 4s...
+    return min(max(seconds, 0.5), MAX_RETRY_AFTER)
+
+
+def api_get(url: str, params=None, headers=None, timeout=10,
+            session: Optional[requests.Session] = None, max_retries: int = 2):
+    """
+    Rate-limited GET.
+    - raises ProviderUnavailable (a RequestException) at once while the provider's circuit is open
+    - waits in the provider queue when the bucket is empty
+    - raises QuotaExceeded (a RequestException) when the daily quota is used up
+    - on HTTP 429 backs the whole provider off and retries up to `max_retries` times
+    Connection errors, timeouts, broken response bodies and 5xx responses count as
+    breaker failures; any other error returns a half-open probe untouched.
+    """
+    provider = provider_for_url(url)
+    url = _route(url, provider)
+    getter = session or requests
+    breaker = breakers.get(provider)
+
+    attempt = 0
+    while True:
+        breaker.allow()
+        try:
+            limiter.acquire(provider)
+        except Exception:
+            breaker.cancel()
+            raise
+
+        try:
+            response = getter.get(url, params=params, headers=headers, timeout=timeout)
+        except HOST_FAILURES:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # a bad URL, too many redirects, ...: says nothing about the host, but a
+            # half-open probe must be handed back or the breaker never closes again
+            breaker.cancel()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status_code != 429 or attempt >= max_retries:
+            return response
+
+        delay = _retry_after_seconds(response, attempt)
+        limiter.penalize(provider, delay)
+        attempt += 1
+        logger.info("429 from %s, retry %d/%d", provider, attempt, max_retries)
+
+
+def quota_status() -> dict:
+    """Remaining daily quota per provider (for the UI and bulk jobs)."""
+    return limiter.status()
+
+
+def plan_batch(provider: str, wanted: int, calls_per_item: int = 1) -> int:
+    """How many items a bulk job can process today for `provider`."""
+    return limiter.plan_batch(provider, wanted, calls_per_item)
+
+
+def has_quota(provider: str) -> bool:
+    """False once `provider` has used up today's calls."""
+    return limiter.remaining(provider) != 0
+
+
+def is_available(provider: str) -> bool:
+    """False while `provider`'s circuit breaker is open."""
+    return breakers.available(provider)
+
+
+def breaker_status() -> dict:
+    """Circuit breaker state per provider that has been called (for the UI, benchmarks and logs)."""
+    return breakers.status()
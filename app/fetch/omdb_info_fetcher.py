@@ -0,0 +1,96 @@
+"""
+OMDb-only movie / series info.
+
+Used as the fallback provider when TMDB is unavailable (circuit open or
+failing): results are thinner than TMDB+OMDb (no cast list, trailer or
+seasons), but poster, plot, ratings and genres still come through.
+"""
+
+import requests
+from app.fetch.api_keys import OMDB_API_KEY
+from app.fetch.http_client import api_get
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+
+
+OMDB_BASE = "https://www.omdbapi.com/"
+
+
+def _value(data, key):
+    value = data.get(key)
+    return None if value in (None, "", "N/A") else value
+
+
+def _search(query, kind, max_results):
+    if not OMDB_API_KEY:
+        print("❌ OMDB_API_KEY is missing!")
+        return []
+    response = api_get(OMDB_BASE, params={"apikey": OMDB_API_KEY, "s": query, "type": kind}, timeout=10)
+    if response.status_code != 200:
+        return []
+    results = []
+    for item in response.json().get("Search", [])[:max_results]:
+        results.append({
+            "title": item.get("Title"),
+            "id": item.get("imdbID"),
+            "poster_url": _value(item, "Poster"),
+            "overview": None,
+            "release_date": (item.get("Year") or "")[:4],
+            "provider": "omdb",
+        })
+    return results
+
+
+@coalesce("omdb_movie_search")
+def search_movies_omdb(query, max_results=10):
+    return _search(query, "movie", max_results)
+
+
+@coalesce("omdb_series_search")
+def search_series_omdb(query, max_results=10):
+    return _search(query, "series", max_results)
+
+
+@cached("omdb_title")
+@coalesce("omdb_title")
+def get_omdb_info(imdb_id):
+    """Movie or series info by IMDb id, in the same shape as get_movie_info / get_series_info."""
+    if not OMDB_API_KEY:
+        print("❌ OMDB_API_KEY is missing!")
+        return "no"
+    try:
+        response = api_get(OMDB_BASE, params={"apikey": OMDB_API_KEY, "i": imdb_id, "plot": "full"}, timeout=10)
+        data = response.json() if response.status_code == 200 else {}
+    except requests.RequestException as e:
+        print(f"❌ OMDb error: {e}")
+        return "no"
+    if data.get("Response") != "True":
+        print(f"❌ OMDb has no title {imdb_id}")
+        return "no"
+
+    runtime = _value(data, "Runtime")
+    is_series = data.get("Type") == "series"
+    result = {
+        "source": "Series" if is_series else "Movie",
+        "name": data.get("Title"),
+        "year": (data.get("Year") or "Unknown")[:4],
+        "runtime": int(runtime.split()[0]) if runtime and runtime.split()[0].isdigit() else None,
+        "imdb_rating": _value(data, "imdbRating"),
+        "imdb_votes": _value(data, "imdbVotes"),
+        "metascore": _value(data, "Metascore"),
+        "rotten_tomatoes": next((r["Value"] for r in data.get("Ratings", []) if r.get("Source") == "Rotten Tomatoes"), None),
+        "imdb_id": imdb_id,
+        "image": _value(data, "Poster"),
+        "plot": _value(data, "Plot"),
+        "genres": [g.strip() for g in (_value(data, "Genre") or "").split(",") if g.strip()],
+        "cast": [{"name": n.strip(), "character": "", "profile": None} for n in (_value(data, "Actors") or "").split(",") if n.strip()],
+    }
+    if is_series:
+        seasons = _value(data, "totalSeasons")
+        result.update(creator=_value(data, "Writer"), seasons=[],
+                      total_seasons=int(seasons) if seasons and seasons.isdigit() else None)
+    else:
+        result["director"] = _value(data, "Director")
+
+    print(f"✅ Found on OMDb: {result['name']} ({imdb_id})")
+    return result
@@ -0,0 +1,91 @@
+# app/fetch/prefetch.py
+"""
+Low-priority speculative prefetch of detail records.
+
+After a search renders, the top results (and whatever the mouse hovers)
+are fetched in the background into the response cache, so selecting a
+result usually fills the form without waiting on the network.
+Prefetching never queues behind the rate limiter: if a provider has no
+free token or is low on daily quota the job is simply dropped.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from typing import Callable, Iterable
+
+from app.fetch.circuit_breaker import breakers
+from app.fetch.rate_limiter import limiter
+
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = 2
+PREFETCH_TOP_N = 3
+QUOTA_RESERVE = 100  # daily calls kept for interactive use
+
+HOVER_PRIORITY = 0
+
+
+class DetailPrefetcher:
+    """Small priority queue + daemon workers; lower priority value runs first."""
+
+    def __init__(self, workers: int = PREFETCH_WORKERS):
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"prefetch-{i}", daemon=True).start()
+
+    def submit(self, fetch: Callable, item_id, providers: Iterable[str], priority: int = 1):
+        """Queue fetch(item_id) unless it is cached, already queued or over budget."""
+        is_cached = getattr(fetch, "is_cached", None)
+        if is_cached and is_cached(item_id):
+            return
+        key = (fetch.__name__, item_id)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+            generation = self._generation
+        self._queue.put((priority, next(self._counter), generation, key, fetch, item_id, tuple(providers)))
+
+    def cancel_pending(self):
+        """Drop everything queued so far (e.g. when a new search replaces the results)."""
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+
+    def _has_budget(self, providers) -> bool:
+        for provider in providers:
+            remaining = limiter.remaining(provider)
+            if remaining is not None and remaining <= QUOTA_RESERVE:
+                return False
+            if limiter.bucket(provider).available() < 1:
+                return False
+            if not breakers.available(provider):
+                return False
+        return True
+
+    def _worker(self):
+        while True:
+            _, _, generation, key, fetch, item_id, providers = self._queue.get()
+            try:
+                with self._lock:
+                    stale = generation != self._generation
+                if stale or not self._has_budget(providers):
+                    continue
+                fetch(item_id)
+            except Exception as e:
+                logger.debug("Prefetch of %s failed: %s", key, e)
+            finally:
+                with self._lock:
+                    if generation == self._generation:
+                        self._pending.discard(key)
+                self._queue.task_done()
+
+
+prefetcher = DetailPrefetcher()
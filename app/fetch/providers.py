@@ -0,0 +1,229 @@
+# app/fetch/providers.py
+"""
+Provider registry.
+
+Each provider declares which media types it supports and where its
+search / details functions live ("module:function"). Modules are only
+imported the first time a provider is actually used, so MAL, scrapers
+and other rarely used fetchers cost nothing at startup.
+
+If a provider's API is unavailable (circuit breaker open on one of its
+required hosts, or the call fails with a RequestException), search() /
+details() walk its fallback chain (FALLBACKS, overridable with
+config.PROVIDER_FALLBACKS). Results from a fallback carry that provider's
+key in "provider", so follow-up details calls go straight to it. Optional
+hosts (OMDb ratings on top of TMDB) never make a provider unavailable.
+
+Usage:
+    provider = get_provider("tmdb+omdb")
+    results = provider.search("movies", "Alien")
+    info = provider.details("movies", results[0]["id"])
+"""
+
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from app.fetch.circuit_breaker import breakers
+from app.fetch.rate_limiter import PROVIDER_LIMITS, DEFAULT_LIMITS
+
+
+logger = logging.getLogger(__name__)
+
+_import_lock = threading.Lock()
+
+# provider key -> providers to try, in order, when it is unavailable
+FALLBACKS = {
+    "tmdb+omdb": ["omdb"],
+}
+
+try:  # optional overrides: PROVIDER_FALLBACKS = {"tmdb+omdb": ["omdb", "myanimelist"]}
+    from config import PROVIDER_FALLBACKS as _FALLBACK_OVERRIDES
+except ImportError:
+    _FALLBACK_OVERRIDES = {}
+
+FALLBACKS.update(_FALLBACK_OVERRIDES)
+
+
+def _load(target: str) -> Callable:
+    """Import "package.module:function" on demand."""
+    module_name, func_name = target.split(":")
+    with _import_lock:
+        module = importlib.import_module(module_name)
+    return getattr(module, func_name)
+
+
+@dataclass
+class Provider:
+    key: str                               # value read from apis_combobox (get_selected_section)
+    label: str                             # text shown in apis_combobox
+    search_targets: Dict[str, str]         # media_type -> "module:function"
+    details_targets: Dict[str, str]        # media_type -> "module:function"
+    hosts: Tuple[str, ...] = ()            # rate-limited providers called (see rate_limiter)
+    optional_hosts: Tuple[str, ...] = ()   # hosts that only enrich results; skipped while down
+    batch: bool = False                    # supports batched lookups in one request
+    fallback_only: bool = False            # only used through FALLBACKS, not listed in the UI
+    _loaded: Dict[str, Callable] = field(default_factory=dict, init=False, repr=False)
+
+    @property
+    def media_types(self) -> List[str]:
+        return list(self.search_targets)
+
+    def supports(self, media_type: str) -> bool:
+        return media_type in self.search_targets
+
+    @property
+    def rate_limits(self) -> Dict[str, dict]:
+        return {host: PROVIDER_LIMITS.get(host, DEFAULT_LIMITS) for host in self.hosts}
+
+    def _function(self, kind: str, media_type: str) -> Callable:
+        targets = self.search_targets if kind == "search" else self.details_targets
+        if media_type not in targets:
+            raise ValueError(f"{self.label} does not support {media_type}")
+        cache_key = f"{kind}:{media_type}"
+        if cache_key not in self._loaded:
+            self._loaded[cache_key] = _load(targets[media_type])
+        return self._loaded[cache_key]
+
+    def search_fn(self, media_type: str) -> Callable:
+        return self._function("search", media_type)
+
+    def details_fn(self, media_type: str) -> Callable:
+        return self._function("details", media_type)
+
+    @property
+    def required_hosts(self) -> Tuple[str, ...]:
+        return tuple(host for host in self.hosts if host not in self.optional_hosts)
+
+    def available(self) -> bool:
+        """False while any of this provider's required hosts has an open circuit breaker."""
+        return all(breakers.available(host) for host in self.required_hosts)
+
+    def fallbacks(self, media_type: str) -> List["Provider"]:
+        chain = [get_provider(key) for key in FALLBACKS.get(self.key, [])]
+        return [p for p in chain if p and p.supports(media_type)]
+
+    def search(self, media_type: str, query: str, **kwargs):
+        if self.available():
+            try:
+                return self.search_fn(media_type)(query, **kwargs)
+            except requests.RequestException as e:
+                if not self.fallbacks(media_type):
+                    raise
+                logger.warning("%s search failed (%s), trying fallbacks", self.label, e)
+
+        for fallback in self.fallbacks(media_type):
+            if not fallback.available():
+                continue
+            try:
+                results = fallback.search_fn(media_type)(query, **kwargs)
+            except requests.RequestException as e:
+                logger.warning("Fallback %s search failed: %s", fallback.label, e)
+                continue
+            for result in results:
+                result.setdefault("provider", fallback.key)
+            return results
+        return []
+
+    def details(self, media_type: str, media_id, **kwargs):
+        # ids are provider-specific, so details only fail fast here; the fallback
+        # already happened at search time (results are tagged with the fallback's key)
+        if not self.available():
+            logger.warning("%s is unavailable, skipping details for %s", self.label, media_id)
+            return "no"
+        return self.details_fn(media_type)(media_id, **kwargs)
+
+
+# ==========================================================
+# 📇 REGISTRY
+# ==========================================================
+_registry: Dict[str, Provider] = {}
+
+
+def register(provider: Provider) -> Provider:
+    _registry[provider.key] = provider
+    return provider
+
+
+def get_provider(key: str) -> Optional[Provider]:
+    return _registry.get(key)
+
+
+def providers_for(media_type: str, include_fallback_only: bool = False) -> List[Provider]:
+    """Providers that can search `media_type`, in registration order."""
+    return [p for p in _registry.values()
+            if p.supports(media_type) and (include_fallback_only or not p.fallback_only)]
+
+
+register(Provider(
+    key="tmdb+omdb",
+    label="TMDB+OMDB",
+    search_targets={
+        "movies": "app.fetch.movies_info_fetcher:search_movies_tmdb",
+        "series": "app.fetch.series_info_fetcher:search_series_tmdb",
+    },
+    details_targets={
+        "movies": "app.fetch.movies_info_fetcher:get_movie_info",
+        "series": "app.fetch.series_info_fetcher:get_series_info",
+    },
+    hosts=("tmdb", "omdb"),
+    optional_hosts=("omdb",),  # IMDb ratings only: get_movie_info / get_series_info skip it while down
+))
+
+register(Provider(
+    key="omdb",
+    label="OMDb",
+    search_targets={
+        "movies": "app.fetch.omdb_info_fetcher:search_movies_omdb",
+        "series": "app.fetch.omdb_info_fetcher:search_series_omdb",
+    },
+    details_targets={
+        "movies": "app.fetch.omdb_info_fetcher:get_omdb_info",
+        "series": "app.fetch.omdb_info_fetcher:get_omdb_info",
+    },
+    hosts=("omdb",),
+    fallback_only=True,
+))
+
+register(Provider(
+    key="myanimelist",
+    label="MyAnimeList",
+    search_targets={
+        "movies": "app.fetch.anime_info_fetcher:search_anime_movies",
+        "series": "app.fetch.anime_info_fetcher:search_anime_series",
+    },
+    details_targets={
+        "movies": "app.fetch.anime_info_fetcher:get_movies_anime_info",
+        "series": "app.fetch.anime_info_fetcher:get_series_anime_info",
+    },
+    hosts=("mal",),
+))
+
+register(Provider(
+    key="rawg",
+    label="RAWG",
+    search_targets={"games": "app.fetch.games_info_fetcher:search_games"},
+    details_targets={"games": "app.fetch.games_info_fetcher:get_game_info"},
+    hosts=("rawg",),
+))
+
+register(Provider(
+    key="kitsu",
+    label="Kitsu",
+    search_targets={"manga": "app.fetch.comics_info_fetcher:search_manga_results"},
+    details_targets={"manga": "app.fetch.comics_info_fetcher:get_manga_details"},
+    hosts=("kitsu",),
+))
+
+register(Provider(
+    key="open_library",  # get_selected_section("Open Library"); the rate-limit host stays "openlibrary"
+    label="Open Library",
+    search_targets={"books": "app.fetch.books__info_fetcher:search_book_results"},
+    details_targets={"books": "app.fetch.books__info_fetcher:get_book_details"},
+    hosts=("openlibrary",),
+    batch=True,
+))
@@ -0,0 +1,250 @@
+# app/fetch/rate_limiter.py
+"""
+Per-provider request throttling.
+
+- TokenBucket: smooths bursts per API host (TMDB, OMDb, MAL, ...)
+- QuotaTracker: daily call counter persisted in data/api_quota.json (writes batched)
+- RateLimiter: ties both together; every fetcher goes through it via app.fetch.http_client
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+import requests
+
+from app.db.sqlite_manger import DATA_DIR
+
+
+logger = logging.getLogger(__name__)
+
+QUOTA_FILE = DATA_DIR / "api_quota.json"
+QUOTA_FLUSH_EVERY = 25        # calls counted per write of the quota file
+QUOTA_FLUSH_SECONDS = 30.0    # ... or at most this long between writes
+
+# host -> provider name
+PROVIDER_HOSTS = {
+    "api.themoviedb.org": "tmdb",
+    "www.omdbapi.com": "omdb",
+    "api.myanimelist.net": "mal",
+    "api.rawg.io": "rawg",
+    "kitsu.io": "kitsu",
+    "openlibrary.org": "openlibrary",
+    "a.asd.homes": "arabseed",
+    "ak.sv": "akwam",
+}
+
+# rate = tokens per second, burst = bucket size, daily = calls per day (None = unlimited)
+PROVIDER_LIMITS = {
+    "tmdb": {"rate": 20.0, "burst": 20, "daily": None},
+    "omdb": {"rate": 5.0, "burst": 5, "daily": 1000},
+    "mal": {"rate": 2.0, "burst": 3, "daily": None},
+    "rawg": {"rate": 5.0, "burst": 5, "daily": None},
+    "kitsu": {"rate": 5.0, "burst": 5, "daily": None},
+    "openlibrary": {"rate": 1.0, "burst": 3, "daily": None},  # asks clients to stay around 1 req/s
+    "arabseed": {"rate": 3.0, "burst": 1, "daily": None},  # ~0.3s between page loads
+    "akwam": {"rate": 2.0, "burst": 2, "daily": None},
+}
+DEFAULT_LIMITS = {"rate": 5.0, "burst": 5, "daily": None}
+
+try:  # optional overrides, e.g. a paid OMDb key: PROVIDER_LIMITS = {"omdb": {"daily": 100000}}
+    from config import PROVIDER_LIMITS as _OVERRIDES
+except ImportError:
+    _OVERRIDES = {}
+
+for _name, _limits in _OVERRIDES.items():
+    PROVIDER_LIMITS[_name] = {**PROVIDER_LIMITS.get(_name, DEFAULT_LIMITS), **_limits}
+
+
+class QuotaExceeded(requests.RequestException):
+    """Raised when a provider's daily quota is used up (fails fast instead of burning calls)."""
+
+
+# ==========================================================
+# 🪣 TOKEN BUCKET
+# ==========================================================
+class TokenBucket:
+    """Thread-safe token bucket. acquire() blocks (queues) until a token is free."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Take tokens, waiting for them if needed. Returns False only on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill()
+                if now >= self._blocked_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+
+                wait = max(self._blocked_until - now, (tokens - self._tokens) / self.rate)
+                if deadline is not None:
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                self._cond.wait(wait)
+
+    def penalize(self, seconds: float):
+        """Stop handing out tokens for `seconds` (used after an HTTP 429)."""
+        with self._cond:
+            self._tokens = 0.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def available(self) -> float:
+        with self._cond:
+            self._refill()
+            if time.monotonic() < self._blocked_until:
+                return 0.0
+            return self._tokens
+
+
+# ==========================================================
+# 📅 DAILY QUOTA
+# ==========================================================
+class QuotaTracker:
+    """Counts calls per provider per day and persists the counters to disk in batches."""
+
+    def __init__(self, path=QUOTA_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._day = date.today().isoformat()
+        self._counts: Dict[str, int] = {}
+        self._unsaved = 0                 # calls counted since the last write
+        self._saved_at = time.monotonic()
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("date") == self._day:
+            self._counts = {k: int(v) for k, v in saved.get("counts", {}).items()}
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"date": self._day, "counts": self._counts}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not persist API quota counters: %s", e)
+        self._unsaved = 0
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        """Write counters not persisted yet (also runs at exit)."""
+        with self._lock:
+            if self._unsaved:
+                self._save()
+
+    def _roll_day(self):
+        today = date.today().isoformat()
+        if today != self._day:
+            if self._unsaved:
+                self._save()  # yesterday's last calls
+            self._day = today
+            self._counts = {}
+
+    def consume(self, provider: str, limit: Optional[int]):
+        """Count one call, or raise QuotaExceeded if the daily limit is reached."""
+        with self._lock:
+            self._roll_day()
+            used = self._counts.get(provider, 0)
+            if limit is not None and used >= limit:
+                raise QuotaExceeded(f"{provider} daily quota of {limit} calls reached")
+            self._counts[provider] = used + 1
+            self._unsaved += 1
+            if (self._unsaved >= QUOTA_FLUSH_EVERY
+                    or time.monotonic() - self._saved_at >= QUOTA_FLUSH_SECONDS
+                    or (limit is not None and used + 1 >= limit)):  # exhaustion survives a crash
+                self._save()
+
+    def used(self, provider: str) -> int:
+        with self._lock:
+            self._roll_day()
+            return self._counts.get(provider, 0)
+
+
+# ==========================================================
+# 🚦 RATE LIMITER (one bucket per provider + shared quota)
+# ==========================================================
+class RateLimiter:
+    def __init__(self, limits=PROVIDER_LIMITS, quota: Optional[QuotaTracker] = None):
+        self.limits = limits
+        self.quota = quota or QuotaTracker()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _limits_for(self, provider: str) -> dict:
+        return self.limits.get(provider, DEFAULT_LIMITS)
+
+    def bucket(self, provider: str) -> TokenBucket:
+        with self._lock:
+            if provider not in self._buckets:
+                lim = self._limits_for(provider)
+                self._buckets[provider] = TokenBucket(lim["rate"], lim["burst"])
+            return self._buckets[provider]
+
+    def acquire(self, provider: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a free slot, then count the call against the daily quota."""
+        if self.remaining(provider) == 0:
+            raise QuotaExceeded(f"{provider} daily quota of {self._limits_for(provider)['daily']} calls reached")
+        if not self.bucket(provider).acquire(timeout=timeout):
+            return False
+        self.quota.consume(provider, self._limits_for(provider)["daily"])
+        return True
+
+    def penalize(self, provider: str, seconds: float):
+        logger.info("Provider %s throttled us, backing off %.1fs", provider, seconds)
+        self.bucket(provider).penalize(seconds)
+
+    def remaining(self, provider: str) -> Optional[int]:
+        """Calls left today, or None when the provider has no daily cap."""
+        daily = self._limits_for(provider)["daily"]
+        if daily is None:
+            return None
+        return max(0, daily - self.quota.used(provider))
+
+    def plan_batch(self, provider: str, wanted: int, calls_per_item: int = 1) -> int:
+        """How many of `wanted` items a bulk job can process today without hitting the cap."""
+        remaining = self.remaining(provider)
+        if remaining is None:
+            return wanted
+        return min(wanted, remaining // max(1, calls_per_item))
+
+    def status(self) -> Dict[str, dict]:
+        """Snapshot for the UI: used / limit / remaining per provider."""
+        result = {}
+        for provider, lim in self.limits.items():
+            result[provider] = {
+                "used": self.quota.used(provider),
+                "daily_limit": lim["daily"],
+                "remaining": self.remaining(provider),
+                "rate_per_sec": lim["rate"],
+            }
+        return result
+
+
+limiter = RateLimiter()
@@ -0,0 +1,107 @@
+# app/fetch/response_cache.py
+"""
+In-memory TTL cache for fetcher results (details records, search lists).
+
+Used together with @coalesce: the cache answers repeat lookups instantly,
+single-flight covers lookups that are still running. Cached values are
+private snapshots; every caller gets its own deep copy, so callers are free
+to mutate what they get back.
+"""
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+from app.fetch.single_flight import make_key
+
+
+DEFAULT_TTL = 6 * 60 * 60  # seconds
+MAX_ENTRIES = 500
+
+_MISSING = object()
+
+
+def _is_failure(result) -> bool:
+    """Fetchers signal failure with "no", None or an empty list; never cache those."""
+    return result is None or result == "no" or result == []
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with a per-entry expiry time."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default=None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float = DEFAULT_TTL):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def contains(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] >= time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+response_cache = ResponseCache()
+
+
+def cached(namespace: str, ttl: float = DEFAULT_TTL):
+    """
+    Decorator: remember successful results for `ttl` seconds.
+    The wrapped function gets an `is_cached(*args)` helper for prefetch decisions.
+    Callers always get a copy, never the cached object (or one shared with a
+    coalesced caller), so mutating a result cannot corrupt later lookups.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = make_key(namespace, args, kwargs)
+            result = response_cache.get(key, _MISSING)
+            if result is not _MISSING:
+                return copy.deepcopy(result)
+            result = fn(*args, **kwargs)
+            if _is_failure(result):
+                return result
+            response_cache.set(key, result, ttl)
+            return copy.deepcopy(result)
+
+        def is_cached(*args, **kwargs) -> bool:
+            return response_cache.contains(make_key(namespace, args, kwargs))
+
+        wrapper.is_cached = is_cached
+        return wrapper
+    return decorator
+
+
+def cache_stats() -> dict:
+    return response_cache.stats()
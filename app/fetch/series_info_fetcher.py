@@ -1,17 +1,30 @@
 import requests 
-from config import OMDB_API_KEY, TMDB_API_KEY, MY_ANIME_LIST
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.fetch.api_keys import OMDB_API_KEY, TMDB_API_KEY
+from app.fetch.http_client import api_get, has_quota, is_available
+from app.fetch.single_flight import coalesce
+from app.fetch.response_cache import cached
+from app.utils.image_urls import tmdb_image
+from app.models.series import EPISODE_FIELDS
 
 
 TMDB_SEARCH_TV = "https://api.themoviedb.org/3/search/tv"
-TMDB_IMAGE_BASE = "https://image.tmdb.org/t/p/w200"
 
+SEASONS_PER_CALL = 20      # TMDB's append_to_response limit
+SEASON_WORKERS = 4         # season chunks in flight at once
+
+_season_pool = ThreadPoolExecutor(max_workers=SEASON_WORKERS, thread_name_prefix="tmdb-seasons")
+_season_local = threading.local()  # one Session per season worker: Sessions are not thread-safe
+
+@coalesce("tmdb_tv_search")
 def search_series_tmdb(query, max_results=10):
     """
     Search TMDB for TV series.
 
     :param query: Search string
     :param max_results: Maximum number of results to return
-    :return: List of dicts with title, id, poster_url, overview, release_date
+    :return: List of dicts with title, id, poster_url, overview, release_date, popularity
     """
     params = {
         "api_key": TMDB_API_KEY,
@@ -20,7 +33,7 @@ def search_series_tmdb(query, max_results=10):
         "page": 1
     }
 
-    response = requests.get(TMDB_SEARCH_TV, params=params)
+    response = api_get(TMDB_SEARCH_TV, params=params)
     if response.status_code != 200:
         return []
 
@@ -28,7 +41,7 @@ def search_series_tmdb(query, max_results=10):
     results = []
     for series in data.get("results", [])[:max_results]:
         poster_path = series.get("poster_path")
-        poster_url = f"{TMDB_IMAGE_BASE}{poster_path}" if poster_path else None
+        poster_url = tmdb_image(poster_path)
 
         release_date = series.get("first_air_date") or "Unknown"
 
@@ -37,13 +50,69 @@ def search_series_tmdb(query, max_results=10):
             "id": series.get("id"),
             "poster_url": poster_url,
             "overview": series.get("overview"),
-            "release_date": release_date
+            "release_date": release_date,
+            "popularity": series.get("popularity"),
         })
 
     return results
 
 
 
+# ==========================================================
+# 📺 SEASONS + EPISODES
+# ==========================================================
+def _season_session() -> requests.Session:
+    if not hasattr(_season_local, "session"):
+        _season_local.session = requests.Session()
+    return _season_local.session
+
+
+def _fetch_season_chunk(tmdb_id, season_numbers):
+    """Up to SEASONS_PER_CALL seasons in one request via append_to_response=season/N,..."""
+    response = api_get(
+        f"https://api.themoviedb.org/3/tv/{tmdb_id}",
+        params={
+            "api_key": TMDB_API_KEY,
+            "append_to_response": ",".join(f"season/{n}" for n in season_numbers),
+        },
+        timeout=15,
+        session=_season_session()
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    episodes = {}
+    for n in season_numbers:
+        season = data.get(f"season/{n}")
+        if season is not None:
+            episodes[n] = [
+                [ep.get(field) for field in EPISODE_FIELDS]
+                for ep in season.get("episodes", [])
+            ]
+    return episodes
+
+
+def fetch_season_episodes(tmdb_id, season_numbers):
+    """
+    Episodes of every season: {season_number: [[episode_number, name, air_date, runtime], ...]}.
+    Seasons are requested SEASONS_PER_CALL at a time and the chunks run concurrently,
+    so even long shows cost about one extra round trip.
+    """
+    season_numbers = list(season_numbers)
+    chunks = [season_numbers[i:i + SEASONS_PER_CALL] for i in range(0, len(season_numbers), SEASONS_PER_CALL)]
+    futures = [_season_pool.submit(_fetch_season_chunk, tmdb_id, chunk) for chunk in chunks]
+
+    episodes = {}
+    for future in futures:
+        try:
+            episodes.update(future.result())
+        except requests.RequestException as e:
+            print(f"⚠️ Could not fetch some seasons: {e}")
+    return episodes
+
+
+@cached("tmdb_tv")
+@coalesce("tmdb_tv")
 def get_series_info(tmdb_id):
     """
     Complete TV series info fetcher (TMDB + OMDb) with fallback:
@@ -66,13 +135,14 @@ def get_series_info(tmdb_id):
 
     try:
         # 1. GET DETAILS FROM TMDB
-        details_response = session.get(
+        details_response = api_get(
             f"{TMDB_BASE}/tv/{tmdb_id}",
             params={
                 "api_key": TMDB_API_KEY,
                 "append_to_response": "videos,credits,recommendations,external_ids"
             },
-            timeout=10
+            timeout=10,
+            session=session
         )
 
         if details_response.status_code != 200:
@@ -96,7 +166,7 @@ def get_series_info(tmdb_id):
         created_by = details.get("created_by") or []
         if created_by:
             c = created_by[0]
-            creator = f"{c['name']}, https://image.tmdb.org/t/p/w500{c['profile_path']}" if c.get("profile_path") else c.get("name")
+            creator = f"{c['name']}, {tmdb_image(c['profile_path'])}" if c.get("profile_path") else c.get("name")
 
         # 4. CAST
         cast = []
@@ -104,7 +174,7 @@ def get_series_info(tmdb_id):
             cast.append({
                 "name": actor.get("name"),
                 "character": actor.get("character", ""),
-                "profile": f"https://image.tmdb.org/t/p/w500{actor['profile_path']}" if actor.get("profile_path") else None
+                "profile": tmdb_image(actor.get("profile_path"))
             })
 
         # 5. IMDb & OMDb fallback
@@ -112,13 +182,22 @@ def get_series_info(tmdb_id):
         imdb_rating = imdb_votes = metascore = rotten_tomatoes = None
         omdb_data = {}
 
-        if imdb_id:
-            omdb = session.get(
-                OMDB_BASE,
-                params={"apikey": OMDB_API_KEY, "i": imdb_id, "plot": "full"},
-                timeout=10
-            )
-            if omdb.status_code == 200:
+        if imdb_id and not has_quota("omdb"):
+            print("⚠️ OMDb daily quota reached, skipping IMDb data")
+        elif imdb_id and not is_available("omdb"):
+            print("⚠️ OMDb unavailable (circuit open), skipping IMDb data")
+        elif imdb_id:
+            try:
+                omdb = api_get(
+                    OMDB_BASE,
+                    params={"apikey": OMDB_API_KEY, "i": imdb_id, "plot": "full"},
+                    timeout=10,
+                    session=session
+                )
+            except requests.RequestException as e:  # OMDb down or circuit open: keep the TMDB data
+                print(f"⚠️ OMDb unavailable, skipping IMDb data: {e}")
+                omdb = None
+            if omdb is not None and omdb.status_code == 200:
                 o = omdb.json()
                 if o.get("Response") == "True":
                     omdb_data = o
@@ -135,7 +214,7 @@ def get_series_info(tmdb_id):
         for rec in details.get("recommendations", {}).get("results", [])[:12]:
             recommendations.append({
                 "title": rec.get("name"),
-                "poster": f"https://image.tmdb.org/t/p/w500{rec['poster_path']}" if rec.get("poster_path") else None,
+                "poster": tmdb_image(rec.get("poster_path")),
                 "year": rec.get("first_air_date", "")[:4] if rec.get("first_air_date") else "TBA",
                 "id": rec.get("id"),
                 "rating": rec.get("vote_average")
@@ -167,7 +246,7 @@ def get_series_info(tmdb_id):
         # 11. IMAGE
         image = details.get("poster_path")
         if image:
-            image = f"https://image.tmdb.org/t/p/w500{image}"
+            image = tmdb_image(image)
         elif omdb_data.get("Poster") and omdb_data.get("Poster") != "N/A":
             image = omdb_data["Poster"]
         else:
@@ -199,6 +278,12 @@ def get_series_info(tmdb_id):
                 if episode_count and isinstance(episode_count, int):
                     total_episodes += episode_count
 
+        # episode titles / air dates / runtimes for every season, fetched concurrently
+        episodes = fetch_season_episodes(tmdb_id, [s["season_number"] for s in seasons_list])
+        for season in seasons_list:
+            if season["season_number"] in episodes:
+                season["episodes"] = episodes[season["season_number"]]
+
         # 13. BUILD RESULT
         result = {
             "source": "Series",
@@ -230,136 +315,3 @@ def get_series_info(tmdb_id):
     except Exception as e:
         print(f"❌ Error: {e}")
         return "no"
-
-
-
-
-
-
-
-
-MAL_SEARCH_URL = "https://api.myanimelist.net/v2/anime"
-
-def search_anime_series(query, max_results=20):
-    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
-    params = {
-        "q": query,
-        "limit": max_results,
-        "fields": "id,title,main_picture,media_type,start_date,synopsis"
-    }
-    
-    response = requests.get(MAL_SEARCH_URL, headers=headers, params=params)
-    if response.status_code != 200:
-        print("Error:", response.status_code, response.text)
-        return []
-    
-    data = response.json()
-    results = []
-    
-
-    for anime in data.get("data", []):
-        node = anime.get("node", {})
-        media_type = node.get("media_type")
-
-        if media_type != "tv":  # filter TV series only
-            continue
-        
-        main_picture = node.get("main_picture", {})
-        poster_url = main_picture.get("medium")
-        
-        results.append({
-            "title": node.get("title"),
-            "id": node.get("id"),
-            "poster_url": poster_url,
-            "synopsis": node.get("synopsis"),
-            "start_date": node.get("start_date"),
-            "type": media_type,
-        })
-    
-    return results
-
-
-
-
-MAL_BASE_URL = "https://api.myanimelist.net/v2/anime"
-
-def get_series_anime_info(anime_id):
-    """
-    Complete anime info fetcher using MyAnimeList anime ID.
-    """
-    headers = {"X-MAL-CLIENT-ID": MY_ANIME_LIST}
-    params = {
-        "fields": "id,title,main_picture,media_type,num_episodes,start_date,genres,studios,synopsis,alternative_titles,end_date,mean,average_episode_duration"
-    }
-
-    try:
-        response = requests.get(f"{MAL_BASE_URL}/{anime_id}", headers=headers, params=params, timeout=10)
-        if response.status_code != 200:
-            print(f"❌ MAL API returned status {response.status_code}")
-            return "no"
-
-        data = response.json()
-
-        # Basic info
-        anime_title = data.get("title")
-        runtime = runtime = data.get("average_episode_duration")
-        if runtime is not None:
-            runtime = runtime // 60  # integer minutes
-        start_date = data.get("start_date")
-        end_date = data.get("end_date")
-        year = start_date[:4] if start_date else "Unknown"
-        synopsis = data.get("synopsis")
-        episodes = data.get("num_episodes")
-        media_type = data.get("media_type")
-        rating = data.get("mean")  # average user score
-
-        # Images
-        main_picture = data.get("main_picture", {})
-        poster_url = main_picture.get("medium")
-        large_poster_url = main_picture.get("large")
-        background = data.get("background")
-        extra_pictures = [pic.get("large") for pic in data.get("pictures", [])]
-
-        # Genres and studios
-        genres = [g["name"] for g in data.get("genres", [])]
-        studios = [s["name"] for s in data.get("studios", [])]
-
-        # Alternative titles
-        alt_titles = data.get("alternative_titles", {})
-
-        # Build result dict
-        result = {
-            "source": "Anime",
-            "name": anime_title,
-            "year": year,
-            "runtime": runtime,
-            # "start_date": start_date,
-            # "end_date": end_date,
-            "total_episodes": episodes,
-            "total_seasons" : 1,
-            # "type": media_type,
-            "mal_rating": rating,
-            "mal_id": anime_id,
-            "image": poster_url,
-            # "poster_large": large_poster_url,
-            # "background": background,
-            # "extra_pictures": extra_pictures,
-            "plot": synopsis,
-            "genres": genres,
-            # "studios": studios,
-            # "alternative_titles": alt_titles
-        }
-
-        print(f"✅ Successfully fetched anime: {anime_title} (ID: {anime_id})")
-        return result
-
-    except requests.exceptions.Timeout:
-        print("❌ Request timed out")
-        return "no"
-    except requests.exceptions.ConnectionError:
-        print("❌ Connection error - check internet")
-        return "no"
-    except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        return "no"
-
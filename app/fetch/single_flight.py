@@ -0,0 +1,77 @@
+# app/fetch/single_flight.py
+"""
+In-flight request coalescing ("single flight").
+
+If two callers ask for the same lookup while the first one is still running,
+the second one waits on the first call's Future instead of hitting the network again.
+"""
+
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable
+
+
+def normalize_arg(value: Any) -> Hashable:
+    """Make equivalent arguments produce the same key ("  Naruto " == "naruto", "20" == 20)."""
+    if isinstance(value, str):
+        value = " ".join(value.split()).casefold()
+        return int(value) if value.isdigit() else value
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_arg(v) for v in value)
+    return value
+
+
+def make_key(namespace: str, args: tuple, kwargs: dict) -> Hashable:
+    return (
+        namespace,
+        tuple(normalize_arg(a) for a in args),
+        tuple(sorted((k, normalize_arg(v)) for k, v in kwargs.items())),
+    )
+
+
+class SingleFlight:
+    """Shares one running call (and its result or exception) between concurrent callers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+flights = SingleFlight()
+
+
+def coalesce(namespace: str):
+    """Decorator: concurrent calls with the same normalized arguments share one request."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return flights.do(make_key(namespace, args, kwargs), fn, *args, **kwargs)
+        return wrapper
+    return decorator
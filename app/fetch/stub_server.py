@@ -0,0 +1,454 @@
+# app/fetch/stub_server.py
+"""
+Local stand-in for TMDB, OMDb, MyAnimeList, RAWG, Kitsu and the watch-page sites.
+
+Serves recorded fixtures when present (benchmarks/fixtures/api/<provider>/...json)
+and deterministic synthetic responses otherwise, with configurable latency,
+error rate and 429 injection. Point the fetchers at it with:
+
+    python -m app.fetch.stub_server --port 8765 --latency 80 --rate-429 0.05
+    LIBRARY_API_STUB=http://127.0.0.1:8765 python main.py
+
+or in-process: start_stub_server(...) + http_client.set_stub_url(server.url).
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from app.fetch.rate_limiter import PROVIDER_HOSTS
+
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "benchmarks" / "fixtures" / "api"
+
+# provider name -> real base URL (used by --record)
+UPSTREAM = {provider: f"https://{host}" for host, provider in PROVIDER_HOSTS.items()}
+
+# query params that identify a response; keys and pagination noise are left out of fixture names
+IGNORED_PARAMS = {"api_key", "apikey", "key"}
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0      # added to every response
+    jitter_ms: float = 0.0       # +/- uniform noise on top of latency
+    error_rate: float = 0.0      # fraction of requests answered with HTTP 500
+    rate_429: float = 0.0        # fraction of requests answered with HTTP 429
+    retry_after: int = 1         # Retry-After seconds sent with 429s
+    seed: Optional[int] = None   # fixes the fault/latency sequence for reproducible runs
+    record: bool = False         # fetch missing fixtures from the real API and save them
+
+
+# ==========================================================
+# 🎲 SYNTHETIC RESPONSES
+# ==========================================================
+def _rng(*parts) -> random.Random:
+    """Deterministic generator per resource, so the same id always gets the same data."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return random.Random(int(digest[:12], 16))
+
+
+def _date(rng: random.Random) -> str:
+    return f"{rng.randint(1970, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _people(rng, count, prefix):
+    return [{"id": rng.randint(1, 10**6), "name": f"{prefix} {i + 1}", "character": f"Character {i + 1}",
+             "profile_path": f"/profile{rng.randint(1, 10**6)}.jpg", "order": i} for i in range(count)]
+
+
+def tmdb_search(kind: str, query: str, page: int = 1):
+    results = []
+    for i in range(20):
+        rng = _rng("tmdb", kind, query, i)
+        item_id = rng.randint(1, 10**6)
+        title = query.title() if i == 0 else f"{query.title()} {i + 1}"
+        entry = {"id": item_id, "poster_path": f"/poster{item_id}.jpg", "overview": f"Synthetic {kind} about {query}.",
+                 "popularity": round(rng.uniform(1, 500), 3)}
+        if kind == "movie":
+            entry.update(title=title, release_date=_date(rng))
+        else:
+            entry.update(name=title, first_air_date=_date(rng))
+        results.append(entry)
+    return {"page": page, "results": results, "total_pages": 1, "total_results": len(results)}
+
+
+def tmdb_details(kind: str, item_id: int, append: str = ""):
+    rng = _rng("tmdb", kind, item_id)
+    data = {
+        "id": item_id,
+        "overview": f"Synthetic {kind} {item_id}.",
+        "poster_path": f"/poster{item_id}.jpg",
+        "vote_average": round(rng.uniform(4, 9), 3),
+        "vote_count": rng.randint(10, 30000),
+        "genres": [{"id": 1, "name": "Drama"}, {"id": 2, "name": "Thriller"}][: rng.randint(1, 2)],
+        "videos": {"results": [{"type": "Trailer", "site": "YouTube", "key": f"yt{item_id}"}]},
+        "credits": {"cast": _people(rng, 12, "Actor"),
+                    "crew": [{"job": "Director", "name": "Director Name", "profile_path": "/director.jpg"},
+                             {"job": "Screenplay", "name": "Writer Name"}]},
+        "recommendations": {"results": []},
+    }
+    if kind == "movie":
+        data.update(title=f"Movie {item_id}", release_date=_date(rng), runtime=rng.randint(80, 180),
+                    imdb_id=f"tt{item_id:07d}")
+    else:
+        season_count = rng.randint(1, 8)
+        data.update(
+            name=f"Series {item_id}", first_air_date=_date(rng), episode_run_time=[rng.randint(20, 60)],
+            created_by=[{"name": "Creator Name", "profile_path": "/creator.jpg"}],
+            external_ids={"imdb_id": f"tt{item_id:07d}"},
+            seasons=[{"season_number": n, "name": f"Season {n}", "id": item_id * 100 + n,
+                      "episode_count": _rng("tmdb", item_id, n).randint(6, 24), "air_date": _date(rng)}
+                     for n in range(1, season_count + 1)],
+        )
+        for part in filter(None, append.split(",")):
+            if part.startswith("season/") and part[7:].isdigit() and 0 < int(part[7:]) <= season_count:
+                n = int(part[7:])
+                data[part] = {"season_number": n, "episodes": [
+                    {"episode_number": e, "name": f"Episode {e}", "air_date": _date(_rng("tmdb", item_id, n, e)),
+                     "runtime": _rng("tmdb", item_id, n, e).randint(20, 60)}
+                    for e in range(1, _rng("tmdb", item_id, n).randint(6, 24) + 1)]}
+    return data
+
+
+def omdb(params):
+    if "s" in params:  # title search
+        results = []
+        for i in range(10):
+            rng = _rng("omdb", params["s"], i)
+            results.append({"Title": f"{params['s'].title()} {i}", "Year": str(rng.randint(1970, 2024)),
+                            "imdbID": f"tt{rng.randint(1, 10**7):07d}", "Type": params.get("type", "movie"), "Poster": "N/A"})
+        return {"Search": results, "totalResults": "10", "Response": "True"}
+    imdb_id = params.get("i", "tt0000000")
+    rng = _rng("omdb", imdb_id)
+    return {
+        "Response": "True", "imdbID": imdb_id, "Title": f"Title {imdb_id}", "Year": str(rng.randint(1970, 2024)),
+        "imdbRating": f"{rng.uniform(4, 9):.1f}", "imdbVotes": f"{rng.randint(100, 900000):,}",
+        "Metascore": str(rng.randint(30, 95)), "BoxOffice": f"${rng.randint(1, 500)},000,000",
+        "Awards": "N/A", "Runtime": f"{rng.randint(20, 180)} min", "Genre": "Drama, Thriller",
+        "Plot": "Synthetic plot.", "Poster": "N/A",
+        "Ratings": [{"Source": "Rotten Tomatoes", "Value": f"{rng.randint(10, 100)}%"}],
+    }
+
+
+def mal_search(query: str, limit: int = 20):
+    types = ["tv", "movie", "ova", "special", "ona"]
+    data = []
+    for i in range(limit):
+        rng = _rng("mal", query, i)
+        anime_id = rng.randint(1, 60000)
+        data.append({"node": {
+            "id": anime_id, "title": query.title() if i == 0 else f"{query.title()} {i + 1}",
+            "main_picture": {"medium": f"https://cdn.myanimelist.net/images/anime/{anime_id}.jpg"},
+            "media_type": types[i % len(types)], "start_date": _date(rng), "synopsis": "Synthetic synopsis.",
+            "num_list_users": rng.randint(100, 3_000_000),
+        }})
+    return {"data": data, "paging": {}}
+
+
+def mal_details(anime_id: int):
+    rng = _rng("mal", anime_id)
+    return {
+        "id": anime_id, "title": f"Anime {anime_id}", "start_date": _date(rng), "end_date": _date(rng),
+        "main_picture": {"medium": f"https://cdn.myanimelist.net/images/anime/{anime_id}.jpg",
+                         "large": f"https://cdn.myanimelist.net/images/anime/{anime_id}l.jpg"},
+        "synopsis": "Synthetic synopsis.", "num_episodes": rng.randint(1, 500), "media_type": "tv",
+        "mean": round(rng.uniform(5, 9.5), 2), "average_episode_duration": rng.randint(600, 1800),
+        "genres": [{"id": 1, "name": "Action"}], "studios": [{"id": 1, "name": "Studio"}],
+        "alternative_titles": {},
+    }
+
+
+def rawg(path_parts, params):
+    # /api/games, /api/games/<slug>, /api/games/<slug>/<sub>
+    if len(path_parts) == 2:
+        query = params.get("search", "")
+        results = []
+        for i in range(10):
+            rng = _rng("rawg", query, i)
+            game_id = rng.randint(1, 10**6)
+            results.append({"id": game_id, "slug": f"{query.lower().replace(' ', '-')}-{i}", "name": f"{query.title()} {i}",
+                            "released": _date(rng), "background_image": f"https://media.rawg.io/{game_id}.jpg",
+                            "rating": round(rng.uniform(1, 5), 2)})
+        return {"count": len(results), "results": results}
+    slug = path_parts[2]
+    rng = _rng("rawg", slug)
+    if len(path_parts) == 4:
+        sub = path_parts[3]
+        return {"count": 3, "results": [{"id": i, "name": f"{sub} {i}", "image": f"https://media.rawg.io/{slug}/{sub}{i}.jpg",
+                                         "data": {"max": f"https://media.rawg.io/{slug}/{i}.mp4"}} for i in range(3)]}
+    return {
+        "id": rng.randint(1, 10**6), "slug": slug, "name": slug.replace("-", " ").title(), "released": _date(rng),
+        "playtime": rng.randint(1, 100), "rating": round(rng.uniform(1, 5), 2), "metacritic": rng.randint(40, 99),
+        "esrb_rating": {"name": "Teen"}, "genres": [{"name": "Action"}], "tags": [{"name": "Singleplayer"}],
+        "platforms": [{"platform": {"name": "PC"}}], "developers": [{"name": "Dev"}], "publishers": [{"name": "Pub"}],
+        "description_raw": "Synthetic game.", "background_image": f"https://media.rawg.io/{slug}.jpg",
+    }
+
+
+def kitsu(path_parts, params):
+    # /api/edge/manga, /api/edge/manga/<id>, /api/edge/manga/<id>/genres
+    if len(path_parts) >= 5 and path_parts[4] == "genres":
+        return {"data": [{"id": "1", "type": "genres", "attributes": {"name": "Action"}}]}
+    if len(path_parts) == 4:  # single manga
+        page = kitsu(path_parts[:3], dict(params, **{"filter[text]": path_parts[3], "page[limit]": 1}))
+        page["data"] = dict(page["data"][0], id=path_parts[3])
+        page.pop("links")
+        return page
+    query = params.get("filter[text]", "")
+    limit = int(params.get("page[limit]", 10))
+    offset = int(params.get("page[offset]", 0))
+    data, included = [], []
+    for i in range(offset, offset + limit):
+        rng = _rng("kitsu", query, i)
+        manga_id = str(rng.randint(1, 10**5))
+        data.append({"id": manga_id, "type": "manga", "attributes": {
+            "canonicalTitle": f"{query.title()} {i}", "titles": {"en_jp": f"{query.title()} {i}"},
+            "startDate": _date(rng), "synopsis": "Synthetic manga.", "chapterCount": rng.randint(1, 700),
+            "volumeCount": rng.randint(1, 70), "status": "finished", "averageRating": f"{rng.uniform(50, 90):.2f}",
+            "posterImage": {"small": f"https://media.kitsu.io/manga/{manga_id}/small.jpg"}},
+            "relationships": {"genres": {"data": [{"type": "genres", "id": "1"}]},
+                              "categories": {"data": [{"type": "categories", "id": "2"}]}}})
+    if "include" in params:
+        included = [{"id": "1", "type": "genres", "attributes": {"name": "Action"}},
+                    {"id": "2", "type": "categories", "attributes": {"title": "Adventure"}}]
+    return {"data": data, "included": included, "meta": {"count": 500},
+            "links": {"next": f"?page[offset]={offset + limit}"}}
+
+
+def openlibrary_search(query: str, limit: int):
+    docs = []
+    for i in range(limit):
+        rng = _rng("openlibrary", query, i)
+        isbn = "978" + "".join(str(rng.randint(0, 9)) for _ in range(10))
+        docs.append({"key": f"/works/OL{rng.randint(1, 10**7)}W", "title": f"{query.title()} {i}",
+                     "author_name": [f"Author {rng.randint(1, 500)}"], "first_publish_year": rng.randint(1900, 2024),
+                     "isbn": [isbn], "cover_i": rng.randint(1, 10**7), "number_of_pages_median": rng.randint(80, 900),
+                     "subject": ["Fiction"]})
+    return {"numFound": 1000, "start": 0, "docs": docs}
+
+
+def openlibrary_books(bibkeys: str):
+    books = {}
+    for bibkey in filter(None, bibkeys.split(",")):
+        rng = _rng("openlibrary", bibkey)
+        books[bibkey] = {"key": f"/books/OL{rng.randint(1, 10**7)}M", "title": f"Book {bibkey.split(':')[-1]}",
+                         "authors": [{"name": f"Author {rng.randint(1, 500)}"}], "publish_date": str(rng.randint(1900, 2024)),
+                         "number_of_pages": rng.randint(80, 900), "subjects": [{"name": "Fiction"}],
+                         "cover": {"medium": f"https://covers.openlibrary.org/b/id/{rng.randint(1, 10**7)}-M.jpg"},
+                         "identifiers": {"isbn_13": [bibkey.split(":")[-1]]}}
+    return books
+
+
+def arabseed_html(query: str):
+    cards = "".join(f'<li><a class="movie__block" title="{query} {i}" href="/movie/{i}/">{query} {i}</a></li>'
+                    for i in range(20))
+    return f'<html><body><div class="series__list"><ul>{cards}</ul></div></body></html>'
+
+
+def arabseed_movie_html():
+    return '<html><body><a class="watch__btn" href="/watch/1/">Watch</a></body></html>'
+
+
+def akwam_html(query: str):
+    cards = "".join(f'<div class="col-lg-auto col-md-4 col-6 mb-12"><h3 class="entry-title">'
+                    f'<a href="/movie/{i}/">{query} {i}</a></h3></div>' for i in range(20))
+    return f"<html><body>{cards}</body></html>"
+
+
+def synthetic_response(provider: str, path: str, params: dict) -> Tuple[int, str, str]:
+    """Return (status, content_type, body) for a request the stub knows how to fake."""
+    parts = [p for p in path.split("/") if p]
+    as_json = lambda data: (200, "application/json", json.dumps(data))
+
+    if provider == "tmdb":
+        # /3/search/movie, /3/search/tv, /3/movie/<id>, /3/tv/<id>
+        if len(parts) == 3 and parts[1] == "search":
+            return as_json(tmdb_search(parts[2], params.get("query", ""), int(params.get("page", 1))))
+        if len(parts) == 3 and parts[1] in ("movie", "tv") and parts[2].isdigit():
+            return as_json(tmdb_details(parts[1], int(parts[2]), params.get("append_to_response", "")))
+    elif provider == "omdb":
+        return as_json(omdb(params))
+    elif provider == "mal":
+        if len(parts) == 2:
+            return as_json(mal_search(params.get("q", ""), int(params.get("limit", 20))))
+        if len(parts) == 3 and parts[2].isdigit():
+            return as_json(mal_details(int(parts[2])))
+    elif provider == "rawg" and parts[:2] == ["api", "games"]:
+        return as_json(rawg(parts, params))
+    elif provider == "kitsu" and parts[:3] == ["api", "edge", "manga"]:
+        return as_json(kitsu(parts, params))
+    elif provider == "openlibrary":
+        if parts == ["search.json"]:
+            return as_json(openlibrary_search(params.get("q") or params.get("title", ""), int(params.get("limit", 10))))
+        if parts == ["api", "books"]:
+            return as_json(openlibrary_books(params.get("bibkeys", "")))
+    elif provider == "arabseed":
+        if parts[:1] == ["find"]:
+            return 200, "text/html", arabseed_html(params.get("word", ""))
+        return 200, "text/html", arabseed_movie_html()
+    elif provider == "akwam" and parts[:1] == ["search"]:
+        return 200, "text/html", akwam_html(params.get("q", ""))
+
+    return 404, "application/json", json.dumps({"error": f"stub has no route for /{provider}{path}"})
+
+
+# ==========================================================
+# 💾 FIXTURES (recorded responses)
+# ==========================================================
+def fixture_path(provider: str, path: str, params: dict) -> Path:
+    kept = sorted((k, v) for k, v in params.items() if k not in IGNORED_PARAMS)
+    name = re.sub(r"[^\w.-]+", "_", path.strip("/")) or "root"
+    if kept:
+        name += "__" + hashlib.sha1(urlencode(kept).encode()).hexdigest()[:10]
+    return FIXTURES_DIR / provider / f"{name}.json"
+
+
+def load_fixture(path: Path) -> Optional[Tuple[int, str, str]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return saved["status"], saved["content_type"], saved["body"]
+
+
+def record_fixture(provider: str, path: str, raw_query: str, target: Path) -> Optional[Tuple[int, str, str]]:
+    """Fetch the real upstream response once and store it as a fixture."""
+    import requests
+
+    base = UPSTREAM.get(provider)
+    if not base:
+        return None
+    url = f"{base}{path}" + (f"?{raw_query}" if raw_query else "")
+    response = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
+    saved = {"status": response.status_code,
+             "content_type": response.headers.get("Content-Type", "application/json").split(";")[0],
+             "body": response.text}
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(saved, f, ensure_ascii=False)
+    return saved["status"], saved["content_type"], saved["body"]
+
+
+# ==========================================================
+# 🌐 HTTP SERVER
+# ==========================================================
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "LibraryStub/1.0"
+
+    def log_message(self, fmt, *args):
+        logger.debug("stub: " + fmt, *args)
+
+    def do_GET(self):
+        stub: "StubServer" = self.server
+        parsed = urlparse(self.path)
+        provider, _, rest = parsed.path.lstrip("/").partition("/")
+        path = "/" + rest
+        params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+
+        status, content_type, body, headers = stub.respond(provider, path, params, parsed.query)
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[StubConfig] = None):
+        super().__init__((host, port), StubHandler)
+        self.config = config or StubConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "fixtures": 0, "synthetic": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _roll(self) -> Tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.uniform(-1, 1)
+
+    def respond(self, provider: str, path: str, params: dict, raw_query: str):
+        cfg = self.config
+        fault, noise = self._roll()
+        delay = max(0.0, cfg.latency_ms + noise * cfg.jitter_ms) / 1000
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.stats["requests"] += 1
+            if fault < cfg.rate_429:
+                self.stats["throttled"] += 1
+                return 429, "application/json", '{"status_code": 429}', {"Retry-After": str(cfg.retry_after)}
+            if fault < cfg.rate_429 + cfg.error_rate:
+                self.stats["errors"] += 1
+                return 500, "application/json", '{"error": "injected failure"}', {}
+
+        target = fixture_path(provider, path, params)
+        result = load_fixture(target)
+        if result is None and cfg.record:
+            result = record_fixture(provider, path, raw_query, target)
+        source = "fixtures" if result else "synthetic"
+        if result is None:
+            result = synthetic_response(provider, path, params)
+        with self._lock:
+            self.stats[source] += 1
+        return (*result, {})
+
+
+def start_stub_server(port: int = 0, **config) -> StubServer:
+    """Start a stub server on a background thread; call .shutdown() when done."""
+    server = StubServer(port=port, config=StubConfig(**config))
+    threading.Thread(target=server.serve_forever, name="api-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the APIs used in app/fetch")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="added latency in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latency noise in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of HTTP 500 responses")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of HTTP 429 responses")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", action="store_true", help="save missing responses from the real APIs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = StubConfig(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+                        rate_429=args.rate_429, retry_after=args.retry_after, seed=args.seed, record=args.record)
+    server = StubServer(args.host, args.port, config)
+    print(f"🧪 API stub listening on {server.url}  (LIBRARY_API_STUB={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
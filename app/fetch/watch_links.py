@@ -0,0 +1,135 @@
+# app/fetch/watch_links.py
+"""
+Watch-link resolver.
+
+- Resolves every configured source (Akwam, ArabSeed, Cineby) in parallel
+- Caches resolved links per (source, title, year) with a TTL in data/watch_links.json
+- prefetch() starts resolution in the background so watch buttons answer instantly
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from app.db.sqlite_manger import DATA_DIR
+from app.fetch.single_flight import flights, normalize_arg
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = DATA_DIR / "watch_links.json"
+LINK_TTL = 3 * 24 * 60 * 60   # resolved links
+MISS_TTL = 30 * 60            # "no match" results, retried sooner
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="watch-links")
+
+
+# ==========================================================
+# 🔗 SOURCES
+# ==========================================================
+def _akwam(title, year, tmdb_id) -> Optional[str]:
+    from app.fetch.watch_scrapers import AkwamScraper
+    return AkwamScraper(title, year or 0).watch_url
+
+
+def _arabseed(title, year, tmdb_id) -> Optional[str]:
+    from app.fetch.watch_scrapers import ArabSeedScraper
+    return ArabSeedScraper(f"{title} {year or ''}".strip()).watch_url
+
+
+def _cineby(title, year, tmdb_id) -> Optional[str]:
+    return f"https://www.vidking.net/embed/movie/{tmdb_id}" if tmdb_id else None
+
+
+# source key -> resolver(title, year, tmdb_id); order = button order in ShowMediaWindow
+SOURCES: Dict[str, Callable] = {
+    "akwam": _akwam,
+    "arabseed": _arabseed,
+    "cineby": _cineby,
+}
+
+
+# ==========================================================
+# 💾 TTL CACHE (persisted)
+# ==========================================================
+class WatchLinkCache:
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    @staticmethod
+    def key(source, title, year) -> str:
+        return f"{source}|{normalize_arg(title)}|{year or ''}"
+
+    def get(self, key: str):
+        """Return (found, url). url may be None for a cached miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if not entry or entry["expires"] < time.time():
+                return False, None
+            return True, entry["url"]
+
+    def set(self, key: str, url: Optional[str]):
+        ttl = LINK_TTL if url else MISS_TTL
+        with self._lock:
+            self._data[key] = {"url": url, "expires": time.time() + ttl}
+            now = time.time()
+            self._data = {k: v for k, v in self._data.items() if v["expires"] >= now}
+            snapshot = dict(self._data)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not persist watch-link cache: %s", e)
+
+
+link_cache = WatchLinkCache()
+
+
+# ==========================================================
+# 🚀 RESOLUTION
+# ==========================================================
+def cached_link(source: str, title: str, year=None):
+    """(found, url) from the cache only; never touches the network."""
+    return link_cache.get(WatchLinkCache.key(source, title, year))
+
+
+def resolve(source: str, title: str, year=None, tmdb_id=None) -> Optional[str]:
+    """Resolve one source (blocking). Concurrent callers share the same lookup."""
+    key = WatchLinkCache.key(source, title, year)
+    found, url = link_cache.get(key)
+    if found:
+        return url
+
+    def lookup():
+        try:
+            url = SOURCES[source](title, year, tmdb_id)
+        except Exception as e:
+            logger.warning("Watch link lookup on %s failed: %s", source, e)
+            return None  # errors are not cached
+        link_cache.set(key, url)
+        return url
+
+    return flights.do(("watch_link", key), lookup)
+
+
+def resolve_async(source: str, title: str, year=None, tmdb_id=None) -> Future:
+    return _pool.submit(resolve, source, title, year, tmdb_id)
+
+
+def prefetch(title: str, year=None, tmdb_id=None) -> Dict[str, Future]:
+    """Start resolving every source in the background."""
+    return {source: resolve_async(source, title, year, tmdb_id) for source in SOURCES}
+
@@ -0,0 +1,113 @@
+from urllib.parse import quote
+from app.utils.fuzzy import best_match
+from app.fetch.http_client import api_get
+from app.fetch.html_parsing import LinkRule, extract_links
+
+
+MAX_CANDIDATES = 30  # stop parsing a results page once this many cards were found
+
+ARABSEED_RESULTS = LinkRule(cls="movie__block", title_attr="title", start_marker='class="series__list')
+ARABSEED_WATCH_BUTTON = LinkRule(cls="watch__btn")
+AKWAM_RESULTS = LinkRule(parent_tag="h3", parent_cls="entry-title", start_marker="col-lg-auto col-md-4 col-6 mb-12")
+
+
+def get_best_match(movie_name, movies_list, cutoff=0.5):
+    best = best_match(movie_name, movies_list, key=lambda m: m["name"], cutoff=cutoff)
+    return best["link"] if best else None
+
+
+class ArabSeedScraper:
+    """Get movie name and return watch page link in arabseed site"""
+    def __init__(self, name, user_agent="Mozilla/5.0"):
+        self.headers = {"User-Agent": user_agent}
+        self.base_url = "https://a.asd.homes"
+        self.watch_url = self.search_best_movie(name)
+        print(self.watch_url)
+
+    def scrape_movies(self, movie_name):
+        encoded_name = quote(movie_name)
+        url = f"{self.base_url}/find/?word={encoded_name}&type="
+
+        response = api_get(url, headers=self.headers)
+
+        movies_info = []
+        for title, link in extract_links(response.text, ARABSEED_RESULTS, limit=MAX_CANDIDATES):
+            # Ensure full absolute URL
+            full_url = link if link.startswith("http") else self.base_url + link
+            movies_info.append({"name": title, "link": full_url})
+
+        return movies_info
+
+
+    def get_watch_page(self, link):
+        # spacing between the search page and this request comes from the arabseed rate limit
+        response = api_get(link)
+        watch_button = extract_links(response.text, ARABSEED_WATCH_BUTTON, limit=1)
+
+        if not watch_button:
+            print("❌ Watch button not found!")
+            return None
+
+        _, watch_page_link = watch_button[0]
+
+        full_watch_link = (
+            watch_page_link if watch_page_link.startswith("http")
+            else self.base_url + watch_page_link
+        )
+
+        return full_watch_link
+
+    def search_best_movie(self, movie_name, cutoff=0.5):
+        movies_list = self.scrape_movies(movie_name)
+        best_match_link = get_best_match(movie_name, movies_list, cutoff)
+
+        if not best_match_link:
+            print("❌ No match found.")
+            return None
+
+        return self.get_watch_page(best_match_link)
+
+
+class AkwamScraper:
+    def __init__(self, name, year=0, user_agent="Mozilla/5.0"):
+        self.headers = {"User-Agent": user_agent}
+        self.base_url = "https://ak.sv"
+        self.year = int(year)
+        self.watch_url = self.search_best_movie(name)
+        print(self.watch_url)
+        
+
+    def scrape_movies(self, movie_name):
+        encoded_name = quote(movie_name)
+        url = f"{self.base_url}/search?q={encoded_name}&section=movie&year={self.year}&rating=0&formats=0&quality=0"
+
+        response = api_get(url, headers=self.headers)
+        response.raise_for_status()
+
+        # REAL MOVIE CARDS
+        cards = extract_links(response.text, AKWAM_RESULTS, limit=MAX_CANDIDATES)
+
+        if not cards:
+            print("No results found! (Selector wrong or blocked)")
+            return []
+
+        movies_info = []
+
+        for title, link in cards:
+            if link.startswith("/"):
+                link = self.base_url + link
+
+            movies_info.append({"name": title, "link": link})
+
+        return movies_info
+
+
+    def search_best_movie(self, movie_name, cutoff=0.5):
+        movies_list = self.scrape_movies(movie_name)
+        best_match_link = get_best_match(movie_name, movies_list, cutoff)
+
+        if not best_match_link:
+            print("❌ No match found.")
+            return None
+
+        return best_match_link
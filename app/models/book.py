@@ -0,0 +1,26 @@
+# app/models/book.py
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class Book:
+    id: Optional[int] = None             # DB auto-increment ID
+    title: str = ""                      # Book title
+    author: Optional[str] = None         # Author(s), comma separated
+    pages: Optional[int] = None          # Page count
+    year: Optional[int] = None           # Publication year
+    genres: Optional[List[str]] = field(default_factory=list)   # Subjects
+    poster_path: Optional[str] = None    # Online path to cover
+    plot: Optional[str] = None           # Description
+    isbn: Optional[str] = None           # ISBN-13 when known
+    user_rating: Optional[float] = None  # Personal rating
+    last_update: Optional[str] = None    # Timestamp of last update
+    section: str = "reading"             # Default section
+
+
+# Column list for dynamic CRUD operations
+BOOK_COLUMNS = [
+    "title", "author", "pages", "year", "genres", "poster_path",
+    "plot", "isbn", "user_rating", "section", "last_update",
+]
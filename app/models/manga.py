@@ -0,0 +1,30 @@
+# app/models/manga.py
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+@dataclass
+class Manga:
+    id: Optional[int] = None             # DB auto-increment ID
+    title: str = ""                      # Manga title
+    year: Optional[int] = None           # First publication year
+    chapters: Optional[int] = None       # Chapter count
+    volumes: Optional[int] = None        # Volume count
+    status: Optional[str] = None         # ongoing / finished / ...
+    poster_path: Optional[str] = None    # Online path to poster
+    genres: Optional[List[str]] = field(default_factory=list)   # Genres + categories
+    plot: Optional[str] = None           # Synopsis
+    rating: Optional[float] = None       # Kitsu average rating (0-10)
+    user_rating: Optional[float] = None  # Personal rating
+    mal_id: Optional[str] = None         # MyAnimeList ID
+    kitsu_id: Optional[str] = None       # Kitsu ID
+    last_update: Optional[str] = None    # Timestamp of last update
+    section: str = "reading"             # Default section
+
+
+# Column list for dynamic CRUD operations
+MANGA_COLUMNS = [
+    "title", "year", "chapters", "volumes", "status", "poster_path",
+    "genres", "plot", "rating", "user_rating",
+    "mal_id", "kitsu_id", "section", "last_update",
+]
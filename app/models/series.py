@@ -42,3 +42,12 @@ SERIES_COLUMNS = [
     "trailer", "section", "last_update",
     "mal_id", "mal_rating",
 ]
+
+# episodes are stored compactly inside each season of `seasons`:
+# "episodes": [[episode_number, name, air_date, runtime], ...]
+EPISODE_FIELDS = ("episode_number", "name", "air_date", "runtime")
+
+
+def expand_episodes(season: dict) -> List[Dict]:
+    """Episode dicts for a stored season."""
+    return [dict(zip(EPISODE_FIELDS, row)) for row in season.get("episodes") or []]
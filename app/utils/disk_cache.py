@@ -0,0 +1,301 @@
+# app/utils/disk_cache.py
+"""
+Managed on-disk image cache (assets/posters).
+
+- every cached file is recorded in a SQLite index (index.db) with its size
+  and last access time, so lookups are a dict hit instead of a stat() on
+  the GUI thread
+- the index is loaded and reconciled with the directory on a background
+  thread at startup (files added / removed behind our back)
+- once the cache grows past its cap, least recently used files are deleted
+  down to LOW_WATERMARK of the cap
+
+    python -m app.utils.disk_cache stats|compact|clear
+"""
+
+import argparse
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "assets", "posters"))
+INDEX_NAME = "index.db"
+UNMANAGED_DIRS = ("atlas",)  # subdirectories with their own bookkeeping (the thumbnail atlas)
+DEFAULT_CAP_MB = 500
+LOW_WATERMARK = 0.9       # evict down to 90% of the cap, not just under it
+FLUSH_EVERY = 50          # access-time updates batched per index write
+
+try:  # optional override: IMAGE_DISK_CACHE_MB = 1024
+    from config import IMAGE_DISK_CACHE_MB as _CAP_MB
+except ImportError:
+    _CAP_MB = DEFAULT_CAP_MB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class DiskCache:
+    def __init__(self, directory: str = CACHE_DIR, cap_bytes: int = int(_CAP_MB * 2**20)):
+        self.directory = directory
+        self.cap_bytes = cap_bytes
+        self._entries: Dict[str, list] = {}   # name -> [size, last_access]
+        self._dirty = set()
+        self._total = 0
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._started = False
+        self.evictions = 0
+
+    # ------------------------------------------------------
+    # startup
+    # ------------------------------------------------------
+    def start(self):
+        """Load and reconcile the index on a background thread (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        atexit.register(self.flush)
+        threading.Thread(target=self._startup, name="disk-cache-scan", daemon=True).start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        self.start()
+        return self._ready.wait(timeout)
+
+    def _startup(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(self.directory, INDEX_NAME), check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            with self._lock:
+                for name, size, last_access in self._conn.execute("SELECT name, size, last_access FROM entries"):
+                    self._entries[name] = [size, last_access]
+                    self._total += size
+        except sqlite3.Error as e:
+            logger.warning("Image cache index unusable (%s), starting empty", e)
+        finally:
+            self._ready.set()  # lookups can go ahead; reconciling only fixes stragglers
+        self._reconcile()
+        self.evict()
+
+    def _scan_files(self) -> Dict[str, int]:
+        found = {}
+        for root, dirs, files in os.walk(self.directory):
+            if root == self.directory:
+                dirs[:] = [d for d in dirs if d not in UNMANAGED_DIRS]
+            for filename in files:
+                if filename.startswith(INDEX_NAME) or filename.endswith(".part"):
+                    continue
+                full = os.path.join(root, filename)
+                try:
+                    found[os.path.relpath(full, self.directory).replace(os.sep, "/")] = os.path.getsize(full)
+                except OSError:
+                    pass
+        return found
+
+    def _reconcile(self):
+        on_disk = self._scan_files()
+        now = time.time()
+        with self._lock:
+            # re-check: a file may have been added after the directory walk
+            gone = [name for name in self._entries
+                    if name not in on_disk and not os.path.exists(self.path(name))]
+            for name in gone:
+                self._total -= self._entries.pop(name)[0]
+            new = {name: size for name, size in on_disk.items() if name not in self._entries}
+            for name, size in new.items():
+                self._entries[name] = [size, now]
+                self._total += size
+            self._write_index(delete=gone, upsert=new.keys())
+        if gone or new:
+            logger.info("Image cache reconciled: %d new files, %d missing", len(new), len(gone))
+
+    # ------------------------------------------------------
+    # index persistence
+    # ------------------------------------------------------
+    def _write_index(self, delete=(), upsert=()):
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany("DELETE FROM entries WHERE name=?", [(n,) for n in delete])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (name, size, last_access) VALUES (?, ?, ?)",
+                    [(n, *self._entries[n]) for n in upsert if n in self._entries],
+                )
+        except sqlite3.Error as e:
+            logger.warning("Image cache index write failed: %s", e)
+
+    def flush(self):
+        """Persist batched access-time updates."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._write_index(upsert=dirty)
+
+    # ------------------------------------------------------
+    # lookups / writes
+    # ------------------------------------------------------
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, *name.split("/"))
+
+    def get(self, name: str) -> Optional[str]:
+        """Path of a cached file (and mark it used), None if not cached. No filesystem access."""
+        self.wait_ready(timeout=2.0)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            entry[1] = time.time()
+            self._dirty.add(name)
+            if len(self._dirty) >= FLUSH_EVERY:
+                self.flush()
+        return self.path(name)
+
+    def names(self):
+        """Snapshot of every cached file name."""
+        with self._lock:
+            return list(self._entries)
+
+    def contains(self, name: str) -> bool:
+        self.wait_ready(timeout=2.0)
+        with self._lock:
+            return name in self._entries
+
+    def add(self, name: str, size: Optional[int] = None):
+        """Record a file written to path(name); evicts if that pushed the cache over its cap."""
+        if size is None:
+            try:
+                size = os.path.getsize(self.path(name))
+            except OSError:
+                return
+        self.wait_ready(timeout=2.0)
+        with self._lock:
+            old = self._entries.get(name)
+            self._total += size - (old[0] if old else 0)
+            self._entries[name] = [size, time.time()]
+            self._dirty.discard(name)
+            self._write_index(upsert=[name])
+        if self._total > self.cap_bytes:
+            self.evict()
+
+    def write(self, name: str, data: bytes):
+        """Atomically write `data` as `name` and record it."""
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.part"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.add(name, len(data))
+
+    def discard(self, name: str) -> int:
+        """Forget and delete one file, returns the bytes freed."""
+        with self._lock:
+            entry = self._entries.pop(name, None)
+            if entry is None:
+                return 0
+            self._total -= entry[0]
+            self._dirty.discard(name)
+            self._write_index(delete=[name])
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
+        return entry[0]
+
+    # ------------------------------------------------------
+    # eviction / maintenance
+    # ------------------------------------------------------
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """Delete least recently used files until the cache is under target (default: the low watermark)."""
+        if target_bytes is None:
+            if self._total <= self.cap_bytes:
+                return 0
+            target_bytes = int(self.cap_bytes * LOW_WATERMARK)
+        with self._lock:
+            if self._total <= target_bytes:
+                return 0
+            victims = []
+            total = self._total
+            for name, (size, _) in sorted(self._entries.items(), key=lambda kv: kv[1][1]):
+                if total <= target_bytes:
+                    break
+                victims.append(name)
+                total -= size
+        freed = sum(self.discard(name) for name in victims)
+        self.evictions += len(victims)
+        logger.info("Image cache evicted %d files (%.1f MB)", len(victims), freed / 2**20)
+        return freed
+
+    def compact(self) -> int:
+        """Drop orphaned/missing files, evict past the cap and vacuum the index. Returns reclaimed bytes."""
+        self.wait_ready()
+        self._reconcile()
+        freed = self.evict()
+        for root, _dirs, files in os.walk(self.directory):  # leftovers of interrupted writes
+            for filename in files:
+                if filename.endswith(".part"):
+                    full = os.path.join(root, filename)
+                    try:
+                        freed += os.path.getsize(full)
+                        os.remove(full)
+                    except OSError:
+                        pass
+        index_path = os.path.join(self.directory, INDEX_NAME)
+        if self._conn is not None:
+            before = os.path.getsize(index_path)
+            self.flush()
+            with self._lock:
+                self._conn.execute("VACUUM")
+            freed += max(0, before - os.path.getsize(index_path))
+        return freed
+
+    def clear(self) -> int:
+        """Delete every cached file. Returns reclaimed bytes."""
+        self.wait_ready()
+        with self._lock:
+            names = list(self._entries)
+        return sum(self.discard(name) for name in names) + self.compact()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self._ready.is_set(),
+                "files": len(self._entries),
+                "used_mb": round(self._total / 2**20, 1),
+                "cap_mb": round(self.cap_bytes / 2**20, 1),
+                "evictions": self.evictions,
+            }
+
+
+disk_cache = DiskCache()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poster / thumbnail disk cache")
+    parser.add_argument("command", choices=["stats", "compact", "clear"])
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        disk_cache.wait_ready()
+        print(disk_cache.stats())
+        return
+    freed = disk_cache.compact() if args.command == "compact" else disk_cache.clear()
+    print(f"✅ Reclaimed {freed / 2**20:.1f} MB ({disk_cache.stats()['used_mb']} MB left)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+# app/utils/fuzzy.py
+"""
+Fuzzy title matching.
+
+- normalize(): Unicode NFKD, accents/tashkeel stripped, Arabic letter variants folded
+- similarity(): trigram Dice coefficient; Arabic vs Latin titles are compared by transliterated consonant skeletons
+- TitleIndex: trigram inverted index, so a lookup only scores titles that share n-grams with the query
+- numerals() / same_numbering(): sequel and part numbers, which trigrams barely see ("Rocky II" vs "Rocky III")
+
+Used by the watch-link scrapers, federated search and the library duplicate check.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+NGRAM = 3
+
+_ARABIC_RE = re.compile(r"[؀-ۿ]")
+_NON_WORD_RE = re.compile(r"[^\w\s]|_")
+
+# letter variants that are commonly written interchangeably
+_ARABIC_FOLD = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+    "ـ": None,  # tatweel
+    "٠": "0", "١": "1", "٢": "2", "٣": "3", "٤": "4",
+    "٥": "5", "٦": "6", "٧": "7", "٨": "8", "٩": "9",
+})
+
+# simplified romanization (after _ARABIC_FOLD)
+_ARABIC_TO_LATIN = str.maketrans({
+    "ا": "a", "ب": "b", "ت": "t", "ث": "th", "ج": "j", "ح": "h", "خ": "kh",
+    "د": "d", "ذ": "th", "ر": "r", "ز": "z", "س": "s", "ش": "sh", "ص": "s",
+    "ض": "d", "ط": "t", "ظ": "z", "ع": "a", "غ": "gh", "ف": "f", "ق": "q",
+    "ك": "k", "ل": "l", "م": "m", "ن": "n", "ه": "h", "و": "w", "ي": "y",
+    "ء": None, "گ": "g", "پ": "p", "چ": "ch", "ڤ": "v",
+})
+
+_SOFT_C_RE = re.compile(r"c(?=[eiy])")
+_DIGRAPHS = (("ph", "f"), ("th", "t"), ("sh", "s"), ("ch", "s"), ("kh", "k"), ("gh", "g"))
+_SKELETON_FOLD = str.maketrans({
+    "a": None, "e": None, "i": None, "o": None, "u": None, "y": None, "w": None,
+    "p": "b", "v": "f", "c": "k", "q": "k", "x": "ks", "z": "s", "j": "g",
+})
+_DOUBLE_RE = re.compile(r"(\w)\1")
+
+_ROMAN_RE = re.compile(r"^x{0,3}(?:ix|iv|v?i{0,3})$")   # I..XXXIX, enough for sequel numbers
+_ROMAN_VALUES = {"i": 1, "v": 5, "x": 10}
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+_PART_WORDS = {"part", "chapter", "volume", "vol", "episode", "book"}
+
+
+# ==========================================================
+# 🔤 NORMALIZATION
+# ==========================================================
+def normalize(text: Optional[str]) -> str:
+    """Casefolded, accent-free, punctuation-free form of `text` (Arabic script is kept)."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))  # accents + Arabic tashkeel
+    text = text.translate(_ARABIC_FOLD).casefold()
+    text = _NON_WORD_RE.sub(" ", text)
+    return " ".join(text.split())
+
+
+def is_arabic(text: str) -> bool:
+    return bool(_ARABIC_RE.search(text))
+
+
+def transliterate(text: str) -> str:
+    """Latin form of a normalized Arabic title (Latin text is returned unchanged)."""
+    return text.translate(_ARABIC_TO_LATIN)
+
+
+def skeleton(text: str) -> str:
+    """
+    Consonant skeleton used to compare titles across scripts: Arabic titles are
+    written mostly without short vowels, so "Inception" and "انسبشن" only agree
+    once vowels are dropped and sounds Arabic lacks are folded (p->b, v->f, ...).
+    """
+    text = _SOFT_C_RE.sub("s", transliterate(text))
+    for digraph, single in _DIGRAPHS:
+        text = text.replace(digraph, single)
+    text = text.translate(_SKELETON_FOLD)
+    return _DOUBLE_RE.sub(r"\1", " ".join(text.split()))
+
+
+def _roman_value(token: str) -> int:
+    total = 0
+    for ch, next_ch in zip(token, token[1:] + " "):
+        value = _ROMAN_VALUES[ch]
+        total += -value if _ROMAN_VALUES.get(next_ch, 0) > value else value
+    return total
+
+
+def _is_roman(tokens, i) -> bool:
+    """
+    Multi-letter numerals count anywhere. "i", "v" and "x" are also words and
+    initials ("I Am Legend", "X-Men", "V/H/S"), so they only count after a part
+    word ("Part I") or as the last word after a title word ("Rocky V").
+    """
+    token = tokens[i]
+    if not _ROMAN_RE.match(token):
+        return False
+    if len(token) > 1:
+        return True
+    previous = tokens[i - 1] if i else ""
+    return previous in _PART_WORDS or (i == len(tokens) - 1 and len(previous) > 1)
+
+
+def numerals(text: Optional[str]) -> Tuple[int, ...]:
+    """Numbers in a title: digits, Roman numerals and "part two" style words, sorted."""
+    tokens = normalize(text).split()
+    found = []
+    for i, token in enumerate(tokens):
+        if token.isdigit():
+            found.append(int(token))
+        elif _is_roman(tokens, i):
+            found.append(_roman_value(token))
+        elif token in _NUMBER_WORDS and i and tokens[i - 1] in _PART_WORDS:
+            found.append(_NUMBER_WORDS[token])
+    return tuple(sorted(found))
+
+
+def same_numbering(a: Optional[str], b: Optional[str]) -> bool:
+    """False for titles that differ only in sequel / part number ("Rocky II" vs "Rocky III")."""
+    return numerals(a) == numerals(b)
+
+
+def ngrams(text: str, n: int = NGRAM) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _dice(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def similarity(a: Optional[str], b: Optional[str]) -> float:
+    """0..1 trigram similarity of two titles; 1.0 when they normalize to the same string."""
+    a, b = normalize(a), normalize(b)
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if is_arabic(a) != is_arabic(b):
+        return _dice(ngrams(skeleton(a)), ngrams(skeleton(b)))
+    return _dice(ngrams(a), ngrams(b))
+
+
+# ==========================================================
+# 🗂️ TRIGRAM INDEX
+# ==========================================================
+class TitleIndex:
+    """
+    Inverted trigram index over titles.
+
+    index = TitleIndex()
+    index.add(movie.id, movie.title)
+    index.search("the godfather", limit=5)  ->  [(movie_id, score), ...]
+
+    Titles are indexed by their normalized trigrams, and by skeleton trigrams
+    per script so a Latin query also finds Arabic titles (and the reverse).
+    """
+
+    def __init__(self, items: Iterable[Tuple[Hashable, str]] = ()):
+        self._entries: Dict[Hashable, Tuple[str, Set[str], Set[str], bool]] = {}
+        self._exact: Dict[str, Set[Hashable]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._skeleton_postings: Dict[bool, Dict[str, Set[Hashable]]] = {True: {}, False: {}}
+        for key, title in items:
+            self.add(key, title)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def add(self, key: Hashable, title: Optional[str]):
+        if key in self._entries:
+            self.remove(key)
+        norm = normalize(title)
+        if not norm:
+            return
+        arabic = is_arabic(norm)
+        grams, skel_grams = ngrams(norm), ngrams(skeleton(norm))
+        self._entries[key] = (norm, grams, skel_grams, arabic)
+        self._exact.setdefault(norm, set()).add(key)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+        for gram in skel_grams:
+            self._skeleton_postings[arabic].setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if not entry:
+            return
+        norm, grams, skel_grams, arabic = entry
+        self._exact[norm].discard(key)
+        if not self._exact[norm]:
+            del self._exact[norm]
+        for postings, keys in ((self._postings, grams), (self._skeleton_postings[arabic], skel_grams)):
+            for gram in keys:
+                bucket = postings.get(gram)
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del postings[gram]
+
+    @staticmethod
+    def _overlap(query_grams: Set[str], postings: Dict[str, Set[Hashable]]) -> Counter:
+        shared = Counter()
+        for gram in query_grams:
+            for key in postings.get(gram, ()):
+                shared[key] += 1
+        return shared
+
+    def search(self, query: Optional[str], limit: int = 5, cutoff: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Best matches for `query` as (key, score), highest first."""
+        norm = normalize(query)
+        if not norm:
+            return []
+        scores: Dict[Hashable, float] = dict.fromkeys(self._exact.get(norm, ()), 1.0)
+
+        # same script: Dice on normalized trigrams, straight from the shared-gram counts
+        grams = ngrams(norm)
+        for key, count in self._overlap(grams, self._postings).items():
+            if key not in scores:
+                scores[key] = 2 * count / (len(grams) + len(self._entries[key][1]))
+
+        # other script: Dice on skeleton trigrams
+        other_script = not is_arabic(norm)
+        skel_grams = ngrams(skeleton(norm))
+        for key, count in self._overlap(skel_grams, self._skeleton_postings[other_script]).items():
+            score = 2 * count / (len(skel_grams) + len(self._entries[key][2]))
+            if score > scores.get(key, 0.0):
+                scores[key] = score
+
+        ranked = sorted(((k, s) for k, s in scores.items() if s >= cutoff), key=lambda kv: kv[1], reverse=True)
+        return ranked[:limit]
+
+    def best(self, query: Optional[str], cutoff: float = 0.5) -> Optional[Hashable]:
+        hits = self.search(query, limit=1, cutoff=cutoff)
+        return hits[0][0] if hits else None
+
+
+def best_match(query: Optional[str], choices: Iterable, key: Callable = lambda c: c, cutoff: float = 0.5):
+    """Closest of `choices` to `query` (by key(choice)), or None below `cutoff`."""
+    choices = list(choices)
+    index = TitleIndex((i, key(choice)) for i, choice in enumerate(choices))
+    i = index.best(query, cutoff)
+    return None if i is None else choices[i]
@@ -0,0 +1,101 @@
+# app/utils/image_cache.py
+"""
+Byte-budgeted LRU cache for decoded images (QPixmap).
+
+Entries are keyed on (url, size) and charged width * height * depth / 8
+bytes; once the budget is exceeded the least recently used pixmaps are
+dropped. hits / misses / evictions are counted for stats().
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from PySide6.QtGui import QPixmap
+
+
+DEFAULT_BUDGET_MB = 64
+
+try:  # optional override: IMAGE_CACHE_MB = 128
+    from config import IMAGE_CACHE_MB as _BUDGET_MB
+except ImportError:
+    _BUDGET_MB = DEFAULT_BUDGET_MB
+
+
+def pixmap_bytes(pixmap: QPixmap) -> int:
+    """Approximate memory held by a pixmap."""
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapLRU:
+    def __init__(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (nbytes, pixmap)
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[QPixmap]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, pixmap: QPixmap):
+        nbytes = pixmap_bytes(pixmap)
+        if nbytes > self.budget_bytes:  # would evict everything else and still not fit
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[0]
+            self._data[key] = (nbytes, pixmap)
+            self.used_bytes += nbytes
+            self._shrink()
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.used_bytes -= old[0]
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._shrink()
+
+    def _shrink(self):
+        while self.used_bytes > self.budget_bytes and self._data:
+            nbytes, _ = self._data.popitem(last=False)[1]
+            self.used_bytes -= nbytes
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.used_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "used_mb": round(self.used_bytes / 2**20, 1),
+                "budget_mb": round(self.budget_bytes / 2**20, 1),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+pixmap_cache = PixmapLRU(int(_BUDGET_MB * 2**20))
@@ -0,0 +1,168 @@
+# app/utils/image_scheduler.py
+"""
+Prioritized image download queue.
+
+- at most `max_concurrent` downloads run at once; the rest wait in a
+  priority queue (lower number = sooner, 0 = on screen)
+- one job per URL; every label waiting for that URL subscribes to it
+- prioritize(label, p) moves a queued job up or down (e.g. on scroll),
+  cancel(label) unsubscribes; a job nobody waits for any more is dropped
+  from the queue, or aborted if it was already running
+- queue pumping is deferred to the next event loop turn, so a burst of
+  requests (a whole list being built) can be reprioritized before anything
+  starts
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, List, Optional
+
+import shiboken6
+from PySide6.QtCore import QTimer, QUrl
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+MAX_CONCURRENT = 6
+IMAGE_URL_PROPERTY = "image_url"              # the URL a label currently wants to show
+IMAGE_CANCELLED_PROPERTY = "image_cancelled"  # set when cancel() dropped the label's request
+
+
+class ImageJob:
+    __slots__ = ("url", "subscribers", "priority", "reply", "cancelled")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.subscribers: List[list] = []   # [label, x, y, priority]
+        self.priority = 0
+        self.reply: Optional[QNetworkReply] = None
+        self.cancelled = False
+
+    def live_subscribers(self) -> List[list]:
+        """Drop labels that were destroyed or have since been given another image."""
+        self.subscribers = [s for s in self.subscribers
+                            if shiboken6.isValid(s[0]) and s[0].property(IMAGE_URL_PROPERTY) == self.url]
+        return self.subscribers
+
+
+class ImageScheduler:
+    def __init__(self, network_manager: QNetworkAccessManager,
+                 on_finished: Callable[[str, QNetworkReply, List[list]], None],
+                 max_concurrent: int = MAX_CONCURRENT):
+        self.network_manager = network_manager
+        self.on_finished = on_finished
+        self.max_concurrent = max_concurrent
+        self._jobs: Dict[str, ImageJob] = {}
+        self._heap: List[tuple] = []   # (priority, seq, url); stale entries are skipped when popped
+        self._seq = itertools.count()
+        self._running = 0
+        self._pump_pending = False
+        self.started = 0
+        self.cancelled = 0
+
+    # ------------------------------------------------------
+    # requests
+    # ------------------------------------------------------
+    def request(self, url: str, label, x: int, y: int, priority: int = 0):
+        """Queue (or join) the download of `url` for `label`."""
+        job = self._jobs.get(url)
+        if job is None:
+            job = self._jobs[url] = ImageJob(url)
+            job.priority = priority
+            self._push(job)
+        elif job.reply is None and priority < job.priority:
+            job.priority = priority
+            self._push(job)
+        job.subscribers.append([label, x, y, priority])
+        self._schedule_pump()
+
+    def is_pending(self, label) -> bool:
+        return self._subscription(label)[1] is not None
+
+    def prioritize(self, label, priority: int):
+        job, sub = self._subscription(label)
+        if sub is None or sub[3] == priority:
+            return
+        sub[3] = priority
+        if job.reply is None:
+            best = min(s[3] for s in job.live_subscribers())
+            if best != job.priority:
+                job.priority = best
+                self._push(job)
+                self._schedule_pump()
+
+    def cancel(self, label):
+        """Stop waiting for `label`'s image; the download goes too if nobody else wants it."""
+        job, sub = self._subscription(label)
+        if sub is None:
+            return
+        job.subscribers.remove(sub)
+        label.setProperty(IMAGE_CANCELLED_PROPERTY, True)
+        if job.live_subscribers():
+            return
+        self.cancelled += 1
+        if job.reply is None:
+            del self._jobs[job.url]           # its heap entries are skipped as stale
+        else:
+            job.cancelled = True
+            job.reply.abort()
+
+    def _subscription(self, label):
+        if not shiboken6.isValid(label):
+            return None, None
+        job = self._jobs.get(label.property(IMAGE_URL_PROPERTY))
+        if job is None:
+            return None, None
+        return job, next((s for s in job.subscribers if s[0] is label), None)
+
+    # ------------------------------------------------------
+    # queue
+    # ------------------------------------------------------
+    def _push(self, job: ImageJob):
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job.url))
+
+    def _schedule_pump(self):
+        if not self._pump_pending:
+            self._pump_pending = True
+            QTimer.singleShot(0, self._pump)
+
+    def _pump(self):
+        self._pump_pending = False
+        while self._running < self.max_concurrent and self._heap:
+            priority, _, url = heapq.heappop(self._heap)
+            job = self._jobs.get(url)
+            if job is None or job.reply is not None or priority != job.priority:
+                continue
+            if not job.live_subscribers():
+                del self._jobs[url]
+                continue
+            self._start(job)
+
+    def _start(self, job: ImageJob):
+        request = QNetworkRequest(QUrl(job.url))
+        request.setRawHeader(b"User-Agent", b"Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
+        request.setAttribute(
+            QNetworkRequest.Attribute.RedirectPolicyAttribute,
+            QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy,
+        )
+        job.reply = self.network_manager.get(request)
+        job.reply.finished.connect(lambda job=job: self._finished(job))
+        self._running += 1
+        self.started += 1
+
+    def _finished(self, job: ImageJob):
+        self._running -= 1
+        if self._jobs.get(job.url) is job:
+            del self._jobs[job.url]
+        try:
+            if not job.cancelled:
+                self.on_finished(job.url, job.reply, job.live_subscribers())
+        finally:
+            job.reply.deleteLater()
+            self._schedule_pump()
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "queued": sum(1 for job in self._jobs.values() if job.reply is None),
+            "started": self.started,
+            "cancelled": self.cancelled,
+        }
@@ -0,0 +1,39 @@
+# app/utils/image_urls.py
+"""
+Image URL sizing.
+
+TMDB serves every image in a few fixed widths. Fetchers store TMDB images
+in a size-agnostic form (tmdb_image() -> ".../t/p/original/<file>") and
+resolve_image_url() picks the smallest variant that still covers the
+display size times the device pixel ratio when the image is shown.
+Older rows stored with a fixed size (w500, w200) are resolved the same way.
+"""
+
+import math
+import re
+
+
+TMDB_IMAGE_ROOT = "https://image.tmdb.org/t/p/"
+TMDB_WIDTHS = (92, 154, 185, 342, 500)   # anything wider falls back to "original"
+POSTER_ASPECT = 2 / 3                     # posters and profile photos are 2:3 (w:h)
+
+_TMDB_URL = re.compile(r"^https?://image\.tmdb\.org/t/p/(?:w\d+|h\d+|original)(/.+)$")
+
+
+def tmdb_image(file_path):
+    """Size-agnostic URL for a TMDB poster_path / profile_path, None if there is none."""
+    return f"{TMDB_IMAGE_ROOT}original{file_path}" if file_path else None
+
+
+def tmdb_size_for(w: int, h: int, dpr: float = 1.0) -> str:
+    """Smallest TMDB size name whose width covers a w x h box at `dpr`."""
+    needed = math.ceil(max(w, h * POSTER_ASPECT) * dpr)
+    return next((f"w{width}" for width in TMDB_WIDTHS if width >= needed), "original")
+
+
+def resolve_image_url(url: str, w: int, h: int, dpr: float = 1.0) -> str:
+    """Rewrite TMDB URLs to the right size for a w x h display; other URLs are returned as-is."""
+    match = _TMDB_URL.match(url or "")
+    if not match:
+        return url
+    return f"{TMDB_IMAGE_ROOT}{tmdb_size_for(w, h, dpr)}{match.group(1)}"
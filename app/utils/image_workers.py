@@ -0,0 +1,195 @@
+# app/utils/image_workers.py
+"""
+Image decoding off the GUI thread.
+
+ImageDecodeTask runs on QThreadPool: it decodes downloaded bytes (or a
+cached file) into a QImage, writes the original to the disk cache and
+makes the scaled variants. QImage is safe to use from worker threads;
+QPixmap is not, so the GUI thread only does the final QPixmap.fromImage().
+
+Originals are stored as the exact bytes that were downloaded, named
+<sha1>.<ext> after the content type. With IMAGE_TRANSCODE = "webp" (or
+"avif", if Qt has a writer for it) in config.py, new originals are then
+re-encoded in the background and kept only if that makes them smaller;
+`python -m app.utils.image_workers transcode` does the same for the
+files already cached.
+"""
+
+import argparse
+import logging
+import os
+from typing import Dict, Iterable, Optional, Tuple
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QImage, QImageWriter
+
+from app.utils.disk_cache import disk_cache
+from app.utils.thumbnails import thumbnails
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    "image/jpeg": "jpg", "image/jpg": "jpg", "image/png": "png",
+    "image/webp": "webp", "image/gif": "gif", "image/avif": "avif",
+    "image/bmp": "bmp", "image/x-ms-bmp": "bmp",
+}
+UNKNOWN_EXTENSION = "img"   # Qt could decode it, but neither the header nor the bytes say what it is
+ORIGINAL_EXTENSIONS = ("jpg", "png", "webp", "avif", "gif", "bmp", UNKNOWN_EXTENSION)
+TRANSCODE_QUALITY = 80
+
+try:  # optional: IMAGE_TRANSCODE = "webp"
+    from config import IMAGE_TRANSCODE as TRANSCODE_FORMAT
+except ImportError:
+    TRANSCODE_FORMAT = None
+
+
+# ==========================================================
+# 🗂️ ORIGINAL FILES
+# ==========================================================
+def sniff_extension(data: bytes) -> Optional[str]:
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[:4] == b"GIF8":
+        return "gif"
+    if data[4:12] in (b"ftypavif", b"ftypavis"):
+        return "avif"
+    if data[:2] == b"BM":
+        return "bmp"
+    return None
+
+
+def image_extension(content_type: Optional[str], data: bytes) -> str:
+    """File extension from the Content-Type header, else from the bytes themselves."""
+    mime = (content_type or "").split(";")[0].strip().lower()
+    return CONTENT_TYPES.get(mime) or sniff_extension(data) or UNKNOWN_EXTENSION
+
+
+def find_original(base: str) -> Optional[str]:
+    """Disk cache name of the original stored under `base`, whatever its extension."""
+    return next((f"{base}.{ext}" for ext in ORIGINAL_EXTENSIONS if disk_cache.contains(f"{base}.{ext}")), None)
+
+
+def can_transcode_to(fmt: Optional[str]) -> bool:
+    return bool(fmt) and fmt.encode() in {bytes(f) for f in QImageWriter.supportedImageFormats()}
+
+
+def transcode(name: str, image: QImage, fmt: str) -> int:
+    """Re-encode a cached original as `fmt`; kept only if smaller. Returns bytes saved."""
+    old_path = disk_cache.get(name)
+    if old_path is None:
+        return 0
+    encoded = QByteArray()
+    buffer = QBuffer(encoded)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, fmt.upper(), TRANSCODE_QUALITY):
+        return 0
+    try:
+        saved = os.path.getsize(old_path) - encoded.size()
+    except OSError:
+        return 0
+    if saved <= 0:
+        return 0
+    disk_cache.write(f"{name.rsplit('.', 1)[0]}.{fmt}", bytes(encoded))
+    disk_cache.discard(name)
+    return saved
+
+
+class DecodeSignals(QObject):
+    # url, {(w, h): QImage} (empty if decoding failed), original QImage or None
+    finished = Signal(str, object, object)
+
+
+class ImageDecodeTask(QRunnable):
+    def __init__(self, url: str, sizes: Iterable[Tuple[int, int]], data: Optional[bytes] = None,
+                 path: Optional[str] = None, save_as: Optional[str] = None, content_type: Optional[str] = None):
+        """
+        Decode `data` (a download) or `path` (a cached original).
+        `save_as` is the disk cache name, without extension, to store downloaded bytes under.
+        """
+        super().__init__()
+        self.url = url
+        self.sizes = set(sizes)
+        self.data = data
+        self.path = path
+        self.save_as = save_as
+        self.content_type = content_type
+        self.signals = DecodeSignals()  # created on the GUI thread, so slots run there
+
+    def run(self):
+        image = QImage.fromData(self.data) if self.data is not None else QImage(self.path)
+        if image.isNull():
+            self.signals.finished.emit(self.url, {}, None)
+            return
+        name = None
+        if self.save_as and self.data is not None:
+            # the bytes as downloaded: no re-encode, no quality loss, PNGs stay PNGs
+            name = f"{self.save_as}.{image_extension(self.content_type, self.data)}"
+            disk_cache.write(name, self.data)
+        variants: Dict[Tuple[int, int], QImage] = {}
+        for w, h in self.sizes:
+            variants[(w, h)] = thumbnails.render(self.url, w, h, image)
+        self.signals.finished.emit(self.url, variants, image)
+
+        if name and can_transcode_to(TRANSCODE_FORMAT) and not name.endswith(f".{TRANSCODE_FORMAT}"):
+            transcode(name, image, TRANSCODE_FORMAT)
+
+
+class TranscodeTask(QRunnable):
+    """Re-encode one already cached original (see transcode_cache)."""
+
+    def __init__(self, name: str, fmt: str, results: list):
+        super().__init__()
+        self.name = name
+        self.fmt = fmt
+        self.results = results
+
+    def run(self):
+        path = disk_cache.get(self.name)
+        image = QImage(path) if path else QImage()
+        self.results.append(0 if image.isNull() else transcode(self.name, image, self.fmt))
+
+
+_in_flight = set()  # signal objects must outlive their task until the queued signal is delivered
+
+
+def start_decode(task: ImageDecodeTask, on_finished):
+    signals = task.signals
+    _in_flight.add(signals)
+    signals.finished.connect(on_finished)
+    signals.finished.connect(lambda *_: _in_flight.discard(signals))
+    QThreadPool.globalInstance().start(task)
+
+
+def transcode_cache(fmt: Optional[str] = TRANSCODE_FORMAT) -> Tuple[int, int]:
+    """Re-encode every cached original not yet in `fmt`. Blocks; returns (files shrunk, bytes saved)."""
+    if not can_transcode_to(fmt):
+        logger.warning("No image writer for %r, nothing transcoded", fmt)
+        return 0, 0
+    disk_cache.wait_ready()
+    results: list = []
+    pool = QThreadPool.globalInstance()
+    for name in disk_cache.names():
+        base, _, ext = name.rpartition(".")
+        if "/" not in name and ext in ORIGINAL_EXTENSIONS and ext != fmt:
+            pool.start(TranscodeTask(name, fmt, results))
+    pool.waitForDone()
+    return sum(1 for saved in results if saved > 0), sum(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-encode cached poster originals")
+    parser.add_argument("command", choices=["transcode"])
+    parser.add_argument("--format", default=TRANSCODE_FORMAT or "webp", help="webp (default) or avif")
+    args = parser.parse_args()
+
+    files, saved = transcode_cache(args.format.lower())
+    print(f"✅ Transcoded {files} files to {args.format}, saved {saved / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,133 @@
-import os
 from PySide6.QtCore import QUrl, Qt
-from PySide6.QtGui import QPixmap
-from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
 import hashlib
+import shiboken6
+from app.utils.thumbnails import thumbnails
+from app.utils.image_urls import resolve_image_url
+from app.utils.disk_cache import disk_cache
+from app.utils.thumb_atlas import thumb_atlas
+from app.utils.image_workers import ImageDecodeTask, start_decode, find_original
+from app.utils.image_scheduler import ImageScheduler, IMAGE_URL_PROPERTY, IMAGE_CANCELLED_PROPERTY
 
 # ------------------------------------------------------------------
 # 🌐 Global network manager & cache
 # ------------------------------------------------------------------
 network_manager = QNetworkAccessManager()
-memory_cache = {}  # {url_hash: QPixmap}
 
-# Folder for disk caching
-CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "assets", "posters")
-os.makedirs(CACHE_DIR, exist_ok=True)
+decoding = {}  # {url: [[label, x, y, priority], ...]} while a worker decodes it
 
+IMAGE_SIZE_PROPERTY = "image_size"
 
-def _get_cache_path(url: str) -> str:
-    """Return a filesystem path for cached image based on URL hash."""
-    hash_name = hashlib.sha1(url.encode("utf-8")).hexdigest()
-    return os.path.join(CACHE_DIR, f"{hash_name}.jpg")
+# Disk cache and thumbnail atlas indexes are loaded off the GUI thread while the window builds
+disk_cache.start()
+thumb_atlas.start()
 
 
-def link_to_image(path: str, label, x: int, y: int):
-    """Asynchronously load an image from URL with memory+disk caching."""
+def _get_cache_name(url: str) -> str:
+    """Return the disk cache name (without extension) for an image based on URL hash."""
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def link_to_image(path: str, label, x: int, y: int, priority: int = 0):
+    """
+    Asynchronously load an image from URL with memory+disk caching.
+    x, y are the display size in logical pixels; TMDB URLs are resized to fit it.
+    Downloads go through image_scheduler; lower priority numbers start sooner.
+    """
+    # Pick the image size for the label's physical pixels (TMDB variant and thumbnail)
+    dpr = label.devicePixelRatioF()
+    path = resolve_image_url((path or "").strip(), x, y, dpr)
+
+    # Remember what the label shows now, so a late reply for an older image is dropped
+    label.setProperty(IMAGE_URL_PROPERTY, path or "")
+    label.setProperty(IMAGE_SIZE_PROPERTY, (x, y))
+    label.setProperty(IMAGE_CANCELLED_PROPERTY, False)
     if not path:
         label.setText("N/A")
         return
+    x, y = round(x * dpr), round(y * dpr)
 
-    # Generate cache key and file path
-    cache_key = hashlib.sha1(path.encode()).hexdigest()
-    cache_path = _get_cache_path(path)
-
-    # 1️⃣ Check memory cache first
-    if cache_key in memory_cache:
-        _set_label_pixmap(label, memory_cache[cache_key], x, y)
+    # 1️⃣ Pre-scaled variant for this size (memory, then disk)
+    thumb = thumbnails.get(path, x, y)
+    if thumb is not None:
+        _show(label, thumb)
         return
 
-    # 2️⃣ Check disk cache next
-    if os.path.exists(cache_path):
-        pixmap = QPixmap(cache_path)
-        if not pixmap.isNull():
-            memory_cache[cache_key] = pixmap
-            _set_label_pixmap(label, pixmap, x, y)
-            return
-
-    # 3️⃣ Otherwise, download asynchronously
     label.setText("Loading...")
     label.setAlignment(Qt.AlignCenter)
     label.setStyleSheet("color: gray; font-size: 10px; background-color: #222;")
 
-    url = QUrl(path)
-    if not url.isValid():
+    # Already being decoded: wait for that
+    if path in decoding:
+        decoding[path].append([label, x, y, priority])
+        return
+
+    # 2️⃣ Original on disk: scale it once (on a worker) and keep the variant
+    original = find_original(_get_cache_name(path))
+    cache_path = disk_cache.get(original) if original else None
+    if cache_path is not None:
+        decoding[path] = [[label, x, y, priority]]
+        start_decode(ImageDecodeTask(path, [(x, y)], path=cache_path), _on_image_decoded)
+        return
+
+    # 3️⃣ Otherwise, queue a download (joins one already running for this URL)
+    if not QUrl(path).isValid():
         label.setText("❌ Invalid URL")
         return
 
-    request = QNetworkRequest(url)
-    request.setRawHeader(b"User-Agent", b"Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
-    request.setAttribute(
-        QNetworkRequest.Attribute.RedirectPolicyAttribute,
-        QNetworkRequest.RedirectPolicy.NoLessSafeRedirectPolicy,
-    )
-
-    reply = network_manager.get(request)
-
-    def on_image_loaded():
-        if reply.error() != QNetworkReply.NetworkError.NoError:
-            label.setText("⚠️ Error loading")
-            reply.deleteLater()
-            return
-
-        data = reply.readAll()
-        pixmap = QPixmap()
-        if pixmap.loadFromData(data):
-            # ✅ Cache both in memory and on disk
-            memory_cache[cache_key] = pixmap
-            pixmap.save(cache_path, "JPG")
-            _set_label_pixmap(label, pixmap, x, y)
-        else:
-            label.setText("⚠️ Failed to decode image")
-
-        reply.deleteLater()
-
-    reply.finished.connect(on_image_loaded)
-
-
-def _set_label_pixmap(label, pixmap: QPixmap, x: int, y: int):
-    """Helper to scale and set pixmap safely."""
-    scaled = pixmap.scaled(x, y, Qt.AspectRatioMode.KeepAspectRatio,
-                           Qt.TransformationMode.SmoothTransformation)
-    label.setPixmap(scaled)
+    image_scheduler.request(path, label, x, y, priority)
+
+
+def reload_image(label, priority: int = 0):
+    """Re-request the image of a label whose download was cancelled by image_scheduler."""
+    size = label.property(IMAGE_SIZE_PROPERTY)
+    if size and label.property(IMAGE_CANCELLED_PROPERTY):
+        link_to_image(label.property(IMAGE_URL_PROPERTY), label, *size, priority=priority)
+
+
+def _on_image_loaded(path, reply, subscribers):
+    """Called by image_scheduler with the labels still waiting for `path`."""
+    if reply.error() != QNetworkReply.NetworkError.NoError:
+        _notify(subscribers, "⚠️ Error loading")
+        return
+
+    # ✅ Decode, save and scale on a worker; only the scaled variants go to memory
+    decoding[path] = list(subscribers)
+    content_type = reply.header(QNetworkRequest.KnownHeaders.ContentTypeHeader)
+    task = ImageDecodeTask(path, [(x, y) for _, x, y, _ in subscribers], data=bytes(reply.readAll()),
+                           save_as=_get_cache_name(path), content_type=content_type)
+    start_decode(task, _on_image_decoded)
+
+
+def _on_image_decoded(path, variants, original):
+    subscribers = [s for s in decoding.pop(path, [])
+                   if shiboken6.isValid(s[0]) and s[0].property(IMAGE_URL_PROPERTY) == path]
+    if original is None:
+        original = find_original(_get_cache_name(path))
+        if original:  # a cached original that no longer decodes
+            disk_cache.discard(original)
+        _notify(subscribers, "⚠️ Failed to decode image")
+        return
+
+    pixmaps = {size: thumbnails.remember(path, *size, image) for size, image in variants.items()}
+    for label, x, y, _ in subscribers:
+        if (x, y) not in pixmaps:  # joined after the worker started
+            pixmaps[(x, y)] = thumbnails.remember(path, x, y, thumbnails.render(path, x, y, original))
+        _show(label, pixmaps[(x, y)])
+
+
+def _show(label, pixmap):
+    """Set a thumbnail rendered in physical pixels at the label's device pixel ratio."""
+    pixmap.setDevicePixelRatio(label.devicePixelRatioF())
+    label.setPixmap(pixmap)
+
+
+def _notify(subscribers, text):
+    for label, *_ in subscribers:
+        label.setText(text)
+
+
+image_scheduler = ImageScheduler(network_manager, _on_image_loaded)
 
 
 
@@ -0,0 +1,263 @@
+# app/utils/poster_warmup.py
+"""
+Offline poster warm-up.
+
+Walks every poster, cast photo and director / creator photo in the movies
+and series tables and downloads whatever is not cached yet, so the whole
+library can be browsed offline afterwards:
+
+- one download per image (the size the largest display needs); the
+  list / grid / detail thumbnails are rendered from it under the exact keys
+  link_to_image looks up, so no later download is needed
+- `workers` downloads at a time, with the total capped at `max_rate` bytes/s
+- resumable: finished images are in the disk cache and skipped on the next
+  run; images the server does not have (404 / 410) are remembered in
+  data/poster_warmup.json and not retried
+- progress(done, total, bytes) is called after every image
+
+    python -m app.utils.poster_warmup [--rate-kb 500] [--workers 6] [--dpr 2]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from PySide6.QtGui import QImage
+
+from app.db.sqlite_manger import get_conn, DATA_DIR
+from app.fetch.rate_limiter import TokenBucket
+from app.utils.disk_cache import disk_cache
+from app.utils.image_urls import resolve_image_url
+from app.utils.image_workers import find_original, image_extension
+from app.utils.thumbnails import thumbnails
+from app.utils.thumb_atlas import thumb_atlas
+
+
+logger = logging.getLogger(__name__)
+
+STATE_PATH = DATA_DIR / "poster_warmup.json"
+CHUNK_SIZE = 64 * 1024
+DEFAULT_WORKERS = 6
+DEFAULT_RATE = 1024 * 1024     # bytes per second
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+GONE_STATUSES = (404, 410)
+
+# Display sizes (logical px) each kind of image is shown at
+SURFACES = {
+    "poster": [(60, 90), (150, 225), (180, 270)],   # list row, grid tile, detail view
+    "profile": [(120, 180)],                         # cast tab
+    "person": [(180, 270)],                          # director / creator
+}
+
+
+@dataclass
+class WarmTarget:
+    url: str
+    sizes: List[Tuple[int, int]] = field(default_factory=list)   # logical display sizes
+
+    def plan(self, dpr: float) -> Tuple[str, List[Tuple[str, int, int]]]:
+        """(URL to download, [(thumbnail url, w, h) in physical px, ...])."""
+        thumbs = [(resolve_image_url(self.url, w, h, dpr), round(w * dpr), round(h * dpr)) for w, h in self.sizes]
+        largest = max(self.sizes, key=lambda size: size[0] * size[1])
+        return resolve_image_url(self.url, *largest, dpr), thumbs
+
+
+# ==========================================================
+# 📋 WHAT TO DOWNLOAD
+# ==========================================================
+def _person_url(value) -> Optional[str]:
+    """The photo URL of a "Name, url" director / creator column."""
+    if value and "," in value:
+        url = value.split(",", 1)[1].strip()
+        return url if url.startswith("http") else None
+    return None
+
+
+def collect_targets() -> List[WarmTarget]:
+    """Every image URL in the library with the sizes it is displayed at."""
+    targets: Dict[str, WarmTarget] = {}
+
+    def add(url, kind):
+        url = (url or "").strip()
+        if url.startswith("http"):
+            target = targets.setdefault(url, WarmTarget(url))
+            target.sizes.extend(size for size in SURFACES[kind] if size not in target.sizes)
+
+    with get_conn() as conn:
+        for table, person_column in (("movies", "director"), ("series", "creator")):
+            for row in conn.execute(f"SELECT poster_path, \"cast\", {person_column} AS person FROM {table}"):
+                add(row["poster_path"], "poster")
+                add(_person_url(row["person"]), "person")
+                try:
+                    cast = json.loads(row["cast"]) if row["cast"] else []
+                except ValueError:
+                    cast = []
+                for actor in cast if isinstance(cast, list) else []:
+                    if isinstance(actor, dict):
+                        add(actor.get("profile"), "profile")
+    return list(targets.values())
+
+
+def _is_cached(target: WarmTarget, dpr: float) -> bool:
+    _, thumbs = target.plan(dpr)
+    return all(thumbnails.contains(url, w, h) for url, w, h in thumbs)
+
+
+# ==========================================================
+# 💾 STATE (images the server does not have)
+# ==========================================================
+def _load_gone() -> Dict[str, float]:
+    try:
+        with open(STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("gone", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_gone(gone: Dict[str, float]):
+    tmp = f"{STATE_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"gone": gone}, f)
+    os.replace(tmp, STATE_PATH)
+
+
+# ==========================================================
+# ⬇️ DOWNLOADS
+# ==========================================================
+class PosterWarmup:
+    def __init__(self, workers: int = DEFAULT_WORKERS, max_rate: float = DEFAULT_RATE, dpr: float = 1.0,
+                 progress: Optional[Callable[[int, int, int], None]] = None):
+        self.workers = workers
+        self.dpr = dpr
+        self.progress = progress
+        self.bucket = TokenBucket(rate=max_rate, burst=max(CHUNK_SIZE, int(max_rate)))
+        self.stop_event = threading.Event()
+        self._local = threading.local()
+        self.done = self.failed = self.bytes = 0
+
+    def stop(self):
+        """Stop after the downloads in flight; the next run picks up the rest."""
+        self.stop_event.set()
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            self._local.session.headers["User-Agent"] = USER_AGENT
+        return self._local.session
+
+    def _download(self, url: str) -> Tuple[bytes, Optional[str]]:
+        with self._session().get(url, stream=True, timeout=20) as resp:
+            resp.raise_for_status()
+            chunks = []
+            for chunk in resp.iter_content(CHUNK_SIZE):
+                if self.stop_event.is_set():
+                    raise InterruptedError(url)
+                self.bucket.acquire(len(chunk))
+                chunks.append(chunk)
+            return b"".join(chunks), resp.headers.get("Content-Type")
+
+    def _warm(self, target: WarmTarget) -> int:
+        """Download one image and render its thumbnails. Returns bytes downloaded."""
+        source_url, thumbs = target.plan(self.dpr)
+        base = hashlib.sha1(source_url.encode("utf-8")).hexdigest()  # same naming as link_to_image
+        original = find_original(base)
+        path = disk_cache.get(original) if original else None
+        if path:
+            data, image = b"", QImage(path)
+        else:
+            data, content_type = self._download(source_url)
+            image = QImage.fromData(data)
+            if image.isNull():
+                raise ValueError(f"not an image: {source_url}")
+            disk_cache.write(f"{base}.{image_extension(content_type, data)}", data)
+        for url, w, h in thumbs:
+            if not thumbnails.contains(url, w, h):
+                thumbnails.render(url, w, h, image)
+        return len(data)
+
+    def _collect(self, futures, total: int, gone: Dict[str, float]):
+        for future in as_completed(futures):
+            target = futures[future]
+            try:
+                self.bytes += future.result()
+                self.done += 1
+            except InterruptedError:
+                continue
+            except requests.HTTPError as e:
+                self.failed += 1
+                if e.response is not None and e.response.status_code in GONE_STATUSES:
+                    gone[target.url] = time.time()
+            except (requests.RequestException, ValueError, OSError) as e:
+                self.failed += 1
+                logger.warning("Poster warm-up failed for %s: %s", target.url, e)
+            if self.progress:
+                self.progress(self.done + self.failed, total, self.bytes)
+
+    def run(self, targets: Optional[List[WarmTarget]] = None) -> dict:
+        disk_cache.wait_ready()
+        gone = _load_gone()
+        targets = collect_targets() if targets is None else targets
+        todo = [t for t in targets if t.url not in gone and not _is_cached(t, self.dpr)]
+        total = len(todo)
+        skipped = len(targets) - total
+        start = time.monotonic()
+        logger.info("Poster warm-up: %d to fetch, %d already cached or gone", total, skipped)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="poster-warmup") as pool:
+            futures = {pool.submit(self._warm, t): t for t in todo}
+            try:
+                self._collect(futures, total, gone)
+            except KeyboardInterrupt:  # finish quickly: running downloads stop at their next chunk
+                self.stop()
+                for future in futures:
+                    future.cancel()
+
+        _save_gone(gone)
+        disk_cache.flush()
+        thumb_atlas.flush()
+        return {
+            "total": len(targets),
+            "skipped": skipped,
+            "downloaded": self.done,
+            "failed": self.failed,
+            "bytes": self.bytes,
+            "stopped": self.stop_event.is_set(),
+            "seconds": round(time.monotonic() - start, 1),
+        }
+
+
+def warm_up(workers: int = DEFAULT_WORKERS, max_rate: float = DEFAULT_RATE, dpr: float = 1.0,
+            progress: Optional[Callable[[int, int, int], None]] = None) -> dict:
+    return PosterWarmup(workers, max_rate, dpr, progress).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download every library poster and cast photo for offline use")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate-kb", type=float, default=DEFAULT_RATE / 1024, help="download cap in KB/s")
+    parser.add_argument("--dpr", type=float, default=1.0, help="device pixel ratio of the screen the app runs on")
+    parser.add_argument("--retry-gone", action="store_true", help="retry images that returned 404 before")
+    args = parser.parse_args()
+
+    if args.retry_gone and os.path.exists(STATE_PATH):
+        os.remove(STATE_PATH)
+
+    report = lambda done, total, size: print(f"\r🖼️ {done:,}/{total:,} images, {size / 2**20:.1f} MB", end="", flush=True)
+    result = PosterWarmup(args.workers, args.rate_kb * 1024, args.dpr, report).run()
+    if result["stopped"]:
+        print("\n⚠️ Stopped; run again to resume")
+        return
+    print(f"\n✅ {result['downloaded']:,} downloaded, {result['failed']:,} failed, "
+          f"{result['skipped']:,} already cached ({result['bytes'] / 2**20:.1f} MB in {result['seconds']}s)")
+
+
+if __name__ == "__main__":
+    main()
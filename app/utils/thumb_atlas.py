@@ -0,0 +1,416 @@
+# app/utils/thumb_atlas.py
+"""
+Packed thumbnail store: every thumbnail in one append-only data file.
+
+assets/posters/atlas/thumbs-<generation>.pack holds records
+    b"THMB" | key length (u16) | data length (u32) | key | encoded image
+and atlas.db maps key -> (offset, length). Reads go through a read-only
+mmap of the pack, so serving the whole library's list / grid thumbnails
+costs one open() instead of one open/stat/read per file.
+
+- put() appends; overwritten and deleted records become dead bytes
+- a record appended but not yet in the index (crash) is recovered by
+  scanning the pack's tail at startup
+- the index is loaded (and the tail recovered) on a background thread at
+  startup, like the disk cache's
+- compact() copies the live records (most recently used first, up to the
+  size cap) into the next generation's pack without holding the lock, then
+  briefly retakes it to copy records put in the meantime and switch the
+  index over in one transaction; it runs in the background once dead bytes
+  pass COMPACT_DEAD_RATIO, or when the pack outgrows its cap
+
+    python -m app.utils.thumb_atlas stats|compact|clear
+"""
+
+import argparse
+import atexit
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from typing import Dict, Optional
+
+from app.utils.disk_cache import CACHE_DIR, UNMANAGED_DIRS
+
+
+logger = logging.getLogger(__name__)
+
+ATLAS_DIR = os.path.join(CACHE_DIR, UNMANAGED_DIRS[0])
+INDEX_NAME = "atlas.db"
+PACK_PATTERN = "thumbs-{}.pack"
+MAGIC = b"THMB"
+HEADER = struct.Struct("<4sHI")        # magic, key length, data length
+DEFAULT_CAP_MB = 256
+COMPACT_DEAD_RATIO = 0.3               # compact once 30% of the pack is dead records
+COMPACT_MIN_BYTES = 8 * 2**20          # ... and at least this much is dead
+FLUSH_EVERY = 200                      # index rows written per commit
+
+try:  # optional override: THUMB_ATLAS_MB = 512
+    from config import THUMB_ATLAS_MB as _CAP_MB
+except ImportError:
+    _CAP_MB = DEFAULT_CAP_MB
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    last_access REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER);
+"""
+
+
+class ThumbAtlas:
+    def __init__(self, directory: str = ATLAS_DIR, cap_bytes: int = int(_CAP_MB * 2**20)):
+        self.directory = directory
+        self.cap_bytes = cap_bytes
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()  # one compaction at a time
+        self._ready = threading.Event()
+        self._started = False
+        self._records: Dict[str, list] = {}   # key -> [offset, length, last_access]
+        self._pending = set()                 # keys whose index row is not written yet
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pack = None                     # append handle
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._size = 0
+        self._live = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._compacting = False
+
+    # ------------------------------------------------------
+    # opening
+    # ------------------------------------------------------
+    def _pack_path(self, generation: int) -> str:
+        return os.path.join(self.directory, PACK_PATTERN.format(generation))
+
+    def start(self):
+        """Load the index and recover the pack's tail on a background thread (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        atexit.register(self.flush)
+        threading.Thread(target=self._open, name="thumb-atlas-open", daemon=True).start()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """True once the atlas is open and usable."""
+        self.start()
+        return self._ready.wait(timeout) and self._conn is not None
+
+    def _open(self):
+        try:
+            with self._lock:
+                os.makedirs(self.directory, exist_ok=True)
+                conn = sqlite3.connect(os.path.join(self.directory, INDEX_NAME), check_same_thread=False)
+                conn.executescript(SCHEMA)
+                row = conn.execute("SELECT value FROM meta WHERE name='generation'").fetchone()
+                self.generation = row[0] if row else 0
+                for key, offset, length, last_access in conn.execute("SELECT * FROM records"):
+                    self._records[key] = [offset, length, last_access]
+                    self._live += length
+                self._remove_stale_packs()
+                self._pack = open(self._pack_path(self.generation), "ab")
+                self._size = self._pack.tell()
+                self._conn = conn
+                self._recover_tail()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Thumbnail atlas unusable (%s), thumbnails will not be stored", e)
+            self._conn = None
+        finally:
+            self._ready.set()
+
+    def _remove_stale_packs(self):
+        """Packs of other generations: the old one after a compaction, or a half-written new one."""
+        current = PACK_PATTERN.format(self.generation)
+        for filename in os.listdir(self.directory):
+            if filename.startswith("thumbs-") and filename.endswith(".pack") and filename != current:
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except OSError:
+                    pass
+
+    def _recover_tail(self):
+        """Index records appended after the last index commit (the app died in between)."""
+        row = self._conn.execute("SELECT value FROM meta WHERE name='indexed_size'").fetchone()
+        end = row[0] if row else 0
+        if end >= self._size:
+            return
+        recovered = 0
+        with open(self._pack_path(self.generation), "rb") as f:
+            f.seek(end)
+            while True:
+                start = f.tell()
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    break
+                magic, key_len, data_len = HEADER.unpack(header)
+                key = f.read(key_len)
+                if magic != MAGIC or len(key) < key_len or start + HEADER.size + key_len + data_len > self._size:
+                    # torn write: cut it off so new records are appended right after the last good one
+                    self._pack.truncate(start)
+                    self._size = start
+                    break
+                offset = start + HEADER.size + key_len
+                self._set(key.decode("utf-8"), offset, data_len, time.time())
+                f.seek(offset + data_len)
+                recovered += 1
+        if recovered:
+            self.flush()
+            logger.info("Thumbnail atlas recovered %d unindexed records", recovered)
+
+    # ------------------------------------------------------
+    # reads
+    # ------------------------------------------------------
+    def _view(self, needed: int) -> Optional[mmap.mmap]:
+        if self._map is None or needed > self._mapped_size:
+            self._pack.flush()
+            if self._map is not None:
+                self._map.close()
+            with open(self._pack_path(self.generation), "rb") as f:
+                self._mapped_size = os.fstat(f.fileno()).st_size
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self._mapped_size else None
+        return self._map
+
+    def read(self, key: str) -> Optional[bytes]:
+        if not self.wait_ready(timeout=2.0):
+            self.misses += 1
+            return None
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                self.misses += 1
+                return None
+            offset, length, _ = record
+            view = self._view(offset + length)
+            if view is None:
+                self.misses += 1
+                return None
+            record[2] = time.time()
+            self._pending.add(key)  # persisted with the next flush, for LRU trimming across runs
+            self.hits += 1
+            return view[offset:offset + length]
+
+    def contains(self, key: str) -> bool:
+        if not self.wait_ready(timeout=2.0):
+            return False
+        with self._lock:
+            return key in self._records
+
+    # ------------------------------------------------------
+    # writes
+    # ------------------------------------------------------
+    def _set(self, key: str, offset: int, length: int, last_access: float):
+        old = self._records.get(key)
+        if old is not None:
+            self._live -= old[1]
+        self._records[key] = [offset, length, last_access]
+        self._live += length
+        self._pending.add(key)
+
+    def put(self, key: str, data: bytes):
+        encoded_key = key.encode("utf-8")
+        if not self.wait_ready():
+            return
+        with self._lock:
+            self._pack.write(HEADER.pack(MAGIC, len(encoded_key), len(data)))
+            self._pack.write(encoded_key)
+            offset = self._size + HEADER.size + len(encoded_key)
+            self._pack.write(data)
+            self._size = offset + len(data)
+            self._set(key, offset, len(data), time.time())
+            if len(self._pending) >= FLUSH_EVERY:
+                self.flush()
+        self._maybe_compact()
+
+    def delete(self, key: str):
+        if not self.wait_ready():
+            return
+        with self._lock:
+            record = self._records.pop(key, None)
+            if record is None:
+                return
+            self._live -= record[1]
+            self._pending.discard(key)
+            self._conn.execute("DELETE FROM records WHERE key=?", (key,))
+            self._conn.commit()
+
+    def flush(self):
+        """Write appended data and pending index rows (records must hit the pack before the index)."""
+        with self._lock:
+            if self._conn is None:
+                return
+            self._pack.flush()
+            rows = [(k, *self._records[k]) for k in self._pending if k in self._records]
+            self._pending.clear()
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (key, offset, length, last_access) VALUES (?, ?, ?, ?)", rows
+                )
+                self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('indexed_size', ?)", (self._size,))
+
+    # ------------------------------------------------------
+    # compaction
+    # ------------------------------------------------------
+    def dead_bytes(self) -> int:
+        """Bytes of the pack not holding a live thumbnail (overwritten / deleted records, headers)."""
+        return max(0, self._size - self._live)
+
+    def _maybe_compact(self):
+        with self._lock:
+            dead = self.dead_bytes()
+            if self._compacting:
+                return
+            if not ((dead >= COMPACT_MIN_BYTES and dead > self._size * COMPACT_DEAD_RATIO) or self._live > self.cap_bytes):
+                return
+            self._compacting = True
+        threading.Thread(target=self._compact_in_background, name="thumb-atlas-compact", daemon=True).start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Thumbnail atlas compaction failed: %s", e)
+            self._compacting = False
+            return
+        self._compacting = False
+        self._maybe_compact()  # puts kept going during the copy and may have filled it up again
+
+    @staticmethod
+    def _append(out, key: str, data, records: Dict[str, list], last_access: float):
+        encoded_key = key.encode("utf-8")
+        out.write(HEADER.pack(MAGIC, len(encoded_key), len(data)))
+        out.write(encoded_key)
+        records[key] = [out.tell(), len(data), last_access]
+        out.write(data)
+
+    def compact(self) -> int:
+        """
+        Rewrite the live records (LRU-trimmed to the cap) into a fresh pack. Returns reclaimed bytes.
+        Readers and writers are only held up for the final switch-over, not for the copy.
+        """
+        if not self.wait_ready():
+            return 0
+        with self._compact_lock:
+            # 1. snapshot what to keep
+            with self._lock:
+                self.flush()
+                snapshot = {key: list(record) for key, record in self._records.items()}
+                snapshot_size = self._size
+                generation = self.generation + 1
+            budget = int(self.cap_bytes * 0.9) if sum(r[1] for r in snapshot.values()) > self.cap_bytes else None
+            keep = []
+            for key, record in sorted(snapshot.items(), key=lambda kv: kv[1][2], reverse=True):
+                if budget is not None:
+                    if budget - record[1] < 0:
+                        break
+                    budget -= record[1]
+                keep.append(key)
+            keep.sort(key=lambda k: snapshot[k][0])  # keep read locality of the old layout
+
+            # 2. copy them from a private read-only map, lock released
+            new_path = self._pack_path(generation)
+            new_records: Dict[str, list] = {}
+            with open(self._pack_path(generation - 1), "rb") as old, open(new_path, "wb") as out:
+                view = mmap.mmap(old.fileno(), snapshot_size, access=mmap.ACCESS_READ) if snapshot_size else None
+                try:
+                    for key in keep:
+                        offset, length, last_access = snapshot[key]
+                        self._append(out, key, view[offset:offset + length], new_records, last_access)
+                finally:
+                    if view is not None:
+                        view.close()
+                out.flush()
+                os.fsync(out.fileno())
+
+            # 3. replay what changed meanwhile, commit the index and switch packs
+            with self._lock:
+                current = self._view(self._size)
+                with open(new_path, "ab") as out:
+                    for key, (offset, length, last_access) in self._records.items():
+                        before = snapshot.get(key)
+                        if before is None or before[0] != offset:  # put while we were copying
+                            self._append(out, key, current[offset:offset + length], new_records, last_access)
+                        elif key in new_records:
+                            new_records[key][2] = last_access    # read while we were copying
+                    for key in [k for k in new_records if k not in self._records]:  # deleted meanwhile
+                        del new_records[key]
+                    out.flush()
+                    os.fsync(out.fileno())
+                    size = out.tell()
+
+                with self._conn:
+                    self._conn.execute("DELETE FROM records")
+                    self._conn.executemany(
+                        "INSERT INTO records (key, offset, length, last_access) VALUES (?, ?, ?, ?)",
+                        [(k, *r) for k, r in new_records.items()],
+                    )
+                    self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('generation', ?)", (generation,))
+                    self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('indexed_size', ?)", (size,))
+
+                if self._map is not None:
+                    self._map.close()
+                    self._map = None
+                self._pack.close()
+                old_path = self._pack_path(self.generation)
+                reclaimed = self._size - size
+                self.generation = generation
+                self._records = new_records
+                self._pending.clear()
+                self._live = sum(r[1] for r in new_records.values())
+                self._pack = open(new_path, "ab")
+                self._size = size
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+            logger.info("Thumbnail atlas compacted: %d records, %.1f MB reclaimed",
+                        len(new_records), reclaimed / 2**20)
+            return reclaimed
+
+    def clear(self) -> int:
+        """Drop every thumbnail. Returns reclaimed bytes."""
+        if not self.wait_ready():
+            return 0
+        with self._lock:
+            for key in list(self._records):
+                self.delete(key)
+        return self.compact()
+
+    def stats(self) -> dict:
+        self.wait_ready()
+        with self._lock:
+            return {
+                "records": len(self._records),
+                "pack_mb": round(self._size / 2**20, 1),
+                "dead_mb": round(self.dead_bytes() / 2**20, 1),
+                "cap_mb": round(self.cap_bytes / 2**20, 1),
+                "generation": self.generation,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+thumb_atlas = ThumbAtlas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Packed thumbnail store")
+    parser.add_argument("command", choices=["stats", "compact", "clear"])
+    args = parser.parse_args()
+
+    if args.command != "stats":
+        freed = thumb_atlas.compact() if args.command == "compact" else thumb_atlas.clear()
+        print(f"✅ Reclaimed {freed / 2**20:.1f} MB")
+    print(thumb_atlas.stats())
+
+
+if __name__ == "__main__":
+    main()
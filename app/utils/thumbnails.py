@@ -0,0 +1,101 @@
+# app/utils/thumbnails.py
+"""
+Pre-scaled image variants, one per (url, width, height).
+
+A poster is scaled once per display size (60x90 list, 150x225 grid,
+70x100 search, 180x270 detail ...) and the result is kept in the pixmap
+LRU and in the packed thumbnail atlas, so repeat displays skip scaling.
+Thumbnails written as separate files under thumbs/ by older versions are
+moved into the atlas the first time they are read.
+"""
+
+import hashlib
+from typing import Optional
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QImage, QPixmap
+
+from app.utils.image_cache import pixmap_cache
+from app.utils.disk_cache import disk_cache, DiskCache
+from app.utils.thumb_atlas import thumb_atlas, ThumbAtlas
+
+
+THUMB_QUALITY = 90
+
+
+def scale_to_fit(image: QImage, w: int, h: int) -> QImage:
+    return image.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio,
+                         Qt.TransformationMode.SmoothTransformation)
+
+
+def encode_thumbnail(image: QImage) -> bytes:
+    """JPEG for opaque thumbnails (a fraction of the PNG size), PNG when there is alpha."""
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if image.hasAlphaChannel():
+        image.save(buffer, "PNG")
+    else:
+        image.save(buffer, "JPG", THUMB_QUALITY)
+    return bytes(data)
+
+
+class ThumbnailStore:
+    def __init__(self, atlas: ThumbAtlas = thumb_atlas, cache: DiskCache = disk_cache):
+        self.atlas = atlas
+        self.cache = cache
+
+    @staticmethod
+    def key_for(url: str, w: int, h: int) -> str:
+        hash_name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return f"{hash_name}_{w}x{h}"
+
+    def contains(self, url: str, w: int, h: int) -> bool:
+        return self.atlas.contains(self.key_for(url, w, h))
+
+    def get(self, url: str, w: int, h: int) -> Optional[QPixmap]:
+        """The (url, w, h) variant from memory or the atlas, None if it was never made."""
+        pixmap = pixmap_cache.get((url, w, h))
+        if pixmap is not None:
+            return pixmap
+        key = self.key_for(url, w, h)
+        data = self.atlas.read(key) or self._migrate(key)
+        if not data:
+            return None
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):  # damaged record
+            self.atlas.delete(key)
+            return None
+        pixmap_cache.put((url, w, h), pixmap)
+        return pixmap
+
+    def _migrate(self, key: str) -> Optional[bytes]:
+        """Move a thumbs/<key>.png file from the disk cache into the atlas."""
+        name = f"thumbs/{key}.png"
+        path = self.cache.get(name)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        finally:
+            self.cache.discard(name)
+        self.atlas.put(key, data)
+        return data
+
+    def render(self, url: str, w: int, h: int, source: QImage) -> QImage:
+        """Scale `source` to fit w x h and store the variant in the atlas. Safe on worker threads."""
+        thumb = scale_to_fit(source, w, h)
+        self.atlas.put(self.key_for(url, w, h), encode_thumbnail(thumb))
+        return thumb
+
+    def remember(self, url: str, w: int, h: int, thumb: QImage) -> QPixmap:
+        """Turn a rendered variant into a pixmap and keep it in memory. GUI thread only."""
+        pixmap = QPixmap.fromImage(thumb)
+        pixmap_cache.put((url, w, h), pixmap)
+        return pixmap
+
+
+thumbnails = ThumbnailStore()
@@ -1,5 +1,8 @@
+import logging
+
+import requests
 from PySide6.QtWidgets import QDialog, QMessageBox, QComboBox,QListWidget,QListWidgetItem,QLabel,QHBoxLayout,QVBoxLayout,QWidget
-from PySide6.QtCore import Signal, Qt, QThread,QSize,QPoint
+from PySide6.QtCore import Signal, Qt, QThread,QSize,QPoint,QTimer
 from PySide6.QtGui import QPixmap, QColor, QPainter
 from py_ui.add import Ui_add_widget
 from app.utils.my_functions import link_to_image, get_selected_section, resize_combo_box_to_contents
@@ -10,36 +13,69 @@ from app.models.series import Series
 from app.db.movies_db import insert_movie, list_movies
 from app.db.series_db import insert_series, list_series
 
-from app.fetch.movies_info_fetcher import get_movie_info, search_movies_tmdb,search_anime_movies,get_movies_anime_info
-from app.fetch.series_info_fetcher import get_series_info, search_series_tmdb,search_anime_series,get_series_anime_info
+from app.fetch.providers import get_provider, providers_for
+from app.fetch.federated import federated_search, FEDERATED_KEY, FEDERATED_LABEL
+from app.fetch.http_client import quota_status, breaker_status
+from app.fetch.circuit_breaker import ProviderUnavailable
+from app.fetch.rate_limiter import QuotaExceeded
+from app.fetch.prefetch import prefetcher, PREFETCH_TOP_N, HOVER_PRIORITY
+from app.utils.fuzzy import TitleIndex, same_numbering
+
+logger = logging.getLogger(__name__)
+
+SEARCH_DEBOUNCE_MS = 350  # wait this long after the last keystroke before searching
+MIN_SEARCH_LENGTH = 2
+DUPLICATE_SIMILARITY = 0.9  # library titles at least this similar count as "already added"
 
 
 class SearchWorker(QThread):
-    results_ready = Signal(list)
+    results_ready = Signal(int, list, bool)  # request sequence number, results, final
+    search_failed = Signal(int, str)          # request sequence number, message for the user
 
-    def __init__(self, query,media_type,api, parent=None):
+    def __init__(self, query,media_type,api, seq=0, parent=None):
         super().__init__(parent)
         self.query = query
         self.media_type = media_type
         self.api=api
-    def run(self):
-        # YOUR API SEARCH FUNCTION
-        if self.media_type == "movies" and self.api == "tmdb+omdb":
-            movies = search_movies_tmdb(self.query)
-            self.results_ready.emit(movies)
-
-        elif self.media_type == "movies" and self.api == "myanimelist":
-            movies = search_anime_movies(self.query)
-            self.results_ready.emit(movies)
+        self.seq = seq
 
+    def run(self):
+        # Superseded before it even started: skip the request entirely
+        if self.isInterruptionRequested():
+            return
 
-        elif self.media_type == "series" and self.api == "tmdb+omdb":
-            series = search_series_tmdb(self.query)
-            self.results_ready.emit(series)
+        # Federated: stream a merged snapshot as each provider answers, then mark the last one final
+        if self.api == FEDERATED_KEY:
+            results = []
+            for results in federated_search(self.media_type, self.query, should_stop=self.isInterruptionRequested):
+                self.results_ready.emit(self.seq, results, False)
+            if not self.isInterruptionRequested():
+                self.results_ready.emit(self.seq, results, True)
+            return
 
-        elif self.media_type == "series" and self.api == "myanimelist":
-            series = search_anime_series(self.query)
-            self.results_ready.emit(series)
+        provider = get_provider(self.api)
+        results = []
+        if provider and provider.supports(self.media_type):
+            try:
+                results = provider.search(self.media_type, self.query)
+            except requests.RequestException as e:  # no fallback left (e.g. MyAnimeList down or out of quota)
+                logger.warning("%s search for %r failed: %s", provider.label, self.query, e)
+                self.results_ready.emit(self.seq, [], True)
+                self.search_failed.emit(self.seq, self.failure_message(provider, e))
+                return
+            for result in results:
+                result.setdefault("provider", provider.key)
+
+        # Always emit: the window caches the results and drops them from display if stale
+        self.results_ready.emit(self.seq, results, True)
+
+    @staticmethod
+    def failure_message(provider, error):
+        if isinstance(error, ProviderUnavailable):
+            return f"{provider.label} is unavailable right now. Try again in a moment."
+        if isinstance(error, QuotaExceeded):
+            return f"{provider.label} is out of API calls for today."
+        return f"{provider.label} search failed. Check your connection and try again."
 
         
 
@@ -54,22 +90,14 @@ class MediaInfoWorker(QThread):
         self.api = api
 
     def run(self):
-        if self.media_type == "movies" and self.api == "tmdb+omdb":
-            media_info = get_movie_info(self.id)
-            self.result_ready.emit(media_info)
-
-        if self.media_type == "movies" and self.api == "myanimelist":
-            media_info = get_movies_anime_info(self.id)
-            self.result_ready.emit(media_info)
-
-
-        elif self.media_type == "series" and self.api == "tmdb+omdb":
-            media_info = get_series_info(self.id)
-            self.result_ready.emit(media_info)
-
-        elif self.media_type == "series" and self.api == "myanimelist":
-            media_info = get_series_anime_info(self.id)
-            self.result_ready.emit(media_info)
+        provider = get_provider(self.api)
+        media_info = "no"
+        if provider and provider.supports(self.media_type):
+            try:
+                media_info = provider.details(self.media_type, self.id)
+            except requests.RequestException as e:
+                logger.warning("%s details for %s failed: %s", provider.label, self.id, e)
+        self.result_ready.emit(media_info)
 
 
 
@@ -93,6 +121,7 @@ class AddMediaWindow(QDialog):
 
         # Load existing data per section
         self.data = self.get_existing_data()
+        self.library_index = None  # TitleIndex over self.data, built on first duplicate check
 
         self.setup_ui()
         self.setup_signals()
@@ -103,10 +132,23 @@ class AddMediaWindow(QDialog):
         self.search_popup.setWindowFlags(Qt.Popup)
         self.search_popup.hide()
         self.ui.result_list_widget.itemClicked.connect(self.on_media_selected)
+        self.ui.result_list_widget.setMouseTracking(True)
+        self.ui.result_list_widget.itemEntered.connect(self.on_result_hovered)
 
 
         self.is_loading_info = False
 
+        # ---------------- Search as you type ----------------
+        self.search_seq = 0              # increases with every search started
+        self.search_workers = set()      # keep running workers alive until they finish
+        self.search_cache = {}           # {(media_type, api, query): results}, final non-empty results only
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.on_search_typed)
+        self.ui.search_line.textChanged.connect(self.on_search_text_changed)
+
 
     # ---------------- Initialize UI ----------------
     def setup_ui(self):
@@ -139,8 +181,11 @@ class AddMediaWindow(QDialog):
 
         #--------------------- SET UP Search Combobox -----------------------------------------
 
-        apis = ["TMDB+OMDB"]
+        apis = [p.label for p in providers_for(self.media_type)]
+        if len(apis) > 1:
+            apis.append(FEDERATED_LABEL)
         self.ui.apis_combobox.addItems(apis)
+        self.ui.apis_combobox.setToolTip(self.get_quota_tooltip())
 
 
 
@@ -152,6 +197,18 @@ class AddMediaWindow(QDialog):
         if hasattr(self.ui, "search_button"):
             self.ui.search_button.clicked.connect(self.on_search_clicked) 
 
+    def get_quota_tooltip(self):
+        """Remaining daily API calls and unavailable providers, shown on the API selector."""
+        lines = []
+        for provider, info in quota_status().items():
+            if info["daily_limit"] is not None:
+                lines.append(f"{provider.upper()}: {info['remaining']}/{info['daily_limit']} calls left today")
+        for provider, info in breaker_status().items():
+            if info["state"] != "closed":
+                retry = f", retrying in {info['retry_in']:.0f}s" if info["retry_in"] else ""
+                lines.append(f"{provider.upper()}: unavailable{retry}")
+        return "\n".join(lines)
+
     # ---------------- Load Image ----------------
     def load_image(self, url: str, label, width=180, height=270):
         """Load image from URL or use placeholder."""
@@ -234,11 +291,12 @@ class AddMediaWindow(QDialog):
 
             self.validate_media_data(data)
 
-            duplicate_section = self.check_duplicate(data["name"])
-            if duplicate_section:
+            duplicate = self.check_duplicate(data["name"])
+            if duplicate:
+                duplicate_section, duplicate_title = duplicate
                 reply = QMessageBox.question(
                     self, "Confirm Adding",
-                    f"There is a {self.media_type} with this name ({data['name']}) in the ({duplicate_section.replace('_',' ')}) section.\n"
+                    f"There is a {self.media_type} with this name ({duplicate_title}) in the ({duplicate_section.replace('_',' ')}) section.\n"
                     "Are you sure you want to add it again?",
                     QMessageBox.Yes | QMessageBox.No
                 )
@@ -283,11 +341,18 @@ class AddMediaWindow(QDialog):
 
     # ---------------- Duplicate Check ----------------
     def check_duplicate(self, title: str):
-        title_lower = title.strip().lower()
-        for section, items in self.data.items():
-            for item in items:
-                if item.title.strip().lower() == title_lower:
-                    return section
+        """Return (section, existing title) of the closest library entry, or None."""
+        if self.library_index is None:
+            self.library_index = TitleIndex(
+                ((section, i), item.title)
+                for section, items in self.data.items()
+                for i, item in enumerate(items)
+            )
+        # sequels score close to each other ("Rocky II" / "Rocky III"): the numbers must match too
+        for (section, i), _score in self.library_index.search(title, limit=10, cutoff=DUPLICATE_SIMILARITY):
+            existing = self.data[section][i].title
+            if same_numbering(title, existing):
+                return section, existing
         return None
 
     # ---------------- Insert Media ----------------
@@ -383,29 +448,102 @@ class AddMediaWindow(QDialog):
         if not query:
             return
 
+        self.search_timer.stop()
+        self.start_search(query, use_cache=False)
+
+    def on_search_text_changed(self, text):
+        """Debounce typing; cached queries (e.g. after backspace) are shown instantly."""
+        self.search_timer.stop()
+        query = text.strip()
+        api = get_selected_section(self.ui.apis_combobox)
+        if api is None or len(query) < MIN_SEARCH_LENGTH:
+            return
+
+        key = self.search_cache_key(query, api)
+        if key in self.search_cache:
+            self.seleted_api = api
+            self.cancel_searches()
+            self.show_search_results(self.search_seq, self.search_cache[key])
+            return
+
+        self.search_timer.start()
+
+    def on_search_typed(self):
+        self.seleted_api = get_selected_section(self.ui.apis_combobox)
+        query = self.ui.search_line.text().strip()
+        if self.seleted_api is None or len(query) < MIN_SEARCH_LENGTH:
+            return
+        self.start_search(query)
+
+    def start_search(self, query, use_cache=True):
+        key = self.search_cache_key(query, self.seleted_api)
+        if use_cache and key in self.search_cache:
+            self.cancel_searches()
+            self.show_search_results(self.search_seq, self.search_cache[key])
+            return
+
+        self.cancel_searches()
         self.ui.search_button.setEnabled(False)  # disable while fetching
+        self.ui.apis_combobox.setToolTip(self.get_quota_tooltip())  # breakers / quota change over time
 
         # Start worker
-        self.worker = SearchWorker(query,self.media_type,self.seleted_api)
-        self.worker.results_ready.connect(self.show_search_results)
-        self.worker.finished.connect(lambda: self.ui.search_button.setEnabled(True))
-        self.worker.start()
+        worker = SearchWorker(query,self.media_type,self.seleted_api, seq=self.search_seq)
+        worker.results_ready.connect(lambda seq, results, final, k=key: self.on_search_results(seq, results, final, k))
+        worker.search_failed.connect(self.on_search_failed)
+        worker.finished.connect(lambda w=worker: self._search_worker_finished(w))
+        self.search_workers.add(worker)
+        worker.start()
+
+    def cancel_searches(self):
+        """Supersede every running search; their results will be dropped."""
+        self.search_seq += 1
+        for worker in self.search_workers:
+            worker.requestInterruption()
+
+    def on_search_results(self, seq, results, final, key):
+        # Empty results may just mean the provider was down or out of quota, and partial
+        # federated snapshots miss the slower providers: neither is worth replaying later
+        if final and results:
+            self.search_cache[key] = results
+        self.show_search_results(seq, results)
+
+    def on_search_failed(self, seq, message):
+        """Tell the user why there are no results (provider down or out of quota)."""
+        if seq != self.search_seq:
+            return
+        item = QListWidgetItem(message)
+        item.setFlags(Qt.NoItemFlags)  # not selectable: there is nothing to load
+        item.setForeground(QColor("gray"))
+        self.ui.result_list_widget.addItem(item)
+        self.ui.apis_combobox.setToolTip(self.get_quota_tooltip())
+
+    def _search_worker_finished(self, worker):
+        self.search_workers.discard(worker)
+        worker.deleteLater()
+        if not self.search_workers:
+            self.ui.search_button.setEnabled(True)
+
+    def search_cache_key(self, query, api):
+        return (self.media_type, api, " ".join(query.split()).casefold())
 
     # ---------------- Helper ----------------
     def get_existing_data(self):
         """Return the existing data per section based on media type."""
-        if self.media_type == "movie":
+        if self.media_type in ("movie", "movies"):
             return {sec: list_movies(sec) for sec in ["watching", "want_to_watch", "continue_later", "dont_want_to_continue", "watched"]}
         elif self.media_type == "series":
             return {sec: list_series(sec) for sec in ["watching", "want_to_watch", "continue_later", "dont_want_to_continue", "watched"]}
         return {}
 
 
-    def show_search_results(self, media):
+    def show_search_results(self, seq, media):
         """
         Build and show the TMDB search results directly in result_list_widget.
         Each item has: poster + title + year.
+        Results from a superseded search (older seq) are dropped.
         """
+        if seq != self.search_seq:
+            return
 
         self.ui.result_list_widget.clear()  # clear previous results
 
@@ -415,7 +553,7 @@ class AddMediaWindow(QDialog):
         # ---- ADD MOVIE ITEMS ----
         for movie in media:
             title = movie["title"]
-            year = movie.get("release_date", "Unknown")
+            year = movie.get("release_date") or movie.get("start_date") or "Unknown"
             tmdb_id = movie["id"]
             poster_url = movie["poster_url"]
 
@@ -471,6 +609,7 @@ class AddMediaWindow(QDialog):
             item = QListWidgetItem()
             item.setSizeHint(QSize(0, 110))
             item.setData(Qt.UserRole, tmdb_id)
+            item.setData(Qt.UserRole + 1, movie.get("provider", self.seleted_api))
             
 
             self.ui.result_list_widget.addItem(item)
@@ -500,13 +639,25 @@ class AddMediaWindow(QDialog):
                                 
         """)
 
+        # Warm the details cache for the most likely picks
+        prefetcher.cancel_pending()
+        for rank, movie in enumerate(media[:PREFETCH_TOP_N], start=1):
+            self.prefetch_details(movie["id"], movie.get("provider", self.seleted_api), priority=rank)
 
+    def prefetch_details(self, media_id, provider_key, priority):
+        provider = get_provider(provider_key)
+        if provider and provider.supports(self.media_type):
+            prefetcher.submit(provider.details_fn(self.media_type), media_id, provider.hosts, priority=priority)
 
+    def on_result_hovered(self, item):
+        if item.data(Qt.UserRole) is None:  # status message, not a result
+            return
+        self.prefetch_details(item.data(Qt.UserRole), item.data(Qt.UserRole + 1), priority=HOVER_PRIORITY)
 
     def on_media_selected(self, item):
 
-        if self.is_loading_info:
-            return  # ignore second click
+        if self.is_loading_info or item.data(Qt.UserRole) is None:
+            return  # ignore second click / status messages
     
         self.is_loading_info = True
 
@@ -514,7 +665,8 @@ class AddMediaWindow(QDialog):
         self.search_popup.hide()
 
         # Create and start the worker
-        self.info_thread = MediaInfoWorker(id,self.media_type,self.seleted_api)
+        api = item.data(Qt.UserRole + 1) or self.seleted_api
+        self.info_thread = MediaInfoWorker(id,self.media_type,api)
         self.info_thread.result_ready.connect(self.display_media_info_from_thread)
         self.info_thread.finished.connect(self._info_thread_finished)
         self.info_thread.start()
@@ -20,9 +20,9 @@ from app.db.movies_db import get_movie_by_id, update_movie, delete_movie, move_m
 from app.db.series_db import get_series_by_id, update_series, delete_series, move_series_section
 
 from app.utils.my_functions import link_to_image, get_selected_section, resize_combo_box_to_contents
-from app.fetch.movies_info_fetcher import ArabSeedScraper, AkwamScraper
+from app.fetch import watch_links
 from app.models.movie import Movie
-from app.models.series import Series
+from app.models.series import Series, expand_episodes
 
 from py_ui.show import Ui_show 
 
@@ -30,9 +30,13 @@ from py_ui.show import Ui_show
 logger = logging.getLogger(__name__)
 
 
+# watch button -> watch_links source key
+WATCH_SOURCES = {1: "akwam", 2: "arabseed", 3: "cineby"}
+
+
 class WatchLinkWorker(QThread):
     """
-    Worker that uses scrapers to find watch links.
+    Worker that resolves a watch link through app.fetch.watch_links (cached, shared with the prefetch).
     Kept mostly for movies use — it's harmless to exist for series but we only call it when media_type == 'movies'.
     """
     finished = Signal(str)  # emits URL or None
@@ -44,18 +48,11 @@ class WatchLinkWorker(QThread):
 
     def run(self):
         url = None
-        title_query = f"{self.movie.title} {self.movie.year or ''}".strip()
-        try:
-            if self.button == 1:
-                scraper = AkwamScraper(self.movie.title, self.movie.year)
-                url = scraper.watch_url
-            elif self.button == 2:
-                scraper = ArabSeedScraper(title_query)
-                url = scraper.watch_url
-            elif self.button == 3:
-                url = f"https://www.vidking.net/embed/movie/{self.movie.tmdb_id}"
+        try:
+            url = watch_links.resolve(WATCH_SOURCES[self.button], self.movie.title,
+                                      self.movie.year, self.movie.tmdb_id)
         except Exception as e:
-            logger.warning("WatchLinkWorker scraper failed: %s", e)
+            logger.warning("WatchLinkWorker lookup failed: %s", e)
             url = None
         self.finished.emit(url)
 
@@ -305,6 +302,10 @@ class ShowMediaWindow(QDialog):
         # refresh UI with loaded data
         self.refresh_display()
 
+        # resolve watch links in the background so the watch buttons answer instantly
+        if self.media_type == "movies" and getattr(self.item, "title", None):
+            watch_links.prefetch(self.item.title, self.item.year, self.item.tmdb_id)
+
     def refresh_display(self):
         """Populate view UI with current item data."""
         item = self.item
@@ -689,6 +690,13 @@ class ShowMediaWindow(QDialog):
         if not self.item or not getattr(self.item, "title", None):
             QMessageBox.information(self, "Movie", "Movie title not available.")
             return
+
+        found, url = watch_links.cached_link(WATCH_SOURCES[button], self.item.title, self.item.year)
+        if found and url:
+            import webbrowser
+            webbrowser.open(url)
+            return
+
         worker = WatchLinkWorker(button, self.item)
         worker.finished.connect(self._open_url_and_cleanup)
         self.active_workers.append(worker)
@@ -795,12 +803,19 @@ class ShowMediaWindow(QDialog):
         eye_normal = ":/icons/Icons/eye.png"
         eye_seen = ":/icons/Icons/eye 1.png"
 
-        def create_episode_widget(ep_number: int):
+        def create_episode_widget(ep_number: int, ep: Optional[dict] = None):
             ep_widget = QWidget()
             ep_layout = QHBoxLayout(ep_widget)
             ep_layout.setContentsMargins(5, 2, 5, 2)
 
-            ep_label = QLabel(f"Episode {ep_number}")
+            ep = ep or {}
+            text = f"Episode {ep_number}"
+            if ep.get("name") and ep["name"] != text:
+                text += f" · {ep['name']}"
+            ep_label = QLabel(text)
+            details = [d for d in (ep.get("air_date"), f"{ep['runtime']} min" if ep.get("runtime") else None) if d]
+            if details:
+                ep_label.setToolTip(" · ".join(details))
             ep_layout.addWidget(ep_label)
             ep_layout.addStretch()
 
@@ -851,8 +866,12 @@ class ShowMediaWindow(QDialog):
             season_layout = QVBoxLayout()
             season_layout.setSpacing(6)
 
+            # stored episodes (title / air date / runtime) when the series was fetched with them
+            episodes = {ep["episode_number"]: ep for ep in expand_episodes(season)}
+            if not isinstance(episode_count, int):
+                episode_count = len(episodes)
             for ep in range(1, episode_count + 1):
-                season_layout.addWidget(create_episode_widget(ep))
+                season_layout.addWidget(create_episode_widget(ep, episodes.get(ep)))
 
             season_box.setLayout(season_layout)
 
@@ -0,0 +1,91 @@
+"""
+Offline throughput / resilience benchmark for the fetch layer.
+
+Runs the real fetchers against the local API stub (app.fetch.stub_server),
+so results are reproducible and need no API keys or network:
+
+    python -m benchmarks.fetch_bench --requests 200 --workers 8 --latency 80 --rate-429 0.05 --seed 1
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("LIBRARY_API_STUB", "http://stub")  # fake keys; the real URL is set below
+
+from app.fetch import http_client  # noqa: E402
+from app.fetch.rate_limiter import PROVIDER_LIMITS, QuotaTracker, limiter  # noqa: E402
+from app.fetch.response_cache import response_cache  # noqa: E402
+from app.fetch.stub_server import start_stub_server  # noqa: E402
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(args):
+    from app.fetch.movies_info_fetcher import get_movie_info
+
+    server = start_stub_server(latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate,
+                               rate_429=args.rate_429, retry_after=args.retry_after, seed=args.seed)
+    http_client.set_stub_url(server.url)
+
+    # keep the benchmark away from the real daily counters
+    limiter.quota = QuotaTracker(Path(tempfile.mkdtemp()) / "quota.json")
+    if args.no_limits:
+        for limits in PROVIDER_LIMITS.values():
+            limits.update(rate=1e6, burst=1e6, daily=None)
+        limiter._buckets.clear()
+
+    ids = [1000 + (i % args.unique) for i in range(args.requests)]
+    latencies, failures = [], 0
+
+    def one(movie_id):
+        started = time.perf_counter()
+        result = get_movie_info(movie_id)
+        return time.perf_counter() - started, result
+
+    response_cache.clear()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        for elapsed, result in pool.map(one, ids):
+            latencies.append(elapsed)
+            failures += result == "no"
+    total = time.perf_counter() - started
+    server.shutdown()
+
+    print(f"requests      : {args.requests} ({args.unique} unique ids, {args.workers} workers)")
+    print(f"wall time     : {total:.2f}s  -> {args.requests / total:.1f} lookups/s")
+    print(f"latency p50   : {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"latency p95   : {percentile(latencies, 95) * 1000:.1f} ms")
+    print(f"failures      : {failures}")
+    print(f"stub stats    : {server.stats}")
+    print(f"cache stats   : {response_cache.stats()}")
+    print(f"breakers      : {http_client.breaker_status()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--unique", type=int, default=50, help="distinct movie ids among the requests")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=50.0)
+    parser.add_argument("--jitter", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-limits", action="store_true", help="disable client-side rate limits")
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Parse-time benchmark for the watch-link scrapers.
+
+Compares the old full-page BeautifulSoup("html.parser") + CSS select path with
+app.fetch.html_parsing on saved result pages (benchmarks/fixtures/html/):
+
+    python -m benchmarks.scraper_parse_bench --rounds 50
+
+Pages recorded by the stub server (benchmarks/fixtures/api/<provider>/*.json)
+can be passed with --fixture SOURCE=PATH, e.g. --fixture akwam=benchmarks/fixtures/api/akwam/search__1a2b3c.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.fetch import html_parsing  # noqa: E402
+from app.fetch.watch_scrapers import (  # noqa: E402
+    AKWAM_RESULTS, ARABSEED_RESULTS, ARABSEED_WATCH_BUTTON, MAX_CANDIDATES,
+)
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+# ==========================================================
+# 🐢 BASELINE (the scrapers before html_parsing)
+# ==========================================================
+def old_arabseed(html):
+    soup = BeautifulSoup(html, "html.parser")
+    return [(a.get("title"), a.get("href"))
+            for ul in soup.select("div.series__list ul") for a in ul.select("a.movie__block")]
+
+
+def old_arabseed_watch(html):
+    soup = BeautifulSoup(html, "html.parser")
+    button = soup.select_one("a.watch__btn")
+    return [(None, button.get("href"))] if button else []
+
+
+def old_akwam(html):
+    soup = BeautifulSoup(html, "html.parser")
+    links = []
+    for div in soup.select("div.col-lg-auto.col-md-4.col-6.mb-12"):
+        tag = div.select_one("h3.entry-title a")
+        if tag:
+            links.append((tag.text.strip(), tag.get("href", "")))
+    return links
+
+
+CASES = {
+    "arabseed": ("arabseed_search.html", old_arabseed, ARABSEED_RESULTS, MAX_CANDIDATES),
+    "arabseed_watch": ("arabseed_movie.html", old_arabseed_watch, ARABSEED_WATCH_BUTTON, 1),
+    "akwam": ("akwam_search.html", old_akwam, AKWAM_RESULTS, MAX_CANDIDATES),
+}
+
+
+def load_page(path: Path) -> str:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":  # stub-server fixture
+        return json.loads(text)["body"]
+    return text
+
+
+def timed(fn, rounds):
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--fixture", action="append", default=[], metavar="SOURCE=PATH",
+                        help="use another saved page for a case (" + ", ".join(CASES) + ")")
+    args = parser.parse_args(argv)
+
+    pages = {name: FIXTURES / case[0] for name, case in CASES.items()}
+    for item in args.fixture:
+        name, _, path = item.partition("=")
+        if name not in CASES:
+            parser.error(f"unknown case {name!r}")
+        pages[name] = Path(path)
+
+    backend = "lxml pull parser" if html_parsing.etree is not None else "html.parser + SoupStrainer"
+    print(f"backend: {backend}, {args.rounds} rounds, median ms per page\n")
+    print(f"{'case':<16}{'size':>9}{'old':>10}{'new':>10}{'speedup':>10}  links")
+    for name, (_, old_fn, rule, limit) in CASES.items():
+        html = load_page(pages[name])
+        old_ms, old_links = timed(lambda: old_fn(html), args.rounds)
+        new_ms, new_links = timed(lambda: html_parsing.extract_links(html, rule, limit=limit), args.rounds)
+        same = [href for _, href in old_links[:limit]] == [href for _, href in new_links]
+        print(f"{name:<16}{len(html) // 1024:>7}KB{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / max(new_ms, 1e-9):>9.1f}x"
+              f"  {len(new_links)}{'' if same else ' (MISMATCH)'}")
+
+
+if __name__ == "__main__":
+    main()
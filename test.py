@@ -1,5 +1,4 @@
-from app.fetch.movies_info_fetcher import search_anime_movies,get_anime_info
-from app.fetch.series_info_fetcher import search_anime_series,get_anime_info
+from app.fetch.anime_info_fetcher import search_anime_series,get_series_anime_info
 
 
 
@@ -7,7 +6,7 @@ series = search_anime_series("Naruto")
 for m in series:
     print(f"{m["title"] }: {m["type"]}",m["id"])
 
-p=get_anime_info(20)
+p=get_series_anime_info(20)
 print(p)
 
 # import requests
@@ -0,0 +1,56 @@
+# tests/test_fuzzy.py
+"""Duplicate detection must not confuse sequels with the film already in the library."""
+
+from types import SimpleNamespace
+
+from app.utils.fuzzy import numerals, same_numbering, similarity
+from app.windows.add import AddMediaWindow, DUPLICATE_SIMILARITY
+
+
+def check_duplicate(library, title):
+    """AddMediaWindow.check_duplicate against {section: [titles]} without building the dialog."""
+    window = SimpleNamespace(
+        library_index=None,
+        data={section: [SimpleNamespace(title=t) for t in titles] for section, titles in library.items()},
+    )
+    return AddMediaWindow.check_duplicate(window, title)
+
+
+def test_numerals():
+    assert numerals("Rocky II") == (2,)
+    assert numerals("Rocky 2") == (2,)
+    assert numerals("Dune: Part Two") == (2,)
+    assert numerals("Kill Bill: Vol. 1") == (1,)
+    assert numerals("Inception") == ()
+    assert numerals("Rocky V") == (5,)
+    assert numerals("Star Wars: Episode V - The Empire Strikes Back") == (5,)
+    assert numerals("The Godfather Part II") == (2,)
+
+
+def test_words_that_look_like_numerals():
+    assert numerals("I Am Legend") == ()
+    assert numerals("X-Men") == ()
+    assert numerals("V for Vendetta") == ()
+    assert numerals("What I Did for Love") == ()
+    assert numerals("V/H/S") == ()
+    assert same_numbering("V/H/S", "VHS")
+    assert numerals("V/H/S/2") == (2,)
+
+
+def test_sequel_is_not_a_duplicate():
+    assert similarity("Rocky II", "Rocky III") >= DUPLICATE_SIMILARITY  # why the numbers are checked
+    assert not same_numbering("Rocky II", "Rocky III")
+    assert check_duplicate({"watched": ["Rocky II"]}, "Rocky III") is None
+    assert check_duplicate({"watched": ["Harry Potter and the Deathly Hallows: Part 1"]},
+                           "Harry Potter and the Deathly Hallows: Part 2") is None
+
+
+def test_near_duplicate_is_found():
+    assert check_duplicate({"watched": ["Rocky II"]}, "rocky ii") == ("watched", "Rocky II")
+    assert check_duplicate({"watching": ["Rocky III", "Spider-Man: Into the Spider-Verse"]},
+                           "Spider Man Into the Spiderverse") == ("watching", "Spider-Man: Into the Spider-Verse")
+
+
+def test_sequel_found_next_to_its_predecessor():
+    library = {"watched": ["Rocky II"], "want_to_watch": ["Rocky III"]}
+    assert check_duplicate(library, "Rocky III") == ("want_to_watch", "Rocky III")